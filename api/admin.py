@@ -1,15 +1,21 @@
 # api/admin.py
 from django.contrib import admin
+from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
 import nested_admin # <-- নতুন: nested_admin ইম্পোর্ট করুন
+from rest_framework.permissions import SAFE_METHODS
 
 from .models import (
     Category, Course, Unit, Lesson, 
-    Quiz, Question, Choice,
-    UserQuizAttempt, UserEnrollment, 
+    Quiz, Question, Choice, QuestionStats,
+    UserQuizAttempt, QuizAttemptSummary, UserEnrollment, ReviewItem, ScoreRollup,
     MatchingGame, GamePair,
     LearningGroup, GroupMembership,
-    Notice, Promotion
+    Notice, Promotion, Job
 )
+from config.db_router import use_replicas
+from .jobs import enqueue
+from . import exports
 
 # === নতুন: নেস্টেড ইনলাইন ===
 
@@ -76,18 +82,57 @@ class LessonAdmin(nested_admin.NestedModelAdmin): # <-- পরিবর্তন
 
 @admin.register(Quiz)
 class QuizAdmin(nested_admin.NestedModelAdmin): # <-- পরিবর্তন
-    list_display = ('title', 'quiz_type', 'lesson', 'unit')
+    list_display = ('title', 'quiz_type', 'lesson', 'unit', 'sample_size')
     list_filter = ('quiz_type', 'lesson__unit__course')
     search_fields = ('title',)
     inlines = [QuestionNestedInline] # <-- প্রশ্নের নেস্টেড ইনলাইন
 
 @admin.register(Question)
 class QuestionAdmin(nested_admin.NestedModelAdmin): # <-- পরিবর্তন
-    list_display = ('text', 'quiz', 'points')
+    list_display = ('text', 'quiz', 'points', 'responses', 'difficulty', 'discrimination')
     list_filter = ('quiz',)
+    list_select_related = ('quiz', 'stats')
     search_fields = ('text',)
+    readonly_fields = ('responses', 'difficulty', 'discrimination', 'distractor_frequencies')
     inlines = [ChoiceNestedInline] # <-- চয়েসের নেস্টেড ইনলাইন
 
+    # --- আইটেম অ্যানালিটিক্স (compute_item_stats কমান্ড থেকে) ---
+    def _stats(self, obj):
+        try:
+            return obj.stats
+        except QuestionStats.DoesNotExist:
+            return None
+
+    @admin.display(description='Responses')
+    def responses(self, obj):
+        stats = self._stats(obj)
+        return stats.responses if stats else 0
+
+    @admin.display(description='Difficulty (p)')
+    def difficulty(self, obj):
+        stats = self._stats(obj)
+        return f"{stats.difficulty:.2f}" if stats and stats.difficulty is not None else '-'
+
+    @admin.display(description='Discrimination')
+    def discrimination(self, obj):
+        stats = self._stats(obj)
+        return f"{stats.discrimination:.2f}" if stats and stats.discrimination is not None else '-'
+
+    @admin.display(description='Distractor frequencies')
+    def distractor_frequencies(self, obj):
+        stats = self._stats(obj)
+        if not stats or not stats.responses:
+            return '-'
+        lines = []
+        for choice in obj.choices.all():
+            count = stats.choice_counts.get(str(choice.id), 0)
+            marker = ' ✓' if choice.is_correct else ''
+            lines.append(f"{choice.text}{marker}: {count} ({count / stats.responses:.0%})")
+        skipped = stats.choice_counts.get('0', 0)
+        if skipped:
+            lines.append(f"(উত্তর দেয়নি): {skipped} ({skipped / stats.responses:.0%})")
+        return format_html_join(mark_safe('<br>'), '{}', ((line,) for line in lines))
+
 @admin.register(MatchingGame)
 class MatchingGameAdmin(nested_admin.NestedModelAdmin): # <-- পরিবর্তন
     list_display = ('title', 'game_type', 'lesson', 'unit', 'order')
@@ -97,17 +142,54 @@ class MatchingGameAdmin(nested_admin.NestedModelAdmin): # <-- পরিবর্
 
 # === অন্যান্য অ্যাডমিন (অপরিবর্তিত) ===
 
+class ReplicaChangeListMixin:
+    # বড় চেঞ্জ-লিস্টগুলো রেপ্লিকা থেকে পড়া হয়, যাতে primary-তে কুইজ সাবমিশনের সাথে প্রতিযোগিতা না করে
+    # POST (অ্যাকশন, list_editable সেভ) যা পড়ে তার উপরই লেখে, তাই সেগুলো primary থেকে
+    def changelist_view(self, request, extra_context=None):
+        with use_replicas(request.method in SAFE_METHODS):
+            return super().changelist_view(request, extra_context)
+
+def export_action(dataset):
+    # নির্বাচিত সারিগুলো (সব সিলেক্ট করলে পুরো ফিল্টার করা লিস্ট) স্ট্রিমিং CSV হিসেবে; পেজ ধরে ধরে কপি করতে হয় না
+    def export_csv(modeladmin, request, queryset):
+        return exports.export_response(request, dataset, queryset, 'csv')
+    export_csv.short_description = 'নির্বাচিতগুলো CSV হিসেবে এক্সপোর্ট করুন'
+    return export_csv
+
 @admin.register(UserEnrollment)
-class UserEnrollmentAdmin(admin.ModelAdmin):
+class UserEnrollmentAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ('user', 'course', 'enrolled_at')
     list_filter = ('course', 'enrolled_at')
     search_fields = ('user__username', 'course__title')
+    actions = [export_action('enrollments')]
 
 @admin.register(UserQuizAttempt)
-class UserQuizAttemptAdmin(admin.ModelAdmin):
+class UserQuizAttemptAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ('user', 'quiz', 'score', 'total_points', 'timestamp')
     list_filter = ('quiz__lesson__unit__course', 'timestamp')
     search_fields = ('user__username', 'quiz__title')
+    actions = [export_action('attempts')]
+
+@admin.register(QuizAttemptSummary)
+class QuizAttemptSummaryAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ('user', 'quiz', 'latest_score', 'best_score', 'latest_total_points', 'attempt_count', 'latest_at')
+    list_filter = ('quiz__lesson__unit__course',)
+    search_fields = ('user__username', 'quiz__title')
+
+@admin.register(ReviewItem)
+class ReviewItemAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ('user', 'question', 'course', 'repetitions', 'interval_days', 'ease_factor', 'lapses', 'due_at')
+    list_filter = ('course',)
+    list_select_related = ('user', 'question', 'course')
+    search_fields = ('user__username',)
+
+@admin.register(ScoreRollup)
+class ScoreRollupAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ('user', 'course', 'period', 'day', 'score', 'attempts')
+    list_filter = ('period', 'course', 'day')
+    list_select_related = ('user', 'course')
+    search_fields = ('user__username',)
+    date_hierarchy = 'day'
 
 @admin.register(LearningGroup)
 class LearningGroupAdmin(admin.ModelAdmin):
@@ -116,7 +198,7 @@ class LearningGroupAdmin(admin.ModelAdmin):
     filter_horizontal = ('courses',) 
 
 @admin.register(GroupMembership)
-class GroupMembershipAdmin(admin.ModelAdmin):
+class GroupMembershipAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ('user', 'group', 'is_group_admin', 'joined_at')
     list_filter = ('group', 'is_group_admin')
     search_fields = ('user__username', 'group__title')
@@ -130,4 +212,20 @@ class NoticeAdmin(admin.ModelAdmin):
 class PromotionAdmin(admin.ModelAdmin):
     list_display = ('title', 'subtitle', 'course', 'is_active')
     list_filter = ('is_active',)
-    search_fields = ('title', 'subtitle')
\ No newline at end of file
+    search_fields = ('title', 'subtitle')
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'priority', 'attempts', 'max_attempts', 'run_after', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('kind', 'dedupe_key')
+    readonly_fields = ('dedupe_key', 'locked_by', 'locked_at', 'last_error', 'created_at', 'finished_at')
+    actions = ['retry_jobs']
+
+    @admin.action(description='নির্বাচিত জবগুলো আবার চালান')
+    def retry_jobs(self, request, queryset):
+        retried = 0
+        for job in queryset.exclude(status__in=['PENDING', 'RUNNING']):
+            enqueue(job.kind, job.payload, priority=job.priority, max_attempts=job.max_attempts)
+            retried += 1
+        self.message_user(request, f"{retried}টি জব আবার কিউতে দেওয়া হয়েছে।")
@@ -0,0 +1,80 @@
+# api/answer_log.py
+# প্রতিটি অ্যাটেম্পটের প্রশ্নভিত্তিক উত্তর একটি কমপ্যাক্ট বাইনারি ব্লবে রাখা হয় (প্রতি উত্তরে একটি রো নয়)।
+#
+# ফরম্যাট (little-endian):
+#   1 byte   ভার্সন (1 = uint32 আইডি, 2 = int64 আইডি)
+#   4 bytes  n = উত্তরের সংখ্যা
+#   n আইডি   প্রশ্ন আইডি
+#   n আইডি   নির্বাচিত চয়েস আইডি (কিছু না বাছলে 0)
+#   ceil(n/8) bytes  সঠিক/ভুল বিটসেট (LSB-first)
+#
+# uint32 আইডিতে প্রতি উত্তরে ~8.1 byte লাগে। numpy দিয়ে পড়ার জন্য দেখুন compute_item_stats কমান্ড।
+import struct
+import sys
+from array import array
+
+HEADER = struct.Struct('<BI')
+VERSION_UINT32 = 1
+VERSION_INT64 = 2
+ID_TYPECODES = {VERSION_UINT32: 'I', VERSION_INT64: 'q'}
+ID_DTYPES = {VERSION_UINT32: '<u4', VERSION_INT64: '<i8'}
+
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+def _ids_to_bytes(typecode, values):
+    ids = array(typecode, values)
+    if _BIG_ENDIAN:
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def _ids_from_bytes(typecode, data):
+    ids = array(typecode)
+    ids.frombytes(data)
+    if _BIG_ENDIAN:
+        ids.byteswap()
+    return ids
+
+
+def encode(question_ids, choice_ids, correct):
+    n = len(question_ids)
+    version = VERSION_UINT32
+    if max(question_ids, default=0) > 0xFFFFFFFF or max(choice_ids, default=0) > 0xFFFFFFFF:
+        version = VERSION_INT64
+    typecode = ID_TYPECODES[version]
+
+    bits = bytearray((n + 7) // 8)
+    for index, is_correct in enumerate(correct):
+        if is_correct:
+            bits[index >> 3] |= 1 << (index & 7)
+
+    return b''.join([
+        HEADER.pack(version, n),
+        _ids_to_bytes(typecode, question_ids),
+        _ids_to_bytes(typecode, choice_ids),
+        bytes(bits),
+    ])
+
+
+def decode(data):
+    """-> (question_ids, choice_ids, correct) তিনটি সমান দৈর্ঘ্যের তালিকা"""
+    data = bytes(data)
+    version, n = HEADER.unpack_from(data)
+    typecode = ID_TYPECODES[version]
+    width = array(typecode).itemsize * n
+    offset = HEADER.size
+    question_ids = _ids_from_bytes(typecode, data[offset:offset + width])
+    choice_ids = _ids_from_bytes(typecode, data[offset + width:offset + 2 * width])
+    bits = data[offset + 2 * width:]
+    correct = [bool(bits[index >> 3] & (1 << (index & 7))) for index in range(n)]
+    return list(question_ids), list(choice_ids), correct
+
+
+def encode_results(results):
+    """grading.grade() এর results থেকে ব্লব তৈরি করে। একাধিক চয়েস বাছলে সবচেয়ে ছোট আইডিটি রাখা হয়।"""
+    return encode(
+        [result['question'] for result in results],
+        [result['selected_choices'][0] if result['selected_choices'] else 0 for result in results],
+        [result['is_correct'] for result in results],
+    )
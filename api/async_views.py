@@ -0,0 +1,185 @@
+# api/async_views.py
+# কম্পোজিট এন্ডপয়েন্টগুলোর async ভার্সন (ASGI সার্ভারে চালানোর জন্য, যেমন uvicorn config.asgi:application)।
+# এদের স্বাধীন কোয়েরিগুলো একটার পর একটা না চলে একসাথে চলে।
+#
+# Django এর async ORM (afirst, aaggregate ...) ভেতরে sync_to_async(thread_sensitive=True) ব্যবহার করে,
+# ফলে সব কোয়েরি একই থ্রেডে সারি বেঁধে চলে। তাই এখানে প্রতিটি স্বাধীন অংশ (কোয়েরি + সিরিয়ালাইজেশন)
+# thread_sensitive=False দিয়ে নিজস্ব থ্রেড পুলে (ASYNC_VIEW_WORKERS), নিজস্ব DB কানেকশনে চালানো হয়।
+# রেসপন্সের আকার sync ভিউগুলোর সাথে হুবহু এক।
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Sum
+from django.http import JsonResponse
+from rest_framework import exceptions, serializers
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import leaderboards, ranking
+from .cache import get_group_summary
+from .models import Course, LearningGroup, Notice, Promotion, QuizAttemptSummary
+from .serializers import (
+    GroupMemberUserSerializer, HomeCourseSerializer, LeaderboardEntrySerializer, MiniCourseSerializer,
+    NoticeSerializer, ProfileSerializer, PromotionSerializer,
+)
+from config.db_router import is_pinned_to_primary, use_replicas
+
+
+_executor = ThreadPoolExecutor(max_workers=settings.ASYNC_VIEW_WORKERS, thread_name_prefix='async-view')
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder, json_dumps_params={'ensure_ascii': False})
+
+
+def _in_worker(func):
+    def call():
+        try:
+            return func()
+        finally:
+            # ওয়ার্কার থ্রেডের কানেকশন CONN_MAX_AGE অনুযায়ী বন্ধ হয়, sync রিকোয়েস্ট শেষের মতো
+            close_old_connections()
+    return call
+
+
+def run_sync(func, *args):
+    return sync_to_async(_in_worker(lambda: func(*args)), thread_sensitive=False, executor=_executor)()
+
+
+async def gather_sync(*funcs):
+    """প্রতিটি sync ফাংশন আলাদা থ্রেডে একসাথে চালিয়ে ফলাফলগুলো একই ক্রমে ফেরত দেয়।"""
+    return await asyncio.gather(*(run_sync(func) for func in funcs))
+
+
+def _authenticate(request):
+    # /api/batch/ এর সাব-রিকোয়েস্টে ইউজার আগেই অথেন্টিকেট করা (batch.py), আবার করা হয় না
+    force_user = getattr(request, '_force_auth_user', None)
+    if force_user is not None:
+        return force_user
+    # DRF এর কনফিগার করা অথেন্টিকেশন (TokenAuthentication) দিয়েই ইউজার বের করা হয়
+    drf_request = Request(request)
+    for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = authenticator().authenticate(drf_request)
+        if result is not None:
+            return result[0]
+    return None
+
+
+def authenticated(view):
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return _json({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+        try:
+            user = await run_sync(_authenticate, request)
+        except exceptions.AuthenticationFailed as error:
+            return _json({'detail': str(error.detail)}, status=401)
+        if user is None:
+            response = _json({'detail': 'Authentication credentials were not provided.'}, status=401)
+            response['WWW-Authenticate'] = 'Token'
+            return response
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+# --- ড্যাশবোর্ড ---
+
+@authenticated
+async def dashboard(request):
+    context = {'request': request}
+
+    def notice():
+        obj = Notice.objects.filter(is_active=True).first()
+        return NoticeSerializer(obj).data if obj else None
+
+    def promotion():
+        obj = Promotion.objects.filter(is_active=True).first()
+        return PromotionSerializer(obj).data if obj else None
+
+    def my_courses():
+        courses = Course.objects.filter(enrollments__user=request.user).annotate(
+            resume_unit_id=F('enrollments__last_unit_id'),
+            resume_lesson_id=F('enrollments__last_lesson_id'),
+            resume_quiz_id=F('enrollments__last_quiz_id'),
+            resume_next_lesson_id=F('enrollments__next_lesson_id'),
+        )
+        return HomeCourseSerializer(courses, many=True, context=context).data
+
+    # DashboardView এর মতো রেপ্লিকা থেকে পড়া, সদ্য রাইট করা ইউজার বাদে
+    replicas = not await run_sync(is_pinned_to_primary, request.user.id)
+    with use_replicas(replicas):
+        notice_data, promotion_data, courses_data = await gather_sync(notice, promotion, my_courses)
+    return _json({'notice': notice_data, 'promotion': promotion_data, 'my_courses': courses_data})
+
+
+# --- প্রোফাইল ---
+
+@authenticated
+async def profile(request):
+    user = request.user
+    # ProfileView এর মতো; সদ্য অ্যাটেম্পট দেওয়া ইউজার নিজের নতুন পয়েন্ট primary থেকে দেখে
+    replicas = not await run_sync(is_pinned_to_primary, user.id)
+    with use_replicas(replicas):
+        total_points, rank = await gather_sync(
+            lambda: QuizAttemptSummary.objects.filter(user=user).aggregate(Sum('latest_score')),
+            lambda: ranking.my_rank(user.id)['rank'],
+        )
+    return _json(ProfileSerializer({
+        'username': user.username,
+        'email': user.email,
+        'total_points': total_points['latest_score__sum'] or 0,
+        'rank': rank,
+    }).data)
+
+
+# --- গ্রুপ ---
+
+@authenticated
+async def group_detail(request, group_id):
+    # LearningGroupViewSet.retrieve এর মতো: শুধু নিজের গ্রুপ দেখা যায়
+    def group():
+        return LearningGroup.objects.filter(id=group_id, memberships__user=request.user).select_related('admin').first()
+
+    def courses():
+        return MiniCourseSerializer(
+            Course.objects.filter(learning_groups__id=group_id).only('id', 'title').order_by('id'), many=True
+        ).data
+
+    def member_count():
+        return get_group_summary(group_id)['member_count']
+
+    obj, courses_data, count = await gather_sync(group, courses, member_count)
+    if obj is None:
+        return _json({'detail': 'No LearningGroup matches the given query.'}, status=404)
+    return _json({
+        'id': obj.id,
+        'title': obj.title,
+        'admin': GroupMemberUserSerializer(obj.admin).data,
+        'courses_detail': courses_data,
+        'created_at': serializers.DateTimeField().to_representation(obj.created_at),
+        'member_count': count,
+    })
+
+
+@authenticated
+async def group_leaderboard(request, group_id):
+    window, course_id, error = leaderboards.parse_params(request.GET)
+    if error:
+        return _json({'detail': error}, status=400)
+    # GroupLeaderboardView এর মতো রেপ্লিকা থেকে পড়া, সদ্য রাইট করা ইউজার বাদে
+    replicas = not await run_sync(is_pinned_to_primary, request.user.id)
+    with use_replicas(replicas):
+        exists, entries, course_in_group = await gather_sync(
+            lambda: LearningGroup.objects.filter(id=group_id).exists(),
+            lambda: leaderboards.get_leaderboard(window, group_id=group_id, course_id=course_id),
+            lambda: course_id is None or course_id in get_group_summary(group_id)['course_ids'],
+        )
+    if not exists:
+        return _json({'detail': 'গ্রুপটি খুঁজে পাওয়া যায়নি।'}, status=404)
+    if not course_in_group:
+        return _json({'detail': 'কোর্সটি এই গ্রুপে নেই।'}, status=400)
+    return _json(LeaderboardEntrySerializer(entries, many=True).data)
@@ -0,0 +1,161 @@
+# api/attempts.py
+# কুইজ অ্যাটেম্পট লেখার একমাত্র পথ।
+# অ্যাটেম্পট টেবিলে শুধু INSERT হয় (ইতিহাস মোছা হয় না), আর QuizAttemptSummary প্রজেকশনে একটি upsert।
+# একই ট্রানজ্যাকশনে চলতি সপ্তাহ, মাস আর অল-টাইমের ScoreRollup বাকেট আপডেট হয় (সময়-উইন্ডো লিডারবোর্ড)।
+# তারপর এনরোলমেন্টের resume কার্সর এগিয়ে দেওয়া হয় (resume.py), আর কমিটের পরে র‍্যাঙ্কিং বোর্ড (ranking.py)।
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import ranking
+from .completion import get_content_index
+from .jobs import enqueue
+from .leaderboards import WINDOWS, window_start
+from .models import Quiz, UserQuizAttempt, QuizAttemptSummary, ScoreRollup
+from .resume import record_quiz_progress, record_quiz_progress_for_users
+
+_SUMMARY_TABLE = QuizAttemptSummary._meta.db_table
+_ROLLUP_TABLE = ScoreRollup._meta.db_table
+
+UPSERT_SUMMARY_SQL = f"""
+    INSERT INTO {_SUMMARY_TABLE}
+        (user_id, quiz_id, latest_score, latest_total_points, latest_at, best_score, best_total_points, attempt_count)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, 1)
+    ON CONFLICT (user_id, quiz_id) DO UPDATE SET
+        latest_score = EXCLUDED.latest_score,
+        latest_total_points = EXCLUDED.latest_total_points,
+        latest_at = EXCLUDED.latest_at,
+        best_score = CASE WHEN EXCLUDED.best_score > {_SUMMARY_TABLE}.best_score
+                          THEN EXCLUDED.best_score ELSE {_SUMMARY_TABLE}.best_score END,
+        best_total_points = CASE WHEN EXCLUDED.best_score > {_SUMMARY_TABLE}.best_score
+                                      OR {_SUMMARY_TABLE}.attempt_count = 0
+                                 THEN EXCLUDED.best_total_points ELSE {_SUMMARY_TABLE}.best_total_points END,
+        attempt_count = {_SUMMARY_TABLE}.attempt_count + 1
+"""
+
+# একটি অ্যাটেম্পটের সব উইন্ডোর বাকেট একটি স্টেটমেন্টে (উইন্ডো প্রতি একটি VALUES সারি)
+UPSERT_ROLLUP_SQL = f"""
+    INSERT INTO {_ROLLUP_TABLE} (user_id, course_id, period, day, score, attempts)
+    VALUES {', '.join(['(%s, %s, %s, %s, %s, 1)'] * len(WINDOWS))}
+    ON CONFLICT (user_id, course_id, period, day) DO UPDATE SET
+        score = {_ROLLUP_TABLE}.score + EXCLUDED.score,
+        attempts = {_ROLLUP_TABLE}.attempts + 1
+"""
+
+
+def _quiz_course_id(quiz_id):
+    entry = get_content_index()['quizzes'].get(quiz_id)
+    if entry is not None:
+        return entry[0]
+    return Quiz.objects.filter(pk=quiz_id).values_list(
+        Coalesce('lesson__unit__course_id', 'unit__course_id'), flat=True
+    ).first()
+
+
+def _locked_scores(quiz_id, user_ids):
+    return {
+        user_id: (latest_score, latest_at)
+        for user_id, latest_score, latest_at in QuizAttemptSummary.objects.select_for_update().filter(
+            quiz_id=quiz_id, user_id__in=user_ids
+        ).order_by('user_id').values_list('user_id', 'latest_score', 'latest_at')
+    }
+
+
+def _previous_scores(quiz_id, user_ids):
+    """{user_id: (latest_score, latest_at)}"""
+    # সামারি রো লক করে আগের latest_score পড়া হয়, যাতে একসাথে দুটি অ্যাটেম্পট একই পার্থক্য দুবার না যোগ করে
+    previous = _locked_scores(quiz_id, user_ids)
+    missing = [user_id for user_id in user_ids if user_id not in previous]
+    if missing:
+        # প্রথম অ্যাটেম্পটে লক করার মতো রো নেই: খালি রো (attempt_count=0) আগে ঢুকিয়ে তারপর লক।
+        # একসাথে আরেকটি প্রথম অ্যাটেম্পট চললে INSERT তার কমিট পর্যন্ত অপেক্ষা করে, তারপর তার স্কোরই পড়া হয়
+        now = timezone.now()
+        QuizAttemptSummary.objects.bulk_create([
+            QuizAttemptSummary(
+                user_id=user_id, quiz_id=quiz_id, latest_score=0, latest_total_points=0, latest_at=now,
+                best_score=0, best_total_points=0, attempt_count=0,
+            )
+            for user_id in missing
+        ], ignore_conflicts=True)
+        previous.update(_locked_scores(quiz_id, missing))
+    return previous
+
+
+def _rollup_params(user_id, course_id, score, previous, timestamp):
+    """UPSERT_ROLLUP_SQL এর প্যারামিটার: প্রতিটি উইন্ডোর বাকেটে নতুন স্কোর - ঐ উইন্ডোতে এই কুইজের আগের স্কোর।"""
+    previous_score, previous_at = previous
+    today = timezone.localdate(timestamp)
+    params = []
+    for window in WINDOWS:
+        start = window_start(window, today)
+        # আগের অ্যাটেম্পট উইন্ডোর আগে হলে এই কুইজ এই বাকেটে এখনো কিছু যোগ করেনি
+        counted = previous_score if previous_at is not None and timezone.localdate(previous_at) >= start else 0
+        params += [user_id, course_id, window, start, score - counted]
+    return params
+
+
+def _update_rankings(user_ids):
+    def apply():
+        ranking.refresh_users(user_ids)
+        # ডুপ্লিকেট PENDING জব হয় না, তাই RANKING_SNAPSHOT_SECONDS এ সর্বোচ্চ একটি স্ন্যাপশট
+        enqueue('snapshot_rankings', delay=settings.RANKING_SNAPSHOT_SECONDS)
+    transaction.on_commit(apply)
+
+
+def record_attempt(user, quiz_id, score, total_points, seed=None, answer_log=None):
+    course_id = _quiz_course_id(quiz_id)
+    with transaction.atomic():
+        previous = _previous_scores(quiz_id, [user.id]).get(user.id, (0, None))
+        attempt = UserQuizAttempt.objects.create(
+            user=user, quiz_id=quiz_id, score=score, total_points=total_points, seed=seed,
+            answer_log=answer_log,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(UPSERT_SUMMARY_SQL, [
+                user.id, quiz_id, score, total_points, attempt.timestamp, score, total_points,
+            ])
+            if course_id is not None:
+                cursor.execute(UPSERT_ROLLUP_SQL, _rollup_params(
+                    user.id, course_id, score, previous, attempt.timestamp,
+                ))
+        if course_id is not None:
+            _update_rankings([user.id])
+    record_quiz_progress(user.id, quiz_id)
+    return attempt
+
+
+def record_attempts(quiz_id, rows):
+    """একই কুইজের অনেক ইউজারের অ্যাটেম্পট একসাথে (লাইভ কুইজ সেশন শেষে)।
+
+    rows: [{'user_id', 'score', 'total_points', 'seed', 'answer_log'}, ...]
+    অ্যাটেম্পটগুলো একটি bulk INSERT, সামারি ও রোলআপ upsert একটি করে executemany, আর কার্সরগুলো একটি bulk UPDATE।
+    """
+    course_id = _quiz_course_id(quiz_id)
+    with transaction.atomic():
+        previous = _previous_scores(quiz_id, [row['user_id'] for row in rows])
+        attempts = UserQuizAttempt.objects.bulk_create([
+            UserQuizAttempt(
+                user_id=row['user_id'], quiz_id=quiz_id, score=row['score'], total_points=row['total_points'],
+                seed=row.get('seed'), answer_log=row.get('answer_log'),
+            )
+            for row in rows
+        ])
+        with connection.cursor() as cursor:
+            cursor.executemany(UPSERT_SUMMARY_SQL, [
+                [attempt.user_id, quiz_id, attempt.score, attempt.total_points, attempt.timestamp,
+                 attempt.score, attempt.total_points]
+                for attempt in attempts
+            ])
+            if course_id is not None:
+                cursor.executemany(UPSERT_ROLLUP_SQL, [
+                    _rollup_params(
+                        attempt.user_id, course_id, attempt.score, previous.get(attempt.user_id, (0, None)),
+                        attempt.timestamp,
+                    )
+                    for attempt in attempts
+                ])
+        if course_id is not None:
+            _update_rankings([attempt.user_id for attempt in attempts])
+    record_quiz_progress_for_users([attempt.user_id for attempt in attempts], quiz_id)
+    return attempts
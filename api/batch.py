@@ -0,0 +1,102 @@
+# api/batch.py
+# /api/batch/: একাধিক GET সাব-রিকোয়েস্ট একটি HTTP রিকোয়েস্টে।
+# সাব-রিকোয়েস্টগুলো api/urls.py এর সাধারণ রুট দিয়েই চলে, কিন্তু TLS, টোকেন অথেন্টিকেশন আর
+# মিডলওয়্যার একবারই হয়: ইউজার ও টোকেন মূল রিকোয়েস্ট থেকে DRF এর _force_auth_user দিয়ে বসানো হয়,
+# আর সবাই একই রিকোয়েস্ট-স্কোপড memo (memo.py) শেয়ার করে।
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+
+API_PREFIX = '/api/'
+BATCH_PATH = '/api/batch/'
+
+logger = logging.getLogger(__name__)
+
+
+# মূল রিকোয়েস্টের META থেকে শুধু এগুলো আর HTTP_* হেডার সাব-রিকোয়েস্টে যায়; মূল POST এর বডি
+# (CONTENT_LENGTH, CONTENT_TYPE, wsgi.input) সাব-GET এর অংশ নয়
+_META_KEYS = {'SERVER_NAME', 'SERVER_PORT', 'SERVER_PROTOCOL', 'REMOTE_ADDR', 'SCRIPT_NAME', 'HTTPS', 'wsgi.url_scheme'}
+
+
+def _sub_request(request, path, memo):
+    parts = urlsplit(path)
+    sub = HttpRequest()
+    sub.method = 'GET'
+    sub.path = sub.path_info = parts.path
+    sub.META = {
+        key: value for key, value in request.META.items()
+        if key in _META_KEYS or (key.startswith('HTTP_') and not key.startswith('HTTP_CONTENT_'))
+    }
+    sub.META.update(REQUEST_METHOD='GET', PATH_INFO=parts.path, QUERY_STRING=parts.query)
+    sub.GET = QueryDict(parts.query)
+    sub.COOKIES = request.COOKIES
+    sub.user = request.user
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    sub.memo = memo
+    return sub
+
+
+def _body(response):
+    data = getattr(response, 'data', None)
+    if data is not None:
+        return data
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(content or b'null')
+    return content.decode(response.charset or 'utf-8')
+
+
+def run_one(request, item, memo):
+    """item = {"id": ..., "path": "/api/..."} -> {"id", "status", "body"[, "headers"]}"""
+    result = {'id': item.get('id')}
+    path = item.get('path') or ''
+    if not path.startswith(API_PREFIX) or urlsplit(path).path == BATCH_PATH:
+        return {**result, 'status': 400, 'body': {'detail': 'শুধু /api/ এর GET রুট ব্যাচ করা যায়।'}}
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return {**result, 'status': 404, 'body': {'detail': 'পাওয়া যায়নি।'}}
+
+    view = match.func
+    if asyncio.iscoroutinefunction(view):
+        # async ভিউ (/api/async/*, ASYNC_COMPOSITE_VIEWS এ কম্পোজিট রুট) কোরুটিন ফেরত দেয়; এখানেই শেষ পর্যন্ত চালানো হয়
+        view = async_to_sync(view)
+    try:
+        response = view(_sub_request(request, path, memo), *match.args, **match.kwargs)
+    except Exception:
+        # DRF নিজের এক্সেপশন রেসপন্সে বদলে দেয়; এখানে আসে শুধু অপ্রত্যাশিত ত্রুটি
+        logger.exception("Batch sub-request %s failed", path)
+        return {**result, 'status': 500, 'body': {'detail': 'সার্ভার ত্রুটি।'}}
+    result.update(status=response.status_code, body=_body(response))
+    if response.has_header('Link'):
+        result['headers'] = {'Link': response['Link']}
+    return result
+
+
+def _run_in_thread(request, item, memo):
+    # Django এর DB কানেকশন থ্রেড-লোকাল; কাজ শেষে এই থ্রেডেরটি বন্ধ করা হয় যাতে খোলা পড়ে না থাকে
+    try:
+        return run_one(request, item, memo)
+    finally:
+        connections.close_all()
+
+
+def run_batch(request, items, concurrent=False):
+    memo = {}
+    workers = min(len(items), settings.BATCH_MAX_WORKERS)
+    if not concurrent or workers <= 1:
+        return [run_one(request, item, memo) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda item: _run_in_thread(request, item, memo), items))
@@ -0,0 +1,169 @@
+# api/cache.py
+# কোর্স/ইউনিটের "পাবলিক" (ইউজার-নিরপেক্ষ) হিসাবগুলো ক্যাশে রাখা হয়।
+# সিরিয়ালাইজারগুলো এখান থেকে পড়ে, আর warm_cache কমান্ড ডিপ্লয়ের পরে এগুলো আগেই ভরে রাখে।
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum, Q
+
+from config.db_router import use_replicas
+from .models import Course, GroupMembership, Unit, Lesson, Quiz, Question
+
+COURSE_STATS_KEY = 'api:course:{}:stats'
+UNIT_STATS_KEY = 'api:unit:{}:stats'
+COURSE_OUTLINE_KEY = 'api:course:{}:outline'
+GROUP_SUMMARY_KEY = 'api:group:{}:summary'
+WARMUP_DONE_KEY = 'api:warmup:{}:done'
+
+CACHE_TIMEOUT = getattr(settings, 'API_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def warmup_done_key(build_id=None):
+    """এই রিলিজের রেডিনেস ফ্ল্যাগ; আরেক রিলিজের warm-up এটা মুছে না।"""
+    return WARMUP_DONE_KEY.format(build_id or settings.BUILD_ID)
+
+
+# --- হিসাব (ক্যাশ ছাড়া) ---
+
+def compute_course_stats(course_id):
+    lesson_quiz_points = Question.objects.filter(
+        quiz__lesson__unit__course_id=course_id
+    ).aggregate(Sum('points'))['points__sum'] or 0
+    mastery_quiz_points = Question.objects.filter(
+        quiz__unit__course_id=course_id
+    ).aggregate(Sum('points'))['points__sum'] or 0
+    first_unit = Unit.objects.filter(course_id=course_id).order_by('order').values_list('id', flat=True).first()
+
+    return {
+        'total_possible_points': lesson_quiz_points + mastery_quiz_points,
+        'total_units': Unit.objects.filter(course_id=course_id).count(),
+        'total_lessons': Lesson.objects.filter(unit__course_id=course_id).count(),
+        'total_quizzes': Quiz.objects.filter(
+            Q(lesson__unit__course_id=course_id) | Q(unit__course_id=course_id)
+        ).count(),
+        'first_unit_id': first_unit,
+    }
+
+
+def compute_unit_stats(unit_id):
+    lesson_quiz_points = Question.objects.filter(
+        quiz__lesson__unit_id=unit_id, quiz__quiz_type='LESSON'
+    ).aggregate(Sum('points'))['points__sum'] or 0
+    mastery_quiz_points = Question.objects.filter(
+        quiz__unit_id=unit_id, quiz__quiz_type='UNIT'
+    ).aggregate(Sum('points'))['points__sum'] or 0
+
+    return {
+        'total_possible_points': lesson_quiz_points + mastery_quiz_points,
+    }
+
+
+def compute_course_outline(course_id):
+    """কোর্সের ক্রমে লেসনগুলো আর প্রতিটি কুইজের অবস্থান।
+
+    {'lessons': [(lesson_id, unit_id, (lesson_quiz_id, ...)), ...],
+     'quizzes': {quiz_id: (unit_id, lesson_id)}}   # ইউনিট মাস্টারি কুইজের lesson_id = None
+    """
+    lessons = {
+        lesson_id: (lesson_id, unit_id, [])
+        for lesson_id, unit_id in Lesson.objects.filter(unit__course_id=course_id).order_by(
+            'unit__order', 'unit_id', 'order', 'id'
+        ).values_list('id', 'unit_id')
+    }
+    quizzes = {}
+    for quiz_id, lesson_id, lesson_unit_id, unit_id in Quiz.objects.filter(
+        Q(lesson__unit__course_id=course_id) | Q(unit__course_id=course_id)
+    ).order_by('id').values_list('id', 'lesson_id', 'lesson__unit_id', 'unit_id'):
+        if lesson_id:
+            lessons[lesson_id][2].append(quiz_id)
+            quizzes[quiz_id] = (lesson_unit_id, lesson_id)
+        else:
+            quizzes[quiz_id] = (unit_id, None)
+
+    return {
+        'lessons': [(lesson_id, unit_id, tuple(quiz_ids)) for lesson_id, unit_id, quiz_ids in lessons.values()],
+        'quizzes': quizzes,
+    }
+
+
+# --- ক্যাশ থেকে পড়া ---
+
+def get_course_stats(course_id):
+    key = COURSE_STATS_KEY.format(course_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_course_stats(course_id)
+        cache.set(key, stats, CACHE_TIMEOUT)
+    return stats
+
+
+def get_unit_stats(unit_id):
+    key = UNIT_STATS_KEY.format(unit_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_unit_stats(unit_id)
+        cache.set(key, stats, CACHE_TIMEOUT)
+    return stats
+
+
+def get_course_outline(course_id):
+    key = COURSE_OUTLINE_KEY.format(course_id)
+    outline = cache.get(key)
+    if outline is None:
+        outline = compute_course_outline(course_id)
+        cache.set(key, outline, CACHE_TIMEOUT)
+    return outline
+
+# --- গ্রুপ সামারি (সদস্য সংখ্যা, কোর্স আইডি) ---
+# সদস্যপদ বা কোর্স বদলালে কমিটের পরে মুছে ফেলা হয় (signals.py, memberships.py), পরের রিডে নতুন করে বানায়।
+
+def compute_group_summary(group_id):
+    # রেপ্লিকা ল্যাগের পুরোনো মান যেন CACHE_TIMEOUT ধরে ক্যাশে না থাকে, তাই primary থেকে
+    with use_replicas(False):
+        return {
+            'member_count': GroupMembership.objects.filter(group_id=group_id).count(),
+            'course_ids': list(
+                Course.objects.filter(learning_groups=group_id).order_by('id').values_list('id', flat=True)
+            ),
+        }
+
+
+def get_group_summary(group_id):
+    key = GROUP_SUMMARY_KEY.format(group_id)
+    summary = cache.get(key)
+    if summary is None:
+        summary = compute_group_summary(group_id)
+        cache.set(key, summary, CACHE_TIMEOUT)
+    return summary
+
+
+def invalidate_group_summary(group_id):
+    transaction.on_commit(lambda: cache.delete(GROUP_SUMMARY_KEY.format(group_id)))
+
+
+# --- রিফ্রেশ (জব কিউ থেকে চলে) ---
+
+def refresh_content_stats(course_id=None, unit_id=None, lesson_id=None, quiz_id=None):
+    """কন্টেন্ট বদলের পর সংশ্লিষ্ট ইউনিট ও কোর্সের হিসাব (আর নেভিগেশন ইনডেক্স) নতুন করে ক্যাশে লেখে।"""
+    from .navigation import COURSE_NAVIGATION_KEY, compute_course_navigation
+
+    unit_ids = {unit_id}
+    if lesson_id:
+        unit_ids.add(Lesson.objects.filter(id=lesson_id).values_list('unit_id', flat=True).first())
+    if quiz_id:
+        quiz = Quiz.objects.filter(id=quiz_id).values('unit_id', 'lesson__unit_id').first()
+        if quiz:
+            unit_ids.update([quiz['unit_id'], quiz['lesson__unit_id']])
+    unit_ids.discard(None)
+
+    existing_units = dict(Unit.objects.filter(id__in=unit_ids).values_list('id', 'course_id'))
+    course_ids = set(existing_units.values())
+    if course_id:
+        course_ids.add(course_id)
+
+    cache.delete_many([UNIT_STATS_KEY.format(uid) for uid in unit_ids - set(existing_units)])
+    payloads = {UNIT_STATS_KEY.format(uid): compute_unit_stats(uid) for uid in existing_units}
+    payloads.update({COURSE_STATS_KEY.format(cid): compute_course_stats(cid) for cid in course_ids})
+    payloads.update({COURSE_OUTLINE_KEY.format(cid): compute_course_outline(cid) for cid in course_ids})
+    payloads.update({COURSE_NAVIGATION_KEY.format(cid): compute_course_navigation(cid) for cid in course_ids})
+    cache.set_many(payloads, CACHE_TIMEOUT)
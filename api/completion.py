@@ -0,0 +1,204 @@
+# api/completion.py
+# প্রতি এনরোলমেন্টে একটি কমপ্যাক্ট বিটম্যাপ: কোর্সের কোন কুইজগুলো ইউজার চেষ্টা করেছে।
+# প্রতিটি কুইজ তৈরি হওয়ার সময় তার কোর্সের কাউন্টার থেকে একটি স্থায়ী বিট ইনডেক্স পায়
+# (কুইজ মুছলে ঐ বিট খালি পড়ে থাকে, অন্য কারো বিট সরে না)। ফলে কোর্স/ইউনিট/লেসন পেজের সব
+# "attempted" চিহ্ন একটি এনরোলমেন্ট রো পড়ে বিট টেস্ট করেই পাওয়া যায়।
+#
+# কোন কুইজ কোন কোর্সের কোন বিট, কোন লেসন/ইউনিটে কোন কুইজ -- এই কন্টেন্ট ইনডেক্স sampling.py এর মতো
+# প্রসেস-মেমোরিতে থাকে, আর শেয়ার্ড ক্যাশের ভার্সন মুছে দিলে প্রতিটি প্রসেস নতুন করে বানায়।
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from .jobs import enqueue
+from .memo import request_memo
+from .models import Course, Unit, Lesson, Quiz, QuizAttemptSummary, UserEnrollment
+
+CONTENT_INDEX_VERSION_KEY = 'api:completion:index_version'
+
+# প্রসেস-লোকাল: (version, index)
+_index = None
+
+
+# --- বিট অপারেশন (LSB-first, answer_log এর মতো) ---
+
+def test_bit(bitmap, bit):
+    byte = bit >> 3
+    return byte < len(bitmap) and bool(bitmap[byte] & (1 << (bit & 7)))
+
+
+def set_bit(bitmap, bit):
+    bitmap = bytearray(bitmap or b'')
+    byte = bit >> 3
+    if byte >= len(bitmap):
+        bitmap.extend(bytes(byte + 1 - len(bitmap)))
+    bitmap[byte] |= 1 << (bit & 7)
+    return bytes(bitmap)
+
+
+# --- বিট ইনডেক্স বরাদ্দ (signals.py এর pre_save থেকে) ---
+
+def _quiz_course_id(quiz):
+    if quiz.lesson_id:
+        return Lesson.objects.filter(pk=quiz.lesson_id).values_list('unit__course_id', flat=True).first()
+    if quiz.unit_id:
+        return Unit.objects.filter(pk=quiz.unit_id).values_list('course_id', flat=True).first()
+    return None
+
+
+def _reserve_bits(course_id, count):
+    """কোর্সের কাউন্টার থেকে পরপর count টি বিট; প্রথমটির ইনডেক্স ফেরত দেয়।"""
+    with transaction.atomic():
+        # কাউন্টার রো লক করে পড়া হয়, যাতে একসাথে তৈরি দুটি কুইজ একই বিট না পায়
+        course = Course.objects.select_for_update().only('completion_bits').get(pk=course_id)
+        Course.objects.filter(pk=course_id).update(completion_bits=F('completion_bits') + count)
+    return course.completion_bits
+
+
+def backfill_moved(course_id, quiz_ids):
+    # নতুন বিটে আগের অ্যাটেম্পটগুলো বসানো হয় কমিটের পরে, যাতে জব নতুন বিট দেখে
+    transaction.on_commit(lambda: enqueue('backfill_quiz_bits', {'course_id': course_id, 'quiz_ids': quiz_ids}))
+
+
+def allocate_bit(quiz):
+    """
+    কুইজ যে কোর্সে আছে সেই কোর্সের বিট না থাকলে (নতুন কুইজ, বা কুইজ অন্য কোর্সে সরানো হয়েছে) কাউন্টার
+    থেকে নতুন বিট দেয়। পুরনো কোর্সের বিট রেখে দিলে নতুন কোর্সের অন্য কোনো কুইজের বিটের সাথে মিলে যেতে পারে।
+    আগে থেকে থাকা কুইজ নতুন বিট পেলে True; সেভের পরে তার জন্য backfill_moved ডাকতে হয় (signals.py)।
+    """
+    course_id = _quiz_course_id(quiz)
+    if quiz.completion_bit is not None and quiz.completion_course_id == course_id:
+        return False
+    if course_id is None:
+        quiz.completion_bit = None
+        quiz.completion_course_id = None
+        return False
+    quiz.completion_bit = _reserve_bits(course_id, 1)
+    quiz.completion_course_id = course_id
+    return quiz.pk is not None
+
+
+def reallocate_moved_bits(condition):
+    """
+    ইউনিট বা লেসন অন্য কোর্সে সরানোর পরে (signals.py এর post_save): condition এর কুইজগুলোর মধ্যে যাদের বিট
+    অন্য কোর্সের, তারা বর্তমান কোর্স থেকে নতুন বিট পায়। কুইজের নিজের save হয় না, তাই সিগন্যালও চলে না।
+    """
+    moved = {}
+    for quiz_id, allocated_course_id, course_id in Quiz.objects.filter(condition).values_list(
+        'id', 'completion_course_id', Coalesce('lesson__unit__course_id', 'unit__course_id'),
+    ):
+        if course_id is not None and course_id != allocated_course_id:
+            moved.setdefault(course_id, []).append(quiz_id)
+
+    for course_id, quiz_ids in moved.items():
+        first = _reserve_bits(course_id, len(quiz_ids))
+        Quiz.objects.bulk_update([
+            Quiz(id=quiz_id, completion_bit=first + offset, completion_course_id=course_id)
+            for offset, quiz_id in enumerate(quiz_ids)
+        ], ['completion_bit', 'completion_course'])
+        backfill_moved(course_id, quiz_ids)
+    if moved:
+        invalidate_content_index()
+    return moved
+
+
+# --- কন্টেন্ট ইনডেক্স ---
+
+def invalidate_content_index():
+    # কমিটের পরে মোছা হয়; আগে মুছলে অন্য প্রসেস কমিটের আগের ডেটা থেকে (নতুন কুইজ ছাড়া) ইনডেক্স বানিয়ে
+    # নতুন ভার্সনে ক্যাশ করে ফেলতে পারে, আর পরের কন্টেন্ট বদল পর্যন্ত সেটিই চলে
+    transaction.on_commit(lambda: cache.delete(CONTENT_INDEX_VERSION_KEY))
+
+
+def _build_index():
+    quizzes = {}
+    lesson_quizzes = {}
+    unit_quizzes = {}
+    for quiz_id, bit, quiz_type, lesson_id, unit_id, course_id in Quiz.objects.filter(
+        completion_bit__isnull=False
+    ).values_list(
+        'id', 'completion_bit', 'quiz_type', 'lesson_id', 'unit_id',
+        Coalesce('lesson__unit__course_id', 'unit__course_id'),
+    ):
+        if course_id is None:
+            continue
+        quizzes[quiz_id] = (course_id, bit, quiz_type)
+        if lesson_id:
+            lesson_quizzes.setdefault(lesson_id, []).append(quiz_id)
+        if unit_id:
+            unit_quizzes.setdefault(unit_id, []).append(quiz_id)
+    return {'quizzes': quizzes, 'lesson_quizzes': lesson_quizzes, 'unit_quizzes': unit_quizzes}
+
+
+def get_content_index():
+    global _index
+    version = cache.get(CONTENT_INDEX_VERSION_KEY)
+    if version is not None and _index is not None and _index[0] == version:
+        return _index[1]
+
+    index = _build_index()
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(CONTENT_INDEX_VERSION_KEY, version, None)
+    _index = (version, index)
+    return index
+
+
+def lesson_quiz_ids(lesson_id, quiz_type=None):
+    index = get_content_index()
+    quiz_ids = index['lesson_quizzes'].get(lesson_id, [])
+    if quiz_type:
+        quiz_ids = [quiz_id for quiz_id in quiz_ids if index['quizzes'][quiz_id][2] == quiz_type]
+    return quiz_ids
+
+
+def unit_quiz_ids(unit_id):
+    return get_content_index()['unit_quizzes'].get(unit_id, [])
+
+
+def attempted_quiz_ids(bitmap, quiz_ids):
+    quizzes = get_content_index()['quizzes']
+    return {
+        quiz_id for quiz_id in quiz_ids
+        if quiz_id in quizzes and test_bit(bitmap, quizzes[quiz_id][1])
+    }
+
+
+# --- সিরিয়ালাইজার থেকে পড়া ---
+
+def _bitmap(context, user, course_id):
+    # রিকোয়েস্ট-স্কোপড memo: কোর্সপ্রতি একটি এনরোলমেন্ট রো (এনরোল না থাকলে None)
+    bitmaps = request_memo(context).setdefault('completion_bitmaps', {})
+    if course_id not in bitmaps:
+        bitmap = UserEnrollment.objects.filter(user=user, course_id=course_id).values_list(
+            'completion', flat=True
+        ).first()
+        bitmaps[course_id] = bytes(bitmap) if bitmap is not None else None
+    return bitmaps[course_id]
+
+
+def any_attempted(context, user, quiz_ids):
+    """quiz_ids এর কোনোটি ইউজার চেষ্টা করেছে কিনা।
+
+    এনরোল করা কোর্সে বিট টেস্ট; এনরোল না থাকলে বা ইনডেক্সে না থাকলে আগের মতো সামারি টেবিলে exists()।
+    """
+    quizzes = get_content_index()['quizzes']
+    fallback = []
+    for quiz_id in quiz_ids:
+        entry = quizzes.get(quiz_id)
+        bitmap = _bitmap(context, user, entry[0]) if entry else None
+        if bitmap is None:
+            fallback.append(quiz_id)
+        elif test_bit(bitmap, entry[1]):
+            return True
+    if not fallback:
+        return False
+    return QuizAttemptSummary.objects.filter(user=user, quiz_id__in=fallback).exists()
+
+
+def mark_attempted(bitmap, quiz_id):
+    entry = get_content_index()['quizzes'].get(quiz_id)
+    return set_bit(bitmap, entry[1]) if entry else bytes(bitmap or b'')
@@ -0,0 +1,242 @@
+# api/exports.py
+# অ্যাটেম্পট ও এনরোলমেন্টের স্ট্রিমিং এক্সপোর্ট (/api/exports/<dataset>.<csv|arrow|parquet>)।
+# সারিগুলো সার্ভার-সাইড কার্সরে চাংক করে পড়া হয়, প্রতিটি চাংক লিখেই পাঠিয়ে দেওয়া হয়,
+# তাই লাখ লাখ সারিতেও মেমরি চাংকের আকারে সীমিত থাকে।
+# arrow (IPC stream) ও parquet শুধু pyarrow ইনস্টল থাকলে পাওয়া যায়; csv সবসময়।
+import csv
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import GroupMembership, LearningGroup, Quiz, UserEnrollment, UserQuizAttempt
+from .streaming import iter_chunks, streaming_response
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - pyarrow ঐচ্ছিক
+    pyarrow = None
+
+EXPORT_CHUNK_SIZE = 5000
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+ARROW_FORMATS = ('arrow', 'parquet')
+
+# (কলামের নাম, values_list লুকআপ, ধরন); ধরন থেকে Arrow স্কিমা বানানো হয়
+DATASETS = {
+    'attempts': {
+        'model': UserQuizAttempt,
+        'date_field': 'timestamp',
+        'columns': [
+            ('id', 'id', 'int'),
+            ('user_id', 'user_id', 'int'),
+            ('username', 'user__username', 'str'),
+            ('quiz_id', 'quiz_id', 'int'),
+            ('quiz_title', 'quiz__title', 'str'),
+            ('course_id', 'course_id', 'int'),
+            ('score', 'score', 'int'),
+            ('total_points', 'total_points', 'int'),
+            ('timestamp', 'timestamp', 'datetime'),
+            ('seed', 'seed', 'int'),
+        ],
+    },
+    'enrollments': {
+        'model': UserEnrollment,
+        'date_field': 'enrolled_at',
+        'columns': [
+            ('id', 'id', 'int'),
+            ('user_id', 'user_id', 'int'),
+            ('username', 'user__username', 'str'),
+            ('course_id', 'course_id', 'int'),
+            ('course_title', 'course__title', 'str'),
+            ('enrolled_at', 'enrolled_at', 'datetime'),
+            ('last_activity_at', 'last_activity_at', 'datetime'),
+        ],
+    },
+}
+
+
+def parse_filters(params):
+    """?course=, ?group=, ?since=, ?until= (YYYY-MM-DD, দুটোই অন্তর্ভুক্ত) -> (filters, error)।"""
+    filters = {}
+    for key in ('course', 'group'):
+        value = params.get(key)
+        if value:
+            if not value.isdigit():
+                return None, f'{key} অবশ্যই আইডি হতে হবে।'
+            filters[key] = int(value)
+    for key in ('since', 'until'):
+        value = params.get(key)
+        if value:
+            try:
+                day = parse_date(value)
+            except ValueError:
+                day = None
+            if day is None:
+                return None, f'{key} অবশ্যই YYYY-MM-DD ফরম্যাটে হতে হবে।'
+            filters[key] = day
+    return filters, None
+
+
+def managed_group_ids(user):
+    """যে গ্রুপগুলোর অ্যাডমিন ইউজার (গ্রুপের মালিক বা is_group_admin সদস্য)।"""
+    return set(
+        LearningGroup.objects.filter(
+            Q(admin_id=user.id) | Q(memberships__user_id=user.id, memberships__is_group_admin=True)
+        ).values_list('id', flat=True)
+    )
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def build_queryset(dataset, user, filters):
+    """
+    এক্সপোর্টের কোয়েরিসেট, ইউজারের অধিকার অনুযায়ী সীমিত। স্টাফ সব দেখে, গ্রুপ অ্যাডমিন শুধু
+    নিজের গ্রুপের সদস্যদের। অধিকার না থাকলে None।
+    """
+    spec = DATASETS[dataset]
+    queryset = spec['model'].objects.all()
+
+    if not user.is_staff:
+        group_ids = managed_group_ids(user)
+        if not group_ids or ('group' in filters and filters['group'] not in group_ids):
+            return None
+        if 'group' not in filters:
+            # IN (সাবকোয়েরি), join নয়: একাধিক গ্রুপে থাকা সদস্যের সারি দুবার আসে না
+            queryset = queryset.filter(user_id__in=Subquery(
+                GroupMembership.objects.filter(group_id__in=group_ids).values('user_id')
+            ))
+    if 'group' in filters:
+        queryset = queryset.filter(user_id__in=Subquery(
+            GroupMembership.objects.filter(group_id=filters['group']).values('user_id')
+        ))
+
+    if 'course' in filters:
+        if dataset == 'attempts':
+            queryset = queryset.filter(quiz_id__in=Subquery(
+                Quiz.objects.filter(
+                    Q(lesson__unit__course_id=filters['course']) | Q(unit__course_id=filters['course'])
+                ).values('id')
+            ))
+        else:
+            queryset = queryset.filter(course_id=filters['course'])
+
+    # তারিখের সীমা সরাসরি কলামের রেঞ্জ হিসেবে, যাতে ইনডেক্স (আর অ্যাটেম্পটের মাসিক পার্টিশন) কাজে লাগে
+    date_field = spec['date_field']
+    if 'since' in filters:
+        queryset = queryset.filter(**{f'{date_field}__gte': _day_start(filters['since'])})
+    if 'until' in filters:
+        queryset = queryset.filter(**{f'{date_field}__lt': _day_start(filters['until'] + timedelta(days=1))})
+
+    return queryset
+
+
+def export_rows(dataset, queryset):
+    """মডেল কোয়েরিসেট -> এক্সপোর্টের কলাম অনুযায়ী tuple সারি (অ্যাডমিন অ্যাকশনও এটি ব্যবহার করে)।"""
+    if dataset == 'attempts':
+        queryset = queryset.annotate(
+            course_id=Coalesce('quiz__lesson__unit__course_id', 'quiz__unit__course_id')
+        )
+    return queryset.order_by('id').values_list(*(lookup for _, lookup, _ in DATASETS[dataset]['columns']))
+
+
+# --- ফরম্যাট লেখক: প্রতিটি চাংকের জন্য bytes/str yield করে ---
+class _Echo:
+    # csv.writer এর জন্য বাফার: লেখা লাইনটাই ফেরত দেয়
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def csv_chunks(columns, chunks):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([name for name, _, _ in columns])
+    for rows in chunks:
+        yield ''.join(writer.writerow([_csv_cell(value) for value in row]) for row in rows)
+
+
+class _Sink:
+    # pyarrow এর লেখা bytes জমিয়ে রাখে; প্রতিটি চাংকের পরে drain() করে পাঠিয়ে খালি করা হয়
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema(columns):
+    types = {
+        'int': pyarrow.int64(),
+        'str': pyarrow.string(),
+        'datetime': pyarrow.timestamp('us', tz='UTC'),
+    }
+    return pyarrow.schema([(name, types[kind]) for name, _, kind in columns])
+
+
+def _record_batch(schema, rows):
+    values = list(zip(*rows))
+    return pyarrow.RecordBatch.from_arrays(
+        [pyarrow.array(column, type=field.type) for column, field in zip(values, schema)], schema=schema
+    )
+
+
+def arrow_chunks(columns, chunks, fmt):
+    schema = _arrow_schema(columns)
+    sink = _Sink()
+    if fmt == 'parquet':
+        # প্রতিটি চাংক একটি row group
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+    for rows in chunks:
+        writer.write_batch(_record_batch(schema, rows))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def export_response(request, dataset, queryset, fmt, chunk_size=EXPORT_CHUNK_SIZE):
+    columns = DATASETS[dataset]['columns']
+    chunks = iter_chunks(export_rows(dataset, queryset), chunk_size)
+    if fmt == 'csv':
+        content = csv_chunks(columns, chunks)
+    else:
+        content = arrow_chunks(columns, chunks, fmt)
+    response = streaming_response(request, content, FORMATS[fmt])
+    filename = f"{dataset}-{timezone.localdate():%Y%m%d}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,326 @@
+# api/fast_serializers.py
+# কন্টেন্ট রিড-পাথের (ক্যাটাগরি, কোর্স, ইউনিট) হালকা সিরিয়ালাইজার।
+# ModelSerializer প্রতিটি রো থেকে মডেল ইনস্ট্যান্স আর ফিল্ড অবজেক্ট বানায়; কোয়েরি কমানোর পরে সেই CPU-ই
+# সময়ের বড় অংশ। এখানে প্রতিটি সিরিয়ালাইজার ঘোষণামূলক: কোন কী কলাম থেকে, কোনটি নেস্টেড লিস্ট, কোনটি
+# get_<কী> মেথড থেকে আসবে তা ক্লাস তৈরির সময়েই "কম্পাইল" হয়ে গেটারের তালিকা হয়ে যায়। রো আসে .values_list()
+# টাপল হিসেবে, নেস্টেড লেভেলপ্রতি একটি কোয়েরি (parent_id__in) আর প্যারেন্ট অনুযায়ী গ্রুপ করা হয়।
+#
+# আউটপুট api/serializers.py এর সংশ্লিষ্ট সিরিয়ালাইজারের JSON এর সাথে হুবহু মেলে (কী-এর ক্রমসহ);
+# ইউজারভিত্তিক ফিল্ডগুলো একই হেল্পার (any_attempted, user_earned_points ...) দিয়ে হিসাব হয়।
+# মেলানো যাচাই: api/tests.py (FastSerializerConformanceTests); বেঞ্চমার্ক: python manage.py benchmark_fast_serializers
+from operator import attrgetter
+
+from django.conf import settings
+from django.db.models import BooleanField, Case, Q, Value, When
+
+from .cache import get_course_stats, get_unit_stats
+from .completion import any_attempted, lesson_quiz_ids, unit_quiz_ids
+from .models import Category, Choice, Course, GamePair, Lesson, MatchingGame, Question, Quiz, Unit
+from .sampling import draw_paper, new_seed, parse_seed, shuffle_choices
+from .serializers import enrolled_course_ids, latest_score, user_earned_points
+
+
+class FastSerializer:
+    model = None
+    fields = ()          # আউটপুটের কী, ক্রমসহ (ModelSerializer এর Meta.fields এর মতো)
+    sources = {}         # কী -> values() লুকআপ, নাম আলাদা হলে (যেমন 'category': 'category_id')
+    columns = ()         # get_* মেথডের জন্য বাড়তি কলাম
+    annotations = {}     # কলাম হিসেবে পড়া এক্সপ্রেশন
+    nested = {}          # কী -> (চাইল্ড সিরিয়ালাইজার, চাইল্ডের প্যারেন্ট FK কলাম, বাড়তি filter)
+    ordering = ('id',)   # মডেলের Meta.ordering এর মতো, টাই ভাঙতে id
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.model is not None:
+            cls._compile()
+
+    @classmethod
+    def _compile(cls):
+        lookups = ['id']
+        plan = []
+        for key in cls.fields:
+            # get_<কী> থাকলে সেটিই (নেস্টেড ডেটা তখনও আনা হয়, মেথড self._children থেকে পড়ে)
+            if hasattr(cls, f'get_{key}'):
+                plan.append((key, 'method', f'get_{key}'))
+            elif key in cls.nested:
+                plan.append((key, 'nested', key))
+            else:
+                lookup = cls.sources.get(key, key)
+                lookups.append(lookup)
+                plan.append((key, 'column', attrgetter(lookup)))
+        lookups.extend(cls.columns)
+        lookups.extend(cls.annotations)
+        cls._lookups = list(dict.fromkeys(lookups))
+        cls._plan = plan
+
+    def __init__(self, context):
+        self.context = context
+        self._children = {}
+        getters = []
+        for key, kind, target in self._plan:
+            if kind == 'column':
+                getters.append((key, target))
+            elif kind == 'method':
+                getters.append((key, getattr(self, target)))
+            else:
+                getters.append((key, self._nested_getter(key)))
+        self._getters = getters
+
+    def _nested_getter(self, key):
+        def get(row):
+            return self._children[key].get(row.id, [])
+        return get
+
+    @property
+    def user(self):
+        return self.context['request'].user
+
+    def fetch(self, queryset, extra=()):
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        if not queryset.ordered:
+            queryset = queryset.order_by(*self.ordering)
+        lookups = list(dict.fromkeys([*self._lookups, *extra]))
+        return list(queryset.values_list(*lookups, named=True))
+
+    def prepare(self, rows):
+        """রো আসার পরে, ডিকশনারি বানানোর আগে: ব্যাচের জন্য বাড়তি ডেটা একবারে আনার জায়গা।"""
+
+    def serialize_rows(self, rows):
+        self.prepare(rows)
+        ids = [row.id for row in rows]
+        for key, (child_class, parent_column, filters) in self.nested.items():
+            child = child_class(self.context)
+            child_rows = child.fetch(
+                child.model.objects.filter(**{f'{parent_column}__in': ids}, **filters), extra=(parent_column,)
+            ) if ids else []
+            grouped = {}
+            parent_of = attrgetter(parent_column)
+            for child_row, item in zip(child_rows, child.serialize_rows(child_rows)):
+                grouped.setdefault(parent_of(child_row), []).append(item)
+            self._children[key] = grouped
+
+        getters = self._getters
+        return [{key: get(row) for key, get in getters} for row in rows]
+
+    def many(self, queryset):
+        return self.serialize_rows(self.fetch(queryset))
+
+
+# --- গেম ---
+
+class GamePairFast(FastSerializer):
+    model = GamePair
+    fields = ('id', 'item_one', 'item_two')
+
+
+class MatchingGameFast(FastSerializer):
+    model = MatchingGame
+    fields = ('id', 'title', 'game_type', 'lesson', 'unit', 'order', 'pairs', 'is_attempted')
+    sources = {'lesson': 'lesson_id', 'unit': 'unit_id'}
+    nested = {'pairs': (GamePairFast, 'game_id', {})}
+    ordering = ('order', 'id')
+
+    def get_is_attempted(self, row):
+        user = self.user
+        if not user.is_authenticated:
+            return False
+        if row.unit_id:
+            return any_attempted(self.context, user, unit_quiz_ids(row.unit_id))
+        if row.lesson_id:
+            return any_attempted(self.context, user, lesson_quiz_ids(row.lesson_id))
+        return False
+
+
+# --- কুইজ ---
+
+class ChoiceFast(FastSerializer):
+    model = Choice
+    fields = ('id', 'text', 'is_correct')
+
+    def serialize_rows(self, rows):
+        data = super().serialize_rows(rows)
+        if not settings.QUIZ_EXPOSE_ANSWERS:
+            for choice in data:
+                choice.pop('is_correct')
+        return data
+
+
+class QuestionFast(FastSerializer):
+    model = Question
+    fields = ('id', 'text', 'points', 'choices', 'explanation')
+    nested = {'choices': (ChoiceFast, 'question_id', {})}
+
+    def serialize_rows(self, rows):
+        data = super().serialize_rows(rows)
+        if not settings.QUIZ_EXPOSE_ANSWERS:
+            for question in data:
+                question.pop('explanation')
+        return data
+
+
+class QuizFast(FastSerializer):
+    model = Quiz
+    fields = ('id', 'title', 'quiz_type', 'lesson', 'unit', 'questions', 'is_attempted', 'latest_score_percentage', 'seed')
+    sources = {'lesson': 'lesson_id', 'unit': 'unit_id'}
+    columns = ('sample_size', 'shuffle_choices')
+    nested = {'questions': (QuestionFast, 'quiz_id', {})}
+
+    def __init__(self, context):
+        super().__init__(context)
+        self._seeds = {}
+
+    def _is_randomized(self, row):
+        return bool(row.sample_size) or row.shuffle_choices
+
+    def _seed_for(self, row):
+        # QuizSerializer এর মতো: questions আর seed একই seed পায়, ?seed= দিলে সেটিই
+        if row.id not in self._seeds:
+            requested = parse_seed(self.context['request'].query_params.get('seed'))
+            self._seeds[row.id] = new_seed() if requested is None else requested
+        return self._seeds[row.id]
+
+    def get_seed(self, row):
+        if not self._is_randomized(row):
+            return None
+        return self._seed_for(row)
+
+    def get_questions(self, row):
+        questions = self._children['questions'].get(row.id, [])
+        if not self._is_randomized(row):
+            return questions
+
+        seed = self._seed_for(row)
+        by_id = {question['id']: question for question in questions}
+        paper = draw_paper(row.id, row.sample_size, seed) if row.sample_size else list(by_id)
+        data = []
+        for question_id in paper:
+            question = by_id.get(question_id)
+            if question is None:
+                continue
+            if row.shuffle_choices:
+                question = {**question, 'choices': shuffle_choices(question['choices'], seed, question_id)}
+            data.append(question)
+        return data
+
+    def get_is_attempted(self, row):
+        user = self.user
+        if not user.is_authenticated:
+            return False
+        return any_attempted(self.context, user, [row.id])
+
+    def get_latest_score_percentage(self, row):
+        if not self.user.is_authenticated:
+            return None
+        summary = latest_score(self.context, row.id)
+        if summary and summary[1] > 0:
+            return round((summary[0] / summary[1]) * 100)
+        return None
+
+
+# --- ইউনিট ---
+
+class UnitLessonFast(FastSerializer):
+    model = Lesson
+    fields = ('id', 'title', 'order', 'has_video', 'has_article', 'has_quiz', 'has_game', 'is_attempted')
+    columns = ('youtube_video_id',)
+    # লম্বা আর্টিকেলের পুরো টেক্সট না এনে শুধু খালি কিনা
+    annotations = {
+        'article_present': Case(
+            When(Q(article_body__isnull=True) | Q(article_body=''), then=Value(False)),
+            default=Value(True), output_field=BooleanField(),
+        ),
+    }
+    ordering = ('order', 'id')
+
+    def prepare(self, rows):
+        ids = [row.id for row in rows]
+        self._quiz_lessons = set(Quiz.objects.filter(
+            lesson_id__in=ids, quiz_type='LESSON'
+        ).values_list('lesson_id', flat=True)) if ids else set()
+        self._game_lessons = set(MatchingGame.objects.filter(
+            lesson_id__in=ids, game_type='LESSON'
+        ).values_list('lesson_id', flat=True)) if ids else set()
+
+    def get_has_video(self, row):
+        return bool(row.youtube_video_id)
+
+    def get_has_article(self, row):
+        return row.article_present
+
+    def get_has_quiz(self, row):
+        return row.id in self._quiz_lessons
+
+    def get_has_game(self, row):
+        return row.id in self._game_lessons
+
+    def get_is_attempted(self, row):
+        user = self.user
+        if not user.is_authenticated:
+            return False
+        return any_attempted(self.context, user, lesson_quiz_ids(row.id, quiz_type='LESSON'))
+
+
+class UnitFast(FastSerializer):
+    model = Unit
+    fields = (
+        'id', 'title', 'order', 'course_title',
+        'lessons', 'quizzes',
+        'matching_games',
+        'total_possible_points', 'user_earned_points',
+    )
+    sources = {'course_title': 'course__title'}
+    columns = ('course_id',)
+    nested = {
+        'lessons': (UnitLessonFast, 'unit_id', {}),
+        'quizzes': (QuizFast, 'unit_id', {'quiz_type': 'UNIT'}),
+        'matching_games': (MatchingGameFast, 'unit_id', {'game_type': 'UNIT'}),
+    }
+    ordering = ('order', 'id')
+
+    def get_total_possible_points(self, row):
+        return get_unit_stats(row.id)['total_possible_points']
+
+    def get_user_earned_points(self, row):
+        return user_earned_points(self.context, row.course_id, row.id)
+
+
+# --- কোর্স ও ক্যাটাগরি ---
+
+class CourseFast(FastSerializer):
+    model = Course
+    fields = (
+        'id', 'title', 'description', 'category', 'units',
+        'total_possible_points', 'user_earned_points',
+        'is_premium', 'is_enrolled',
+        'total_units', 'total_lessons', 'total_quizzes',
+    )
+    sources = {'category': 'category_id'}
+    nested = {'units': (UnitFast, 'course_id', {})}
+
+    def get_is_enrolled(self, row):
+        user = self.context.get('request').user
+        if not user or not user.is_authenticated:
+            return False
+        return row.id in enrolled_course_ids(self.context)
+
+    def get_total_possible_points(self, row):
+        return get_course_stats(row.id)['total_possible_points']
+
+    def get_user_earned_points(self, row):
+        return user_earned_points(self.context, row.id)
+
+    def get_total_units(self, row):
+        return get_course_stats(row.id)['total_units']
+
+    def get_total_lessons(self, row):
+        return get_course_stats(row.id)['total_lessons']
+
+    def get_total_quizzes(self, row):
+        return get_course_stats(row.id)['total_quizzes']
+
+
+class CategoryFast(FastSerializer):
+    model = Category
+    fields = ('id', 'name', 'courses')
+    nested = {'courses': (CourseFast, 'category_id', {})}
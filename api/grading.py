@@ -0,0 +1,97 @@
+# api/grading.py
+# সার্ভার-সাইড কুইজ গ্রেডিং।
+# প্রতিটি কুইজের উত্তর-চাবি (প্রশ্নের পয়েন্ট, সঠিক চয়েসের সেট, ব্যাখ্যা) একবার কম্পাইল করে ক্যাশে রাখা হয়,
+# ফলে গ্রেড করার সময় কোনো কোয়েরি লাগে না। কন্টেন্ট বদলালে signals.py থেকে চাবি মুছে ফেলা হয়।
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.functions import Coalesce
+
+from .cache import CACHE_TIMEOUT
+from .models import Quiz, Question, Choice
+
+ANSWER_KEY_CACHE_KEY = 'api:quiz:{}:answer_key:v2'
+
+
+def compile_answer_key(quiz_id):
+    """{'questions': {question_id: (points, frozenset(correct_choice_ids), explanation)},
+        'order': [question_id, ...], 'total_points': int, 'course_id': int}"""
+    questions = {}
+    order = []
+    for question_id, points, explanation in Question.objects.filter(quiz_id=quiz_id).order_by('id').values_list(
+        'id', 'points', 'explanation'
+    ):
+        questions[question_id] = (points, set(), explanation)
+        order.append(question_id)
+
+    for question_id, choice_id in Choice.objects.filter(
+        question__quiz_id=quiz_id, is_correct=True
+    ).values_list('question_id', 'id'):
+        questions[question_id][1].add(choice_id)
+
+    return {
+        'questions': {
+            question_id: (points, frozenset(correct), explanation)
+            for question_id, (points, correct, explanation) in questions.items()
+        },
+        'order': order,
+        'total_points': sum(points for points, _, _ in questions.values()),
+        'course_id': Quiz.objects.filter(pk=quiz_id).values_list(
+            Coalesce('lesson__unit__course_id', 'unit__course_id'), flat=True
+        ).first(),
+    }
+
+
+def get_answer_key(quiz_id):
+    cache_key = ANSWER_KEY_CACHE_KEY.format(quiz_id)
+    answer_key = cache.get(cache_key)
+    if answer_key is None:
+        answer_key = compile_answer_key(quiz_id)
+        cache.set(cache_key, answer_key, CACHE_TIMEOUT)
+    return answer_key
+
+
+def invalidate_answer_key(quiz_id):
+    # কমিটের পরে মোছা হয়; আগে মুছলে একসাথে চলা কোনো গ্রেড কমিটের আগের পুরনো চাবি আবার ক্যাশে রেখে দিতে পারে
+    if quiz_id:
+        transaction.on_commit(lambda: cache.delete(ANSWER_KEY_CACHE_KEY.format(quiz_id)))
+
+
+def normalize_answers(raw_answers):
+    """{"<question_id>": [choice_id, ...] বা choice_id} -> {question_id: frozenset(choice_ids)}"""
+    answers = {}
+    for question_id, choice_ids in raw_answers.items():
+        if not isinstance(choice_ids, (list, tuple)):
+            choice_ids = [choice_ids]
+        answers[int(question_id)] = frozenset(int(choice_id) for choice_id in choice_ids if choice_id is not None)
+    return answers
+
+
+def grade(answer_key, answers, question_ids=None):
+    """answers হলো normalize_answers() এর ফলাফল। question_ids দিলে শুধু ঐ প্রশ্নগুলো গ্রেড হয়।
+
+    একটি প্রশ্ন তখনই সঠিক যখন নির্বাচিত চয়েসের সেট আর সঠিক চয়েসের সেট হুবহু মেলে।
+    """
+    questions = answer_key['questions']
+    if question_ids is None:
+        question_ids = answer_key['order']
+
+    score = 0
+    total_points = 0
+    results = []
+    for question_id in question_ids:
+        points, correct, explanation = questions[question_id]
+        selected = answers.get(question_id, frozenset())
+        is_correct = bool(correct) and selected == correct
+        awarded = points if is_correct else 0
+        score += awarded
+        total_points += points
+        results.append({
+            'question': question_id,
+            'selected_choices': sorted(selected),
+            'correct_choices': sorted(correct),
+            'is_correct': is_correct,
+            'points_awarded': awarded,
+            'explanation': explanation,
+        })
+
+    return score, total_points, results
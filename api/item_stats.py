@@ -0,0 +1,120 @@
+# api/item_stats.py
+# অ্যাটেম্পটের answer_log থেকে প্রতিটি প্রশ্নের difficulty, discrimination ও distractor ফ্রিকোয়েন্সি হিসাব।
+# পুরো টেবিল একবার সার্ভার-সাইড কার্সরে চাংক করে পড়া হয়, আর প্রতিটি চাংক numpy দিয়ে
+# bincount করে শুধু প্রশ্নপ্রতি কয়েকটি যোগফল জমা রাখা হয়, তাই মেমরি উত্তরের সংখ্যার উপর নির্ভর করে না।
+from collections import Counter
+
+import numpy as np
+
+from .answer_log import HEADER, ID_DTYPES
+from .models import Question, Choice, QuestionStats, UserQuizAttempt
+
+
+def _decode_chunk(blobs, scores):
+    """এক চাংক ব্লব থেকে সমান দৈর্ঘ্যের (question_ids, choice_ids, correct, attempt_scores) অ্যারে।"""
+    question_parts, choice_parts, correct_parts, lengths = [], [], [], []
+    for blob in blobs:
+        blob = bytes(blob)
+        version, n = HEADER.unpack_from(blob)
+        dtype = np.dtype(ID_DTYPES[version])
+        offset = HEADER.size
+        question_parts.append(np.frombuffer(blob, dtype=dtype, count=n, offset=offset))
+        choice_parts.append(np.frombuffer(blob, dtype=dtype, count=n, offset=offset + n * dtype.itemsize))
+        bits = np.frombuffer(blob, dtype=np.uint8, offset=offset + 2 * n * dtype.itemsize)
+        correct_parts.append(np.unpackbits(bits, bitorder='little')[:n])
+        lengths.append(n)
+
+    if not lengths:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty, empty, empty
+    return (
+        np.concatenate(question_parts).astype(np.int64),
+        np.concatenate(choice_parts).astype(np.int64),
+        np.concatenate(correct_parts).astype(np.float64),
+        np.repeat(np.asarray(scores, dtype=np.float64), lengths),
+    )
+
+
+def compute_item_stats(chunk_size=5000):
+    question_points = dict(Question.objects.values_list('id', 'points'))
+    question_ids = np.array(sorted(question_points), dtype=np.int64)
+    points = np.array([question_points[qid] for qid in question_ids], dtype=np.float64)
+    m = len(question_ids)
+
+    # প্রশ্নপ্রতি যোগফল: x = সঠিক (0/1), y = অ্যাটেম্পটের মোট স্কোর
+    n = np.zeros(m)
+    sum_x = np.zeros(m)
+    sum_y = np.zeros(m)
+    sum_yy = np.zeros(m)
+    sum_xy = np.zeros(m)
+    choice_counts = Counter()
+
+    def consume(blobs, scores):
+        qids, cids, x, y = _decode_chunk(blobs, scores)
+        if not len(qids) or not m:
+            return
+        index = np.searchsorted(question_ids, qids)
+        valid = index < m
+        valid[valid] = question_ids[index[valid]] == qids[valid]   # মুছে ফেলা প্রশ্ন বাদ
+        index, cids, x, y = index[valid], cids[valid], x[valid], y[valid]
+
+        n[:] += np.bincount(index, minlength=m)
+        sum_x[:] += np.bincount(index, weights=x, minlength=m)
+        sum_y[:] += np.bincount(index, weights=y, minlength=m)
+        sum_yy[:] += np.bincount(index, weights=y * y, minlength=m)
+        sum_xy[:] += np.bincount(index, weights=x * y, minlength=m)
+
+        # চয়েস আইডি গ্লোবালি ইউনিক; "উত্তর দেয়নি" (0) প্রশ্নভেদে আলাদা রাখতে -(index + 1) কী
+        keys = np.where(cids == 0, -(index + 1), cids)
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        choice_counts.update(dict(zip(unique_keys.tolist(), counts.tolist())))
+
+    blobs, scores = [], []
+    rows = UserQuizAttempt.objects.filter(answer_log__isnull=False).values_list('answer_log', 'score')
+    for blob, score in rows.iterator(chunk_size=chunk_size):
+        blobs.append(blob)
+        scores.append(score)
+        if len(blobs) >= chunk_size:
+            consume(blobs, scores)
+            blobs, scores = [], []
+    consume(blobs, scores)
+
+    # discrimination: আইটেম বনাম বাকি স্কোর (y - points * x) এর point-biserial correlation
+    with np.errstate(divide='ignore', invalid='ignore'):
+        difficulty = sum_x / n
+        rest_y = sum_y - points * sum_x
+        rest_yy = sum_yy - 2 * points * sum_xy + points * points * sum_x
+        rest_xy = sum_xy - points * sum_x
+        numerator = n * rest_xy - sum_x * rest_y
+        denominator = np.sqrt((n * sum_x - sum_x * sum_x) * (n * rest_yy - rest_y * rest_y))
+        discrimination = numerator / denominator
+
+    choice_question = dict(Choice.objects.values_list('id', 'question_id'))
+    per_question_choices = {}
+    for key, count in choice_counts.items():
+        if key < 0:
+            question_id, choice_key = int(question_ids[-key - 1]), '0'
+        else:
+            question_id, choice_key = choice_question.get(key), str(key)
+        if question_id is not None:
+            per_question_choices.setdefault(question_id, {})[choice_key] = count
+
+    stats = []
+    for i, question_id in enumerate(question_ids.tolist()):
+        if not n[i]:
+            continue
+        stats.append(QuestionStats(
+            question_id=question_id,
+            responses=int(n[i]),
+            difficulty=float(difficulty[i]),
+            discrimination=float(discrimination[i]) if np.isfinite(discrimination[i]) else None,
+            choice_counts=per_question_choices.get(question_id, {}),
+        ))
+    QuestionStats.objects.bulk_create(
+        stats,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['question'],
+        update_fields=['responses', 'difficulty', 'discrimination', 'choice_counts', 'computed_at'],
+    )
+    return len(stats)
@@ -0,0 +1,204 @@
+# api/jobs.py
+# ডেটাবেস-ভিত্তিক ব্যাকগ্রাউন্ড জব কিউ (আলাদা ব্রোকার লাগে না)।
+#   enqueue('rebuild_group_leaderboard', {'group_id': 5})
+#   python manage.py run_jobs --workers 2
+# JOB_QUEUE_EAGER বন্ধ থাকলে (প্রোডাকশন) ওয়ার্কার ছাড়া কোনো জব চলে না; দেখুন settings.py এর "জব কিউ"।
+import hashlib
+import json
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+RETRY_BASE_SECONDS = 10
+STALE_AFTER = timedelta(minutes=15)
+PURGE_INTERVAL_SECONDS = 60 * 60 * 24
+DONE_RETENTION_DAYS = 7
+FAILED_RETENTION_DAYS = 30      # ব্যর্থ জব ডিবাগের জন্য বেশি দিন রাখা হয়
+
+
+def job_handler(kind):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def make_dedupe_key(kind, payload):
+    raw = json.dumps([kind, payload], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def enqueue(kind, payload=None, priority=0, delay=0, max_attempts=3):
+    """একটি জব কিউতে রাখে। একই kind + payload এর PENDING জব আগে থেকে থাকলে কিছুই করে না।"""
+    payload = payload or {}
+    if getattr(settings, 'JOB_QUEUE_EAGER', False):
+        HANDLERS[kind](**payload)
+        return
+
+    # INSERT ... ON CONFLICT DO NOTHING: unique_pending_job কনস্ট্রেইন্ট ডুপ্লিকেট আটকায়
+    Job.objects.bulk_create([
+        Job(
+            kind=kind,
+            payload=payload,
+            dedupe_key=make_dedupe_key(kind, payload),
+            priority=priority,
+            max_attempts=max_attempts,
+            run_after=timezone.now() + timedelta(seconds=delay),
+        )
+    ], ignore_conflicts=True)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_jobs(worker_id, limit=10):
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', run_after__lte=now)
+            .order_by('-priority', 'run_after', 'id')[:limit]
+        )
+        if jobs:
+            Job.objects.filter(id__in=[job.id for job in jobs]).update(
+                status='RUNNING', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1
+            )
+    for job in jobs:
+        job.attempts += 1
+    return jobs
+
+
+def _finish(job, **fields):
+    try:
+        Job.objects.filter(id=job.id).update(**fields)
+    except IntegrityError:
+        # আবার PENDING করতে গিয়ে দেখা গেল একই জব নতুন করে কিউতে আছে; সেটাই কাজটা করবে
+        Job.objects.filter(id=job.id).update(
+            status='FAILED', finished_at=timezone.now(), last_error=fields.get('last_error')
+        )
+
+
+def run_job(job):
+    handler = HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"অজানা জব: {job.kind}")
+        handler(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Job %s failed (attempt %s/%s)", job.id, job.attempts, job.max_attempts)
+        if job.attempts < job.max_attempts:
+            backoff = timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+            _finish(job, status='PENDING', locked_by=None, locked_at=None,
+                    run_after=timezone.now() + backoff, last_error=error)
+        else:
+            _finish(job, status='FAILED', finished_at=timezone.now(), last_error=error)
+        return False
+
+    _finish(job, status='DONE', finished_at=timezone.now())
+    return True
+
+
+def requeue_stale_jobs():
+    """ক্র্যাশ করা ওয়ার্কারের আটকে থাকা RUNNING জবগুলো আবার PENDING করে।"""
+    cutoff = timezone.now() - STALE_AFTER
+    for job in Job.objects.filter(status='RUNNING', locked_at__lt=cutoff):
+        _finish(job, status='PENDING', locked_by=None, locked_at=None, run_after=timezone.now())
+
+
+def purge_finished_jobs(days=DONE_RETENTION_DAYS, failed_days=FAILED_RETENTION_DAYS):
+    now = timezone.now()
+    Job.objects.filter(status='DONE', finished_at__lt=now - timedelta(days=days)).delete()
+    Job.objects.filter(status='FAILED', finished_at__lt=now - timedelta(days=failed_days)).delete()
+
+
+def work(worker_id=None, once=False, poll_interval=1.0, batch_size=10, should_stop=lambda: False):
+    worker_id = worker_id or default_worker_id()
+    while not should_stop():
+        jobs = claim_jobs(worker_id, batch_size)
+        for job in jobs:
+            run_job(job)
+        if once and not jobs:
+            return
+        if not jobs:
+            time.sleep(poll_interval)
+
+
+# === জব হ্যান্ডলার ===
+
+@job_handler('purge_jobs')
+def purge_jobs():
+    # প্রতিদিন একবার; ওয়ার্কার অনেকদিন রিস্টার্ট না হলেও পুরনো জব জমে না
+    purge_finished_jobs()
+    if not getattr(settings, 'JOB_QUEUE_EAGER', False):
+        enqueue('purge_jobs', delay=PURGE_INTERVAL_SECONDS)
+
+
+@job_handler('refresh_content')
+def refresh_content(course_id=None, unit_id=None, lesson_id=None, quiz_id=None):
+    from .cache import refresh_content_stats
+    refresh_content_stats(course_id=course_id, unit_id=unit_id, lesson_id=lesson_id, quiz_id=quiz_id)
+
+
+@job_handler('rebuild_group_leaderboard')
+def rebuild_group_leaderboard(group_id):
+    from .leaderboards import rebuild_group_leaderboard as rebuild
+    rebuild(group_id)
+
+
+@job_handler('user_progress_changed')
+def user_progress_changed(user_id):
+    users_progress_changed([user_id])
+
+
+@job_handler('users_progress_changed')
+def users_progress_changed(user_ids):
+    from .models import GroupMembership
+    group_ids = GroupMembership.objects.filter(user_id__in=user_ids).values_list('group_id', flat=True).distinct()
+    for group_id in group_ids:
+        enqueue('rebuild_group_leaderboard', {'group_id': group_id})
+
+
+@job_handler('backfill_enrollments')
+def backfill_enrollments(course_id, user_ids):
+    from .resume import backfill_enrollments as backfill
+    backfill(course_id, user_ids)
+
+
+@job_handler('backfill_quiz_bits')
+def backfill_quiz_bits(course_id, quiz_ids):
+    from .resume import backfill_quiz_bits as backfill
+    backfill(course_id, quiz_ids)
+
+
+@job_handler('enroll_group')
+def enroll_group(group_id, course_ids=None):
+    from .memberships import enroll_group as enroll
+    enroll(group_id, course_ids=course_ids)
+
+
+@job_handler('rebuild_rankings')
+def rebuild_rankings():
+    from .ranking import rebuild
+    rebuild()
+
+
+@job_handler('snapshot_rankings')
+def snapshot_rankings():
+    from .ranking import save_snapshot
+    save_snapshot()
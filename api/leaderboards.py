@@ -0,0 +1,159 @@
+# api/leaderboards.py
+# গ্রুপ লিডারবোর্ডের হিসাব ও ক্যাশ।
+# অ্যাটেম্পট বা মেম্বারশিপ বদলালে জব কিউ থেকে rebuild হয়; ভিউ শুধু ক্যাশ পড়ে।
+# সাপ্তাহিক/মাসিক আর কোর্স বা গ্লোবাল লিডারবোর্ড ScoreRollup এর চলতি উইন্ডোর বাকেট থেকে পড়া হয়
+# (ইউজার-কোর্স প্রতি একটি সারি), অল্প সময়ের জন্য ক্যাশ করা থাকে। গ্লোবাল/কোর্স অল-টাইম আসে ranking.py থেকে।
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Sum, Q, F, Window
+from django.db.models.functions import Rank
+from django.utils import timezone
+
+from . import ranking
+from .cache import get_group_summary
+from .models import LearningGroup, QuizAttemptSummary, ScoreRollup
+from .realtime import publish_rank_delta
+
+GROUP_LEADERBOARD_KEY = 'api:group:{}:leaderboard'
+LEADERBOARD_TIMEOUT = 60 * 60
+
+WINDOWS = ('week', 'month', 'all')
+WINDOWED_LEADERBOARD_KEY = 'api:leaderboard:{}:{}:{}:{}'  # group_id, course_id, window, day
+WINDOWED_LEADERBOARD_TIMEOUT = 60
+GLOBAL_LEADERBOARD_SIZE = 100
+
+
+def compute_group_leaderboard(group_id):
+    group = LearningGroup.objects.filter(id=group_id).first()
+    if group is None:
+        return []
+
+    group_courses = group.courses.all()
+    if not group_courses.exists():
+        return []
+
+    members = User.objects.filter(learning_groups__group=group)
+
+    lesson_quizzes_q = Q(quiz__lesson__unit__course__in=group_courses)
+    unit_quizzes_q = Q(quiz__unit__course__in=group_courses)
+
+    leaderboard_data = QuizAttemptSummary.objects.filter(
+        user__in=members
+    ).filter(
+        lesson_quizzes_q | unit_quizzes_q
+    ).values(
+        'user__username'
+    ).annotate(
+        total_score=Sum('latest_score'),
+        username=F('user__username')
+    ).filter(
+        total_score__gt=0
+    ).annotate(
+        rank=Window(
+            expression=Rank(),
+            order_by=F('total_score').desc()
+        )
+    ).order_by('rank')
+
+    return [
+        {'rank': row['rank'], 'username': row['username'], 'total_score': row['total_score']}
+        for row in leaderboard_data
+    ]
+
+
+def rebuild_group_leaderboard(group_id):
+    previous = cache.get(GROUP_LEADERBOARD_KEY.format(group_id))
+    entries = compute_group_leaderboard(group_id)
+    cache.set(GROUP_LEADERBOARD_KEY.format(group_id), entries, LEADERBOARD_TIMEOUT)
+    # কানেক্টেড ক্লায়েন্টদের শুধু পরিবর্তনগুলো পুশ করা হয়
+    publish_rank_delta(group_id, previous, entries)
+    return entries
+
+
+def get_group_leaderboard(group_id):
+    entries = cache.get(GROUP_LEADERBOARD_KEY.format(group_id))
+    if entries is None:
+        entries = rebuild_group_leaderboard(group_id)
+    return entries
+
+
+# --- সময়-উইন্ডো লিডারবোর্ড (ScoreRollup) ---
+
+def window_start(window, today=None):
+    """উইন্ডোর প্রথম দিন = ScoreRollup.day: চলতি সপ্তাহের সোমবার, মাসের ১ তারিখ, অল-টাইমে ALL_TIME_DAY।"""
+    today = today or timezone.localdate()
+    if window == 'week':
+        return today - timedelta(days=today.weekday())
+    if window == 'month':
+        return today.replace(day=1)
+    return ScoreRollup.ALL_TIME_DAY
+
+
+def compute_rollup_leaderboard(window, group_id=None, course_ids=None, limit=None):
+    rows = ScoreRollup.objects.filter(period=window, day=window_start(window))
+    if course_ids is not None:
+        rows = rows.filter(course_id__in=course_ids)
+    if group_id is not None:
+        rows = rows.filter(user__learning_groups__group_id=group_id)
+
+    leaderboard_data = rows.values(
+        'user__username'
+    ).annotate(
+        total_score=Sum('score'),
+        username=F('user__username')
+    ).filter(
+        total_score__gt=0
+    ).annotate(
+        rank=Window(
+            expression=Rank(),
+            order_by=F('total_score').desc()
+        )
+    ).order_by('rank')
+    if limit:
+        leaderboard_data = leaderboard_data[:limit]
+
+    return [
+        {'rank': row['rank'], 'username': row['username'], 'total_score': row['total_score']}
+        for row in leaderboard_data
+    ]
+
+
+def parse_params(params):
+    """?window= ও ?course= -> (window, course_id, error)। error থাকলে ৪০০ রেসপন্সের detail।"""
+    window = params.get('window') or 'all'
+    if window not in WINDOWS:
+        return None, None, f"window অবশ্যই {', '.join(WINDOWS)} এর একটি হতে হবে।"
+    course_id = params.get('course')
+    if course_id:
+        if not course_id.isdigit():
+            return None, None, 'course অবশ্যই কোর্সের আইডি হতে হবে।'
+        course_id = int(course_id)
+    return window, course_id or None, None
+
+
+def get_leaderboard(window='all', group_id=None, course_id=None):
+    """window: 'week' | 'month' | 'all'। group_id না দিলে গ্লোবাল (প্রথম GLOBAL_LEADERBOARD_SIZE জন)।"""
+    if group_id is not None and course_id is None and window == 'all':
+        return get_group_leaderboard(group_id)
+    if group_id is None and window == 'all':
+        # গ্লোবাল/কোর্স অল-টাইম: মেমোরির র‍্যাঙ্কিং বোর্ড (ranking.py)
+        return ranking.top(GLOBAL_LEADERBOARD_SIZE, course_id=course_id)
+
+    # দিন বদলালে উইন্ডোও সরে যায়, তাই তারিখ কী-এর অংশ
+    cache_key = WINDOWED_LEADERBOARD_KEY.format(group_id, course_id, window, timezone.localdate())
+    entries = cache.get(cache_key)
+    if entries is None:
+        if course_id is not None:
+            course_ids = [course_id]
+        elif group_id is not None:
+            course_ids = get_group_summary(group_id)['course_ids']
+        else:
+            course_ids = None
+        entries = compute_rollup_leaderboard(
+            window, group_id=group_id, course_ids=course_ids,
+            limit=GLOBAL_LEADERBOARD_SIZE if group_id is None else None,
+        )
+        cache.set(cache_key, entries, WINDOWED_LEADERBOARD_TIMEOUT)
+    return entries
@@ -0,0 +1,399 @@
+# api/live_quiz.py
+# লাইভ গ্রুপ কুইজ: গ্রুপ অ্যাডমিন একটি কুইজ শুরু করেন, সদস্যরা WebSocket এ একসাথে উত্তর দেন।
+#   ws://<host>/ws/live-quiz/<group_id>/?token=<token>
+#
+# অ্যাডমিন:  {"action": "start", "quiz_id": 7[, "seconds": 20]}
+#            {"action": "next"}   খোলা প্রশ্ন বন্ধ করে ফলাফল দেখায়, নয়তো পরের প্রশ্ন খোলে
+#            {"action": "end"}
+# সদস্য:     {"action": "answer", "question_id": 12, "choice_ids": [40]}
+#
+# সার্ভার থেকে: hello, question, answered, standings, finished, error
+# hello = রুমের পুরো অবস্থা; সংযোগের শুরুতে, আর ধীর ক্লায়েন্টের কিউ উপচে পড়লে বাদ পড়া মেসেজগুলোর বদলে।
+#
+# ধাপ: lobby -> starting -> question -> reveal -> question -> ... -> finished (-> starting)
+# রুমের পুরো অবস্থা প্রসেস-মেমোরিতে; উত্তর-চাবি (grading.py) শুরুতে একবার লোড হয়, তাই উত্তর গ্রেড করতে
+# কোনো কোয়েরি লাগে না। সেশন শেষে সবার অ্যাটেম্পট (attempts.record_attempts), রিভিউ আর কার্সর এক ব্যাচে লেখা হয়।
+# একটি গ্রুপের সব সংযোগ একই ASGI প্রসেসে আসতে হবে (লোড ব্যালান্সারে /ws/live-quiz/<group_id>/ অনুযায়ী স্টিকি রাউটিং)।
+import asyncio
+import json
+import logging
+import re
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models.functions import Coalesce
+
+from . import reviews
+from .answer_log import encode_results
+from .attempts import record_attempts
+from .grading import get_answer_key, grade
+from .jobs import enqueue
+from .models import Choice, GroupMembership, LearningGroup, Question, Quiz
+from .realtime import Connection, dumps, user_from_scope
+from .sampling import draw_paper, new_seed
+
+logger = logging.getLogger(__name__)
+
+PATH_PREFIX = '/ws/live-quiz/'
+PATH_RE = re.compile(r'^/ws/live-quiz/(\d+)/$')
+
+LOBBY, STARTING, QUESTION, REVEAL, FINISHED = 'lobby', 'starting', 'question', 'reveal', 'finished'
+
+
+class Participant:
+    def __init__(self, user_id, username):
+        self.user_id = user_id
+        self.username = username
+        self.connections = set()
+        self.answers = {}      # question_id -> frozenset(choice_ids)
+        self.score = 0
+        self.elapsed_ms = 0    # সঠিক উত্তরে লাগা মোট সময়, সমান স্কোরে কম সময় আগে
+
+    def send(self, text):
+        for connection in self.connections:
+            connection.offer(text)
+
+
+# --- ডেটাবেস অংশ (sync, ওয়ার্কার থ্রেডে) ---
+
+def _in_worker(func):
+    def call(*args):
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return sync_to_async(call, thread_sensitive=False)
+
+
+@_in_worker
+def _join_info(scope, group_id):
+    user = user_from_scope(scope)
+    if user is None:
+        return None, False, False
+    membership = GroupMembership.objects.filter(group_id=group_id, user=user).values_list(
+        'is_group_admin', 'group__admin_id'
+    ).first()
+    if membership is None:
+        return user, False, False
+    is_group_admin, admin_id = membership
+    return user, True, is_group_admin or admin_id == user.id
+
+
+@_in_worker
+def _load_quiz(group_id, quiz_id):
+    """গ্রুপের কোর্সের কুইজ হলে (answer_key, seed, [question payload]); নইলে None।"""
+    course_id = Quiz.objects.filter(pk=quiz_id).values_list(
+        Coalesce('lesson__unit__course_id', 'unit__course_id'), flat=True
+    ).first()
+    if course_id is None or not LearningGroup.objects.filter(id=group_id, courses__id=course_id).exists():
+        return None
+    sample_size = Quiz.objects.filter(pk=quiz_id).values_list('sample_size', flat=True).first()
+
+    answer_key = get_answer_key(quiz_id)
+    seed = None
+    question_ids = answer_key['order']
+    if sample_size:
+        # গ্রেড এন্ডপয়েন্টের মতো seed থেকে প্রশ্নপত্র, অ্যাটেম্পটে seed রাখা হয়
+        seed = new_seed()
+        question_ids = [
+            question_id for question_id in draw_paper(quiz_id, sample_size, seed)
+            if question_id in answer_key['questions']
+        ]
+
+    texts = dict(Question.objects.filter(id__in=question_ids).values_list('id', 'text'))
+    choices = {}
+    for question_id, choice_id, text in Choice.objects.filter(question_id__in=question_ids).order_by('id').values_list(
+        'question_id', 'id', 'text'
+    ):
+        choices.setdefault(question_id, []).append({'id': choice_id, 'text': text})
+    questions = [
+        {
+            'id': question_id,
+            'text': texts[question_id],
+            'points': answer_key['questions'][question_id][0],
+            'multiple': len(answer_key['questions'][question_id][1]) > 1,
+            'choices': choices.get(question_id, []),
+        }
+        for question_id in question_ids if question_id in texts
+    ]
+    return answer_key, seed, questions
+
+
+@_in_worker
+def _save_results(quiz_id, answer_key, seed, question_ids, answers):
+    # answers: [(user_id, {question_id: choice_ids})], রুমের অবস্থা থেকে আলাদা কপি
+    rows = []
+    for user_id, submitted in answers:
+        score, total_points, results = grade(answer_key, submitted, question_ids)
+        rows.append({
+            'user_id': user_id, 'score': score, 'total_points': total_points,
+            'seed': seed, 'answer_log': encode_results(results), 'results': results,
+        })
+    if not rows:
+        return
+    record_attempts(quiz_id, rows)
+    reviews.apply_results_for_users(
+        {row['user_id']: row['results'] for row in rows}, course_id=answer_key['course_id']
+    )
+    enqueue('users_progress_changed', {'user_ids': sorted(row['user_id'] for row in rows)})
+
+
+# --- রুম ---
+
+class Room:
+    def __init__(self, group_id):
+        self.group_id = group_id
+        self.participants = {}   # user_id -> Participant
+        self.connections = set()
+        self._reset()
+
+    def _reset(self):
+        self.state = LOBBY
+        self.quiz_id = None
+        self.answer_key = None
+        self.seed = None
+        self.questions = []
+        self.index = -1
+        self.seconds = settings.LIVE_QUIZ_SECONDS_PER_QUESTION
+        self.opened_at = None
+        # আগের সেশনের বাকি টাইমার নতুন সেশনের প্রশ্ন বন্ধ করে না দেয়
+        if getattr(self, '_timer', None) is not None:
+            self._timer.cancel()
+        self._timer = None
+        for participant in self.participants.values():
+            participant.answers = {}
+            participant.score = 0
+            participant.elapsed_ms = 0
+
+    # সংযোগ
+
+    def connect(self, connection, user):
+        participant = self.participants.get(user.id)
+        if participant is None:
+            participant = self.participants[user.id] = Participant(user.id, user.username)
+        participant.connections.add(connection)
+        self.connections.add(connection)
+        connection.offer(self.snapshot(participant))
+        return participant
+
+    def snapshot(self, participant):
+        return dumps({'type': 'hello', **self._status(participant)})
+
+    def disconnect(self, connection, participant):
+        participant.connections.discard(connection)
+        self.connections.discard(connection)
+        # উত্তর দেওয়া সদস্য ফলাফলে থেকে যায়; কিছু না করেই চলে গেলে বাদ
+        if not participant.connections and not participant.answers:
+            self.participants.pop(participant.user_id, None)
+
+    def is_idle(self):
+        return not self.connections and self.state in (LOBBY, FINISHED)
+
+    def broadcast(self, message):
+        # একবার এনকোড, সবার কিউতে একই টেক্সট
+        text = dumps(message)
+        for connection in self.connections:
+            connection.offer(text)
+
+    def _status(self, participant):
+        status = {'state': self.state, 'quiz_id': self.quiz_id, 'participants': len(self.participants)}
+        if self.state == QUESTION:
+            status['question'] = self._question_message()
+            status['answered'] = self.current['id'] in participant.answers
+        elif self.state in (REVEAL, FINISHED) and self.questions:
+            status['index'] = self.index
+            status['score'] = participant.score
+            status['standings'] = self.standings()[:settings.LIVE_QUIZ_STANDINGS_SIZE]
+        return status
+
+    @property
+    def current(self):
+        return self.questions[self.index]
+
+    def _question_message(self):
+        remaining = max(0.0, self.seconds - (time.monotonic() - self.opened_at))
+        return {
+            'type': 'question', 'index': self.index, 'total': len(self.questions),
+            'question': self.current, 'remaining_ms': int(remaining * 1000),
+        }
+
+    # অ্যাডমিন অ্যাকশন
+
+    async def start(self, quiz_id, seconds=None):
+        if self.state not in (LOBBY, FINISHED):
+            return 'একটি সেশন ইতিমধ্যে চলছে।'
+        # লোডের await চলাকালীন দ্বিতীয় "start" যেন একই চেক পার না হয়
+        previous_state, self.state = self.state, STARTING
+        try:
+            loaded = await _load_quiz(self.group_id, quiz_id)
+        except Exception:
+            self.state = previous_state
+            raise
+        if loaded is None or not loaded[2]:
+            self.state = previous_state
+            return 'কুইজটি এই গ্রুপের কোনো কোর্সে নেই।' if loaded is None else 'কুইজে কোনো প্রশ্ন নেই।'
+        self._reset()
+        self.quiz_id = quiz_id
+        self.answer_key, self.seed, self.questions = loaded
+        if seconds:
+            self.seconds = max(5, min(int(seconds), 300))
+        self._open_next()
+        return None
+
+    async def advance(self):
+        if self.state == QUESTION:
+            self._close_question()
+        elif self.state == REVEAL:
+            if self.index + 1 < len(self.questions):
+                self._open_next()
+            else:
+                return await self.finish()
+        else:
+            return 'কোনো সেশন চলছে না।'
+        return None
+
+    def _open_next(self):
+        self.index += 1
+        self.state = QUESTION
+        self.opened_at = time.monotonic()
+        self.broadcast(self._question_message())
+        self._timer = asyncio.get_running_loop().call_later(self.seconds, self._close_question, self.index)
+
+    def _close_question(self, index=None):
+        # টাইমার দেরিতে এলে (অ্যাডমিন আগেই বন্ধ করেছেন) কিছু করে না
+        if self.state != QUESTION or (index is not None and index != self.index):
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.state = REVEAL
+        question_id = self.current['id']
+        self.broadcast({
+            'type': 'standings',
+            'index': self.index,
+            'question_id': question_id,
+            'correct_choices': sorted(self.answer_key['questions'][question_id][1]),
+            'answered': sum(question_id in p.answers for p in self.participants.values()),
+            'standings': self.standings()[:settings.LIVE_QUIZ_STANDINGS_SIZE],
+        })
+
+    def standings(self):
+        ordered = sorted(self.participants.values(), key=lambda p: (-p.score, p.elapsed_ms, p.username))
+        return [
+            {'rank': position, 'username': p.username, 'score': p.score}
+            for position, p in enumerate(ordered, start=1)
+        ]
+
+    async def finish(self):
+        if self.state not in (QUESTION, REVEAL):
+            return 'কোনো সেশন চলছে না।'
+        self._close_question()
+        self.state = FINISHED
+        standings = self.standings()
+        quiz_id = self.quiz_id
+        asked = [question['id'] for question in self.questions[:self.index + 1]]
+        # সেভের await চলাকালীন নতুন সেশন শুরু হলে _reset উত্তরগুলো বদলে দেয়, তাই আগেই কপি
+        answers = [(p.user_id, dict(p.answers)) for p in self.participants.values() if p.answers]
+        try:
+            await _save_results(quiz_id, self.answer_key, self.seed, asked, answers)
+        except Exception:
+            logger.exception("Saving live quiz results for group %s failed", self.group_id)
+        self.broadcast({'type': 'finished', 'quiz_id': quiz_id, 'standings': standings})
+        return None
+
+    # সদস্যের উত্তর
+
+    def answer(self, participant, question_id, choice_ids):
+        if self.state != QUESTION or question_id != self.current['id']:
+            return 'এই প্রশ্নের উত্তর এখন নেওয়া হচ্ছে না।'
+        if question_id in participant.answers:
+            return 'এই প্রশ্নের উত্তর আগেই দেওয়া হয়েছে।'
+        selected = frozenset(int(choice_id) for choice_id in choice_ids)
+        participant.answers[question_id] = selected
+
+        points, correct, _ = self.answer_key['questions'][question_id]
+        is_correct = bool(correct) and selected == correct
+        if is_correct:
+            participant.score += points
+            participant.elapsed_ms += int((time.monotonic() - self.opened_at) * 1000)
+        participant.send(dumps({'type': 'answered', 'question_id': question_id, 'is_correct': is_correct}))
+        return None
+
+
+_rooms = {}
+
+
+def get_room(group_id):
+    room = _rooms.get(group_id)
+    if room is None:
+        room = _rooms[group_id] = Room(group_id)
+    return room
+
+
+async def _handle(room, participant, is_admin, message):
+    action = message.get('action')
+    if action == 'answer':
+        choice_ids = message.get('choice_ids')
+        if not isinstance(choice_ids, list):
+            choice_ids = [choice_ids] if choice_ids is not None else []
+        return room.answer(participant, int(message.get('question_id') or 0), choice_ids)
+    if action in ('start', 'next', 'end') and not is_admin:
+        return 'শুধু গ্রুপ অ্যাডমিন সেশন চালাতে পারেন।'
+    if action == 'start':
+        return await room.start(int(message.get('quiz_id') or 0), message.get('seconds'))
+    if action == 'next':
+        return await room.advance()
+    if action == 'end':
+        return await room.finish()
+    return 'অজানা অ্যাকশন।'
+
+
+# --- ASGI অ্যাপ ---
+
+async def live_quiz_application(scope, receive, send):
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    match = PATH_RE.match(scope['path'])
+    if match is None:
+        await send({'type': 'websocket.close', 'code': 4404})
+        return
+    group_id = int(match.group(1))
+    user, is_member, is_admin = await _join_info(scope, group_id)
+    if user is None:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    if not is_member:
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+    await send({'type': 'websocket.accept'})
+
+    room = get_room(group_id)
+    # REST এ রুমের অবস্থা নেই, তাই উপচে পড়লে "resync" নয়, রুমের বর্তমান অবস্থা
+    connection = Connection(resync=lambda: room.snapshot(participant))
+    participant = room.connect(connection, user)
+
+    async def writer():
+        while True:
+            await send({'type': 'websocket.send', 'text': await connection.next_message()})
+
+    write_task = asyncio.create_task(writer())
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+            try:
+                payload = json.loads(message.get('text') or '')
+                error = await _handle(room, participant, is_admin, payload)
+            except (ValueError, TypeError, AttributeError):
+                error = 'মেসেজটি সঠিক JSON নয়।'
+            if error:
+                connection.offer(dumps({'type': 'error', 'detail': error}))
+    finally:
+        write_task.cancel()
+        room.disconnect(connection, participant)
+        if room.is_idle():
+            _rooms.pop(group_id, None)
@@ -0,0 +1,38 @@
+# api/management/commands/attempt_partitions.py
+# কুইজ অ্যাটেম্পট টেবিলের মাসিক পার্টিশন ব্যবস্থাপনা (Postgres)।
+#   python manage.py attempt_partitions --months-ahead 3        (মাসে একবার cron থেকে)
+#   python manage.py attempt_partitions --detach-before 2025-01 (পুরনো মাসগুলো আর্কাইভ)
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api import partitions
+
+
+class Command(BaseCommand):
+    help = 'কুইজ অ্যাটেম্পটের মাসিক পার্টিশন তৈরি করে বা পুরনোগুলো আর্কাইভের জন্য detach করে।'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=3)
+        parser.add_argument('--detach-before', help='YYYY-MM; এই মাসের আগের পার্টিশনগুলো detach হবে')
+
+    def handle(self, *args, **options):
+        if not partitions.is_supported():
+            raise CommandError('পার্টিশনিং শুধু PostgreSQL-এ সমর্থিত।')
+
+        created = partitions.ensure_partitions(months_ahead=options['months_ahead'])
+        for name in created:
+            self.stdout.write(f'তৈরি হয়েছে: {name}')
+
+        if options['detach_before']:
+            try:
+                month = datetime.strptime(options['detach_before'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError('--detach-before অবশ্যই YYYY-MM ফরম্যাটে দিতে হবে।')
+            for name in partitions.detach_partitions_before(month):
+                self.stdout.write(f'detach করা হয়েছে: {name}')
+
+        with connection.cursor() as cursor:
+            current = partitions.list_partitions(cursor)
+        self.stdout.write(self.style.SUCCESS(f'মোট {len(current)}টি পার্টিশন সক্রিয়।'))
@@ -0,0 +1,121 @@
+# api/management/commands/benchmark_composite_views.py
+# কম্পোজিট ভিউগুলোর sync (WSGI, থ্রেড-প্রতি-রিকোয়েস্ট) আর async (ASGI) পথের তুলনা।
+# I/O-বাউন্ড লোড অনুকরণ করতে প্রতিটি SQL কোয়েরিতে --latency-ms দেরি যোগ করা হয়
+# (নেটওয়ার্কের ওপারের ডাটাবেসের মতো)।
+#   python manage.py benchmark_composite_views --username alice --requests 200 --concurrency 20
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client, override_settings
+from rest_framework.authtoken.models import Token
+
+from api.models import GroupMembership
+
+
+def _latency_wrapper(seconds):
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+def _summary(label, timings, errors, elapsed):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))] if timings else 0
+    return (
+        f"{label:<48} {len(timings) / elapsed:8.1f} req/s   "
+        f"p50 {statistics.median(timings) * 1000 if timings else 0:7.1f} ms   "
+        f"p95 {p95 * 1000:7.1f} ms   errors {errors}"
+    )
+
+
+class Command(BaseCommand):
+    help = 'কম্পোজিট এন্ডপয়েন্টগুলোর sync (WSGI) আর async (ASGI) ভার্সনের থ্রুপুট ও ল্যাটেন্সি তুলনা করে।'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help='যে ইউজারের টোকেন দিয়ে রিকোয়েস্ট যাবে')
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--latency-ms', type=float, default=20.0, help='প্রতিটি SQL কোয়েরিতে কৃত্রিম দেরি')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"ইউজার '{options['username']}' পাওয়া যায়নি।")
+        token, _ = Token.objects.get_or_create(user=user)
+        headers = {'authorization': f'Token {token.key}'}
+
+        pairs = [
+            ('/api/dashboard/', '/api/async/dashboard/'),
+            ('/api/profile/', '/api/async/profile/'),
+        ]
+        group_id = GroupMembership.objects.filter(user=user).values_list('group_id', flat=True).first()
+        if group_id:
+            pairs += [
+                (f'/api/groups/{group_id}/', f'/api/async/groups/{group_id}/'),
+                (f'/api/groups/{group_id}/leaderboard/', f'/api/async/groups/{group_id}/leaderboard/'),
+            ]
+
+        # নতুন কানেকশনগুলোতে (প্রতিটি থ্রেডের নিজস্ব) দেরি বসানো হয়
+        latency = options['latency_ms'] / 1000
+
+        def add_latency(sender, connection, **kwargs):
+            # একই থ্রেডের কানেকশন অবজেক্ট পুনরায় connect হলে র‍্যাপার দ্বিতীয়বার বসে না
+            if not getattr(connection, '_benchmark_latency', False):
+                connection.execute_wrappers.append(_latency_wrapper(latency))
+                connection._benchmark_latency = True
+
+        connections.close_all()
+        connection_created.connect(add_latency)
+        # টেস্ট ক্লায়েন্ট দুটো 'testserver' হোস্টে রিকোয়েস্ট পাঠায়, টেস্ট রানারের মতো সেটি অনুমোদিত করা হয়
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                for sync_path, async_path in pairs:
+                    self.stdout.write(self._run_sync(sync_path, headers, options))
+                    self.stdout.write(self._run_async(async_path, headers, options))
+        finally:
+            connection_created.disconnect(add_latency)
+            connections.close_all()
+
+    def _run_sync(self, path, headers, options):
+        def one(_):
+            started = time.perf_counter()
+            response = Client().get(path, headers=headers)
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(one, range(options['requests'])))
+        elapsed = time.perf_counter() - started
+        return _summary(
+            f"WSGI  {path}", [t for t, _ in results], sum(code != 200 for _, code in results), elapsed
+        )
+
+    def _run_async(self, path, headers, options):
+        async def run():
+            client = AsyncClient()
+            semaphore = asyncio.Semaphore(options['concurrency'])
+
+            async def one():
+                async with semaphore:
+                    started = time.perf_counter()
+                    # AsyncClient এ হেডার রিকোয়েস্টপ্রতি দিতে হয়
+                    response = await client.get(path, headers=headers)
+                    return time.perf_counter() - started, response.status_code
+
+            return await asyncio.gather(*(one() for _ in range(options['requests'])))
+
+        started = time.perf_counter()
+        results = asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        return _summary(
+            f"ASGI  {path}", [t for t, _ in results], sum(code != 200 for _, code in results), elapsed
+        )
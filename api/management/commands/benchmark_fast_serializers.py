@@ -0,0 +1,80 @@
+# api/management/commands/benchmark_fast_serializers.py
+# api/fast_serializers.py আর আগের ModelSerializer পথের সময় তুলনা (রেন্ডার করা JSON সহ)।
+# আউটপুট হুবহু মেলে কিনা তা api/tests.py এর FastSerializerConformanceTests যাচাই করে।
+#   python manage.py benchmark_fast_serializers --username alice --repeat 20
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.fast_serializers import CategoryFast, CourseFast, UnitFast
+from api.models import Category, Course, Unit
+from api.serializers import CategorySerializer, CourseSerializer, UnitSerializer
+
+# র‍্যান্ডম কুইজে দুই পথ একই প্রশ্নপত্র বানায়, তাই সময় তুলনীয় থাকে
+SEED = '12345'
+
+
+def _context(user):
+    request = Request(APIRequestFactory().get('/', {'seed': SEED}))
+    request.user = user
+    return {'request': request}
+
+
+class Command(BaseCommand):
+    help = 'fast_serializers আর ModelSerializer পথের সময় তুলনা করে।'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help='যে ইউজারের দৃষ্টিতে (অগ্রগতি/এনরোলমেন্ট) আউটপুট হবে')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"ইউজার '{options['username']}' পাওয়া যায়নি।")
+
+        # তালিকা দুটো আর প্রথম কোর্স/ইউনিট ডিটেইল; প্রতিবার নতুন রিকোয়েস্ট (memo খালি), ক্যাশ গরম।
+        # (নাম, ModelSerializer দিয়ে, fast দিয়ে)
+        timed = [(
+            '/api/categories/',
+            lambda context: CategorySerializer(Category.objects.order_by('id'), many=True, context=context).data,
+            lambda context: CategoryFast(context).many(Category.objects.order_by('id')),
+        ), (
+            '/api/courses/',
+            lambda context: CourseSerializer(Course.objects.order_by('id'), many=True, context=context).data,
+            lambda context: CourseFast(context).many(Course.objects.order_by('id')),
+        )]
+        course_id = Course.objects.order_by('id').values_list('id', flat=True).first()
+        if course_id is not None:
+            timed.append((
+                f'/api/courses/{course_id}/',
+                lambda context: CourseSerializer(Course.objects.get(pk=course_id), context=context).data,
+                lambda context: CourseFast(context).many(Course.objects.filter(pk=course_id))[0],
+            ))
+        unit_id = Unit.objects.order_by('id').values_list('id', flat=True).first()
+        if unit_id is not None:
+            timed.append((
+                f'/api/units/{unit_id}/',
+                lambda context: UnitSerializer(Unit.objects.get(pk=unit_id), context=context).data,
+                lambda context: UnitFast(context).many(Unit.objects.filter(pk=unit_id))[0],
+            ))
+
+        for path, slow, fast in timed:
+            slow_time = self._time(slow, user, options['repeat'])
+            fast_time = self._time(fast, user, options['repeat'])
+            self.stdout.write(
+                f"{path:<28} ModelSerializer {slow_time * 1000:8.1f} ms   "
+                f"fast {fast_time * 1000:8.1f} ms   x{slow_time / fast_time if fast_time else 0:5.1f}"
+            )
+        self.stdout.write(self.style.SUCCESS('সম্পন্ন।'))
+
+    def _time(self, build, user, repeat):
+        build(_context(user))
+        started = time.perf_counter()
+        for _ in range(repeat):
+            JSONRenderer().render(build(_context(user)))
+        return (time.perf_counter() - started) / repeat
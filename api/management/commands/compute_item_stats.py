@@ -0,0 +1,22 @@
+# api/management/commands/compute_item_stats.py
+# প্রতি রাতে cron থেকে চালানোর জন্য: প্রশ্নভিত্তিক আইটেম অ্যানালিটিক্স নতুন করে হিসাব করে।
+#   python manage.py compute_item_stats
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.item_stats import compute_item_stats
+
+
+class Command(BaseCommand):
+    help = 'answer_log থেকে প্রতিটি প্রশ্নের difficulty, discrimination ও distractor ফ্রিকোয়েন্সি হিসাব করে।'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = compute_item_stats(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{updated}টি প্রশ্নের পরিসংখ্যান আপডেট হয়েছে ({time.perf_counter() - started:.1f}s)।'
+        ))
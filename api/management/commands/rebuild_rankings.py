@@ -0,0 +1,21 @@
+# api/management/commands/rebuild_rankings.py
+# গ্লোবাল/কোর্স র‍্যাঙ্কিং বোর্ড UserQuizAttempt থেকে নতুন করে বানিয়ে স্ন্যাপশট (RankingSnapshot) লেখে।
+# প্রথম ডিপ্লয়ে বা স্ন্যাপশট নষ্ট হলে চালান; এরপর সার্ভার প্রসেসগুলো স্ন্যাপশট থেকে দ্রুত লোড হয়।
+#   python manage.py rebuild_rankings
+import time
+
+from django.core.management.base import BaseCommand
+
+from api import ranking
+
+
+class Command(BaseCommand):
+    help = 'UserQuizAttempt থেকে র‍্যাঙ্কিং বোর্ড rebuild করে স্ন্যাপশট সেভ করে।'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        boards = ranking.rebuild()
+        users = len(ranking.get_board())
+        self.stdout.write(self.style.SUCCESS(
+            f"{boards}টি বোর্ড ({users} জন ইউজার গ্লোবাল বোর্ডে) {time.perf_counter() - started:.1f}s এ তৈরি হয়েছে।"
+        ))
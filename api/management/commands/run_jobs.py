@@ -0,0 +1,65 @@
+# api/management/commands/run_jobs.py
+# জব কিউর ওয়ার্কার চালায়।
+#   python manage.py run_jobs --workers 4
+#   python manage.py run_jobs --once      (কিউ খালি হলে বের হয়ে যায়)
+import multiprocessing
+import signal
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.jobs import (
+    PURGE_INTERVAL_SECONDS, default_worker_id, enqueue, purge_finished_jobs, requeue_stale_jobs, work,
+)
+
+
+def _worker_main(index, once, poll_interval, batch_size):
+    django.setup()
+    stop = multiprocessing.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    work(
+        worker_id=f"{default_worker_id()}-{index}",
+        once=once,
+        poll_interval=poll_interval,
+        batch_size=batch_size,
+        should_stop=stop.is_set,
+    )
+
+
+class Command(BaseCommand):
+    help = 'ব্যাকগ্রাউন্ড জব কিউর ওয়ার্কার প্রসেস চালায়।'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--once', action='store_true', help='কিউ খালি হলে থেমে যাবে')
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+        parser.add_argument('--batch-size', type=int, default=10)
+
+    def handle(self, *args, **options):
+        requeue_stale_jobs()
+        purge_finished_jobs()
+        # এরপর থেকে purge_jobs নিজেকে প্রতিদিন আবার কিউ করে (একটির বেশি PENDING থাকে না)
+        enqueue('purge_jobs', delay=PURGE_INTERVAL_SECONDS)
+
+        worker_args = (options['once'], options['poll_interval'], options['batch_size'])
+        if options['workers'] <= 1:
+            _worker_main(0, *worker_args)
+            return
+
+        # ফর্ক করার আগে প্যারেন্টের DB কানেকশন বন্ধ করতে হবে
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_worker_main, args=(index, *worker_args), daemon=True)
+            for index in range(options['workers'])
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
@@ -0,0 +1,93 @@
+# api/management/commands/warm_cache.py
+# ডিপ্লয়ের পরে ট্রাফিক আসার আগেই সব কোর্স ও ইউনিটের পাবলিক হিসাব ক্যাশে ভরে রাখে, আর র‍্যাঙ্কিং
+# স্ন্যাপশট না থাকলে বানায় (সার্ভার প্রসেসগুলো রিকোয়েস্টে পুরো rebuild করে না, স্ন্যাপশট থেকে লোড করে)।
+#   BUILD_ID=<release> python manage.py warm_cache --workers 4   (সার্ভার প্রসেসেও একই BUILD_ID)
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from api.cache import (
+    COURSE_STATS_KEY, COURSE_OUTLINE_KEY, UNIT_STATS_KEY, CACHE_TIMEOUT,
+    compute_course_stats, compute_course_outline, compute_unit_stats, warmup_done_key,
+)
+from api import ranking
+from api.models import Course, RankingSnapshot, Unit
+from api.navigation import COURSE_NAVIGATION_KEY, compute_course_navigation
+
+
+def _init_worker():
+    # spawn মোডে (macOS) চাইল্ড প্রসেসে Django নতুন করে সেটআপ করতে হয়
+    django.setup()
+
+
+def _render_course(course_id, unit_ids):
+    started = time.perf_counter()
+    payloads = {
+        COURSE_STATS_KEY.format(course_id): compute_course_stats(course_id),
+        COURSE_OUTLINE_KEY.format(course_id): compute_course_outline(course_id),
+        COURSE_NAVIGATION_KEY.format(course_id): compute_course_navigation(course_id),
+    }
+    for unit_id in unit_ids:
+        payloads[UNIT_STATS_KEY.format(unit_id)] = compute_unit_stats(unit_id)
+    connections.close_all()
+    return course_id, payloads, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = 'সব কোর্স ও ইউনিটের পাবলিক পে-লোড আগেই ক্যাশে লিখে রাখে এবং রেডিনেস ফ্ল্যাগ সেট করে।'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        # ক্যাশ সব ইনস্ট্যান্সের মধ্যে শেয়ার করা: কোনো ফ্ল্যাগ মোছা হয় না, শেষে শুধু এই রিলিজের (BUILD_ID) ফ্ল্যাগ সেট
+
+        units_by_course = {course_id: [] for course_id in Course.objects.values_list('id', flat=True)}
+        for unit_id, course_id in Unit.objects.values_list('id', 'course_id'):
+            units_by_course[course_id].append(unit_id)
+
+        # ফর্ক করার আগে প্যারেন্টের DB কানেকশন বন্ধ করতে হবে, নইলে চাইল্ডরা একই সকেট শেয়ার করবে
+        connections.close_all()
+
+        timings = []
+        keys_written = 0
+        workers = max(1, options['workers'])
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [
+                pool.submit(_render_course, course_id, unit_ids)
+                for course_id, unit_ids in units_by_course.items()
+            ]
+            for future in futures:
+                course_id, payloads, elapsed = future.result()
+                cache.set_many(payloads, CACHE_TIMEOUT)
+                keys_written += len(payloads)
+                timings.append(elapsed)
+
+        if not RankingSnapshot.objects.exists():
+            ranking.rebuild()
+
+        total = time.perf_counter() - started
+        cache.set(warmup_done_key(), {
+            'finished_at': timezone.now().isoformat(),
+            'courses': len(units_by_course),
+            'keys': keys_written,
+            'seconds': round(total, 3),
+        }, None)
+
+        timings.sort()
+        if timings:
+            p50 = timings[len(timings) // 2]
+            slowest = timings[-1]
+        else:
+            p50 = slowest = 0
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(units_by_course)} কোর্স, {keys_written} কী ক্যাশে লেখা হয়েছে '
+            f'({workers} ওয়ার্কার, মোট {total:.2f}s, প্রতি কোর্স p50 {p50 * 1000:.1f}ms, সর্বোচ্চ {slowest * 1000:.1f}ms)'
+        ))
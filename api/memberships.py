@@ -0,0 +1,184 @@
+# api/memberships.py
+# গ্রুপে যোগ দেওয়া/ত্যাগ করা এবং কোর্সে এনরোলমেন্টের রাইট পাথ।
+# প্রতিটি স্বাভাবিক কেস একটি স্টেটমেন্টে শেষ হয়; unique কনস্ট্রেইন্টই ডুপ্লিকেট আটকায়, তাই একসাথে
+# অনেকবার ট্যাপ করলেও রেস হয় না।
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import invalidate_group_summary
+from .jobs import enqueue
+from .models import LearningGroup, GroupMembership, UserEnrollment, Course
+from .realtime import publish_membership
+
+_MEMBERSHIP_TABLE = GroupMembership._meta.db_table
+_GROUP_TABLE = LearningGroup._meta.db_table
+_ENROLLMENT_TABLE = UserEnrollment._meta.db_table
+_COURSE_TABLE = Course._meta.db_table
+
+# join_group / enroll_user এর ফলাফল
+CREATED = 'created'
+ALREADY_EXISTS = 'exists'
+NOT_FOUND = 'not_found'
+FORBIDDEN = 'forbidden'
+
+# leave_group এর ফলাফল
+LEFT = 'left'
+GROUP_DELETED = 'group_deleted'
+NOT_MEMBER = 'not_member'
+ADMIN_CANNOT_LEAVE = 'admin_cannot_leave'
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def join_group(group_id, user_id):
+    group_id = _as_id(group_id)
+    if group_id is None:
+        return NOT_FOUND
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO {_MEMBERSHIP_TABLE} (group_id, user_id, is_group_admin, joined_at)
+            SELECT id, %s, %s, %s FROM {_GROUP_TABLE} WHERE id = %s
+            ON CONFLICT (group_id, user_id) DO NOTHING
+        """, [user_id, False, timezone.now(), group_id])
+        created = cursor.rowcount
+    if created:
+        # কাঁচা SQL-এ post_save সিগন্যাল চলে না, তাই লিডারবোর্ড rebuild, সামারি মোছা আর লাইভ
+        # কানেকশনের চ্যানেল হালনাগাদ নিজেরা করি
+        enqueue('rebuild_group_leaderboard', {'group_id': group_id})
+        invalidate_group_summary(group_id)
+        transaction.on_commit(lambda: publish_membership(user_id))
+        return CREATED
+
+    # কিছু ঢোকেনি: হয় গ্রুপ নেই, নয়তো আগেই সদস্য (শুধু এই বিরল পথে বাড়তি কোয়েরি)
+    if not LearningGroup.objects.filter(id=group_id).exists():
+        return NOT_FOUND
+    return ALREADY_EXISTS
+
+
+def leave_group(group_id, user_id):
+    group_id = _as_id(group_id)
+    if group_id is None:
+        return NOT_FOUND
+    # সাধারণ সদস্য: একটিই DELETE (ORM-এর delete() সিগন্যালের জন্য আগে SELECT চালায়)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {_MEMBERSHIP_TABLE} WHERE group_id = %s AND user_id = %s AND is_group_admin = %s",
+            [group_id, user_id, False],
+        )
+        deleted = cursor.rowcount
+    if deleted:
+        enqueue('rebuild_group_leaderboard', {'group_id': group_id})
+        invalidate_group_summary(group_id)
+        transaction.on_commit(lambda: publish_membership(user_id))
+        return LEFT
+
+    # অ্যাডমিন বা অ-সদস্য। গ্রুপ রো লক করা হয় যাতে শেষ সদস্য হিসেবে গ্রুপ ডিলিট করার সময়
+    # কেউ একই মুহূর্তে যোগ দিতে না পারে (join-এর FK চেক এই লকের জন্য অপেক্ষা করে)।
+    with transaction.atomic():
+        group = LearningGroup.objects.select_for_update().filter(id=group_id).first()
+        if group is None:
+            return NOT_FOUND
+        if not GroupMembership.objects.filter(group_id=group_id, user_id=user_id).exists():
+            return NOT_MEMBER
+        if GroupMembership.objects.filter(group_id=group_id).exclude(user_id=user_id).exists():
+            return ADMIN_CANNOT_LEAVE
+        group.delete()
+        return GROUP_DELETED
+
+
+def enroll_user(user_id, course_id):
+    course_id = _as_id(course_id)
+    if course_id is None:
+        return NOT_FOUND
+    with connection.cursor() as cursor:
+        # completion এর default শুধু পাইথনে (ডেটাবেসে নেই), তাই খালি বিটম্যাপ নিজেরা দিতে হয়
+        cursor.execute(f"""
+            INSERT INTO {_ENROLLMENT_TABLE} (user_id, course_id, enrolled_at, completion)
+            SELECT %s, id, %s, %s FROM {_COURSE_TABLE} WHERE id = %s AND is_premium = %s
+            ON CONFLICT (user_id, course_id) DO NOTHING
+        """, [user_id, timezone.now(), b'', course_id, False])
+        created = cursor.rowcount
+    if created:
+        # এনরোলের আগের অ্যাটেম্পটগুলো completion বিটম্যাপ ও resume কার্সরে বসানো (bulk_enroll এর মতো)
+        enqueue('backfill_enrollments', {'course_id': course_id, 'user_ids': [user_id]})
+        return CREATED
+
+    if not Course.objects.filter(id=course_id).exists():
+        return NOT_FOUND
+    if UserEnrollment.objects.filter(user_id=user_id, course_id=course_id).exists():
+        return ALREADY_EXISTS
+    return FORBIDDEN
+
+
+# --- বাল্ক এনরোলমেন্ট ---
+
+BULK_ENROLL_BATCH_SIZE = 1000
+
+
+def bulk_enroll(user_ids, course_ids, include_premium=False):
+    """
+    user_ids × course_ids এর সব জোড়া INSERT ... ON CONFLICT DO NOTHING RETURNING দিয়ে এনরোল করে
+    (BULK_ENROLL_BATCH_SIZE জোড়া প্রতি স্টেটমেন্টে)। শুধু যেগুলো সত্যিই ঢুকেছে সেগুলোই created হিসেবে গোনা হয়;
+    আগে থেকে থাকা বা একই সময়ে অন্য কেউ ঢোকানো জোড়া already_enrolled। নতুন এনরোলমেন্টের প্রগ্রেস (আগের
+    অ্যাটেম্পট থেকে completion বিটম্যাপ ও resume কার্সর) কোর্সপ্রতি একটি জবে ব্যাকগ্রাউন্ডে বসে।
+    include_premium=False হলে প্রিমিয়াম কোর্স বাদ।
+    """
+    user_ids = set(user_ids)
+    course_ids = set(course_ids)
+    # FK ভাঙা আইডি ON CONFLICT এ আটকায় না, তাই আগেই ছেঁকে নেওয়া হয়
+    known_users = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True))
+    courses = dict(Course.objects.filter(id__in=course_ids).values_list('id', 'is_premium'))
+    premium = {course_id for course_id, is_premium in courses.items() if is_premium and not include_premium}
+    targets = sorted(set(courses) - premium)
+    users = sorted(known_users)
+
+    pairs = [(user_id, course_id) for course_id in targets for user_id in users]
+    now = timezone.now()
+    created = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(pairs), BULK_ENROLL_BATCH_SIZE):
+            batch = pairs[start:start + BULK_ENROLL_BATCH_SIZE]
+            # completion এর default শুধু পাইথনে (ডেটাবেসে নেই), তাই খালি বিটম্যাপ নিজেরা দিতে হয়
+            cursor.execute(f"""
+                INSERT INTO {_ENROLLMENT_TABLE} (user_id, course_id, enrolled_at, completion)
+                VALUES {', '.join(['(%s, %s, %s, %s)'] * len(batch))}
+                ON CONFLICT (user_id, course_id) DO NOTHING
+                RETURNING user_id, course_id
+            """, [value for user_id, course_id in batch for value in (user_id, course_id, now, b'')])
+            for user_id, course_id in cursor.fetchall():
+                created.setdefault(course_id, []).append(user_id)
+        for course_id, new_users in created.items():
+            enqueue('backfill_enrollments', {'course_id': course_id, 'user_ids': sorted(new_users)})
+
+    created_count = sum(len(new_users) for new_users in created.values())
+    return {
+        'created': created_count,
+        'already_enrolled': len(pairs) - created_count,
+        'enrolled_user_ids': sorted({user_id for new_users in created.values() for user_id in new_users}),
+        'unknown_user_ids': sorted(user_ids - known_users),
+        'unknown_course_ids': sorted(course_ids - set(courses)),
+        'skipped_premium_course_ids': sorted(premium),
+    }
+
+
+def enroll_group(group_id, user_ids=None, course_ids=None, include_premium=False):
+    """গ্রুপের সদস্যদের গ্রুপের কোর্সগুলোতে এনরোল করে (user_ids/course_ids দিলে তার মধ্যে সীমিত)।
+    গ্রুপ না থাকলে NOT_FOUND; নইলে bulk_enroll এর ফলাফল, যেখানে গ্রুপের বাইরের আইডি unknown হিসেবে আসে।"""
+    group_id = _as_id(group_id)
+    if group_id is None or not LearningGroup.objects.filter(id=group_id).exists():
+        return NOT_FOUND
+    members = set(GroupMembership.objects.filter(group_id=group_id).values_list('user_id', flat=True))
+    group_courses = set(Course.objects.filter(learning_groups=group_id).values_list('id', flat=True))
+    requested_users = members if user_ids is None else set(user_ids)
+    requested_courses = group_courses if course_ids is None else set(course_ids)
+
+    result = bulk_enroll(requested_users & members, requested_courses & group_courses, include_premium)
+    result['unknown_user_ids'] = sorted(set(result['unknown_user_ids']) | (requested_users - members))
+    result['unknown_course_ids'] = sorted(set(result['unknown_course_ids']) | (requested_courses - group_courses))
+    return result
@@ -0,0 +1,28 @@
+# api/memo.py
+# রিকোয়েস্ট-স্কোপড memo: একই রিকোয়েস্টে বারবার লাগা ছোট রিড (যেমন এনরোলমেন্ট বিটম্যাপ) একবারই হয়।
+# /api/batch/ এর সাব-রিকোয়েস্টগুলো মূল রিকোয়েস্টের memo শেয়ার করে।
+# শুধু রিড পাথের জন্য: একই রিকোয়েস্টে রাইটের পরে memo করা মান পুরোনো থাকে।
+
+
+def request_memo(context):
+    request = context.get('request')
+    # DRF Request অজানা অ্যাট্রিবিউট মূল HttpRequest থেকে পড়ে
+    memo = getattr(request, 'memo', None)
+    if memo is None:
+        if request is None:
+            return context.setdefault('_memo', {})
+        # মূল HttpRequest এ রাখা হয়, যাতে একই রিকোয়েস্টের আলাদা আলাদা সিরিয়ালাইজারও একই memo পায়
+        memo = {}
+        getattr(request, '_request', request).memo = memo
+    return memo
+
+
+def memoize(context, name, key, compute):
+    """(name, key, ইউজার) প্রতি compute() রিকোয়েস্টে একবারই চলে।"""
+    request = context.get('request')
+    user_id = getattr(getattr(request, 'user', None), 'id', None)
+    memo = request_memo(context)
+    memo_key = (name, key, user_id)
+    if memo_key not in memo:
+        memo[memo_key] = compute()
+    return memo[memo_key]
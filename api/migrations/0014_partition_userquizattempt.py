@@ -0,0 +1,134 @@
+# Backfills QuizAttemptSummary and, on Postgres, turns api_userquizattempt
+# into an append-only table partitioned by month.
+# Reversing copies the attempts back into a plain table and empties the
+# summaries. Partitions already detached for archiving are left as they are
+# and their rows are not copied back.
+
+from datetime import date
+
+from django.db import migrations
+
+# The SQL is inlined rather than imported from api.partitions, so later edits
+# to that module cannot change what this migration does.
+ATTEMPT_TABLE = 'api_userquizattempt'
+ID_SEQUENCE = 'api_userquizattempt_part_id_seq'
+MONTHS_AHEAD = 3
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def backfill_summaries(apps, schema_editor):
+    UserQuizAttempt = apps.get_model('api', 'UserQuizAttempt')
+    QuizAttemptSummary = apps.get_model('api', 'QuizAttemptSummary')
+
+    summaries = {}
+    attempts = UserQuizAttempt.objects.order_by('timestamp', 'id').values_list(
+        'user_id', 'quiz_id', 'score', 'total_points', 'timestamp'
+    )
+    for user_id, quiz_id, score, total_points, timestamp in attempts.iterator(chunk_size=2000):
+        summary = summaries.get((user_id, quiz_id))
+        if summary is None:
+            summaries[(user_id, quiz_id)] = QuizAttemptSummary(
+                user_id=user_id, quiz_id=quiz_id,
+                latest_score=score, latest_total_points=total_points, latest_at=timestamp,
+                best_score=score, best_total_points=total_points, attempt_count=1,
+            )
+            continue
+        summary.latest_score = score
+        summary.latest_total_points = total_points
+        summary.latest_at = timestamp
+        if score > summary.best_score:
+            summary.best_score = score
+            summary.best_total_points = total_points
+        summary.attempt_count += 1
+
+    QuizAttemptSummary.objects.bulk_create(summaries.values(), batch_size=2000)
+
+
+def partition_attempts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = ATTEMPT_TABLE
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+        cursor.execute(f"CREATE SEQUENCE {ID_SEQUENCE}")
+        cursor.execute(f"""
+            CREATE TABLE {table} (
+                id bigint NOT NULL DEFAULT nextval('{ID_SEQUENCE}'),
+                score integer NOT NULL CHECK (score >= 0),
+                total_points integer NOT NULL CHECK (total_points >= 0),
+                "timestamp" timestamp with time zone NOT NULL,
+                quiz_id bigint NOT NULL REFERENCES api_quiz (id) DEFERRABLE INITIALLY DEFERRED,
+                user_id integer NOT NULL REFERENCES auth_user (id) DEFERRABLE INITIALLY DEFERRED,
+                PRIMARY KEY (id, "timestamp")
+            ) PARTITION BY RANGE ("timestamp")
+        """)
+        cursor.execute(f"ALTER SEQUENCE {ID_SEQUENCE} OWNED BY {table}.id")
+        cursor.execute(f"CREATE INDEX {table}_user_quiz_idx ON {table} (user_id, quiz_id)")
+        cursor.execute(f"CREATE INDEX {table}_quiz_idx ON {table} (quiz_id)")
+        cursor.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        # Monthly partitions from the oldest attempt up to MONTHS_AHEAD months past today.
+        cursor.execute(f'SELECT MIN("timestamp") FROM {table}_legacy')
+        oldest = cursor.fetchone()[0]
+        today = date.today()
+        month = date((oldest or today).year, (oldest or today).month, 1)
+        last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+        while month <= last:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_p{month.year}_{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+
+        cursor.execute(f"""
+            INSERT INTO {table} (id, score, total_points, "timestamp", quiz_id, user_id)
+            SELECT id, score, total_points, "timestamp", quiz_id, user_id FROM {table}_legacy
+        """)
+        cursor.execute(
+            f"SELECT setval('{ID_SEQUENCE}', COALESCE((SELECT MAX(id) FROM {table}_legacy), 0) + 1, false)"
+        )
+        cursor.execute(f"DROP TABLE {table}_legacy")
+
+
+def unpartition_attempts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = ATTEMPT_TABLE
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"""
+            CREATE TABLE {table}_partitioned AS
+            SELECT id, score, total_points, "timestamp", quiz_id, user_id FROM {table}
+        """)
+        cursor.execute(f"DROP TABLE {table}")
+    # The plain table exactly as Django created it, indexes and constraints included.
+    schema_editor.create_model(apps.get_model('api', 'UserQuizAttempt'))
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO {table} (id, score, total_points, "timestamp", quiz_id, user_id)
+            SELECT id, score, total_points, "timestamp", quiz_id, user_id FROM {table}_partitioned
+        """)
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+        cursor.execute(f"DROP TABLE {table}_partitioned")
+
+
+def delete_summaries(apps, schema_editor):
+    apps.get_model('api', 'QuizAttemptSummary').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_quizattemptsummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_summaries, delete_summaries),
+        migrations.RunPython(partition_attempts, unpartition_attempts),
+    ]
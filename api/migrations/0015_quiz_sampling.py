@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_partition_userquizattempt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='sample_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='shuffle_choices',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='userquizattempt',
+            name='seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
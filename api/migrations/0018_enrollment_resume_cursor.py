@@ -0,0 +1,102 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:16
+# Adds the "continue learning" cursor to UserEnrollment and backfills it from attempt summaries.
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q
+
+
+# Frozen copy of api.resume.next_unattempted_lesson, so later edits to the app
+# code cannot change what this migration does.
+def next_unattempted_lesson(lessons, attempted_quiz_ids, after_lesson_id=None):
+    start = 0
+    for index, (lesson_id, _, _) in enumerate(lessons):
+        if lesson_id == after_lesson_id:
+            start = index + 1
+            break
+    for lesson_id, _, quiz_ids in lessons[start:] + lessons[:start]:
+        if quiz_ids and not attempted_quiz_ids.issuperset(quiz_ids):
+            return lesson_id
+    return None
+
+
+def backfill_cursors(apps, schema_editor):
+    # প্রতিটি এনরোলমেন্টের কার্সর সবচেয়ে সাম্প্রতিক অ্যাটেম্পট থেকে
+    UserEnrollment = apps.get_model('api', 'UserEnrollment')
+    Lesson = apps.get_model('api', 'Lesson')
+    Quiz = apps.get_model('api', 'Quiz')
+    QuizAttemptSummary = apps.get_model('api', 'QuizAttemptSummary')
+
+    for course_id in UserEnrollment.objects.values_list('course_id', flat=True).distinct():
+        lessons = {
+            lesson_id: (lesson_id, unit_id, [])
+            for lesson_id, unit_id in Lesson.objects.filter(unit__course_id=course_id).order_by(
+                'unit__order', 'unit_id', 'order', 'id'
+            ).values_list('id', 'unit_id')
+        }
+        quizzes = {}
+        for quiz_id, lesson_id, lesson_unit_id, unit_id in Quiz.objects.filter(
+            Q(lesson__unit__course_id=course_id) | Q(unit__course_id=course_id)
+        ).values_list('id', 'lesson_id', 'lesson__unit_id', 'unit_id'):
+            if lesson_id:
+                lessons[lesson_id][2].append(quiz_id)
+            quizzes[quiz_id] = (lesson_unit_id or unit_id, lesson_id)
+        outline = [(lesson_id, unit_id, tuple(quiz_ids)) for lesson_id, unit_id, quiz_ids in lessons.values()]
+
+        attempted = {}
+        latest = {}
+        for user_id, quiz_id, latest_at in QuizAttemptSummary.objects.filter(
+            quiz_id__in=list(quizzes), user__user_enrollments__course_id=course_id
+        ).order_by('latest_at').values_list('user_id', 'quiz_id', 'latest_at'):
+            attempted.setdefault(user_id, set()).add(quiz_id)
+            latest[user_id] = (quiz_id, latest_at)
+
+        for user_id, (quiz_id, latest_at) in latest.items():
+            unit_id, lesson_id = quizzes[quiz_id]
+            # মাস্টারি কুইজের পরে ঐ ইউনিটের শেষ লেসনের পর থেকে খোঁজা হয়
+            position = lesson_id or next(
+                (entry[0] for entry in reversed(outline) if entry[1] == unit_id), None
+            )
+            UserEnrollment.objects.filter(user_id=user_id, course_id=course_id).update(
+                last_unit_id=unit_id,
+                last_lesson_id=lesson_id,
+                last_quiz_id=quiz_id,
+                next_lesson_id=next_unattempted_lesson(outline, attempted[user_id], position),
+                last_activity_at=latest_at,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_reviewitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userenrollment',
+            name='last_activity_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userenrollment',
+            name='last_lesson',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.lesson'),
+        ),
+        migrations.AddField(
+            model_name='userenrollment',
+            name='last_quiz',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.quiz'),
+        ),
+        migrations.AddField(
+            model_name='userenrollment',
+            name='last_unit',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.unit'),
+        ),
+        migrations.AddField(
+            model_name='userenrollment',
+            name='next_lesson',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.lesson'),
+        ),
+        migrations.RunPython(backfill_cursors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:20
+# Gives every quiz a stable completion bit within its course and backfills
+# each enrolment's completion bitmap from the attempt summaries.
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+# Frozen copy of api.completion.set_bit (LSB-first bitmap).
+def set_bit(bitmap, bit):
+    bitmap = bytearray(bitmap or b'')
+    byte = bit >> 3
+    if byte >= len(bitmap):
+        bitmap.extend(bytes(byte + 1 - len(bitmap)))
+    bitmap[byte] |= 1 << (bit & 7)
+    return bytes(bitmap)
+
+
+def backfill_bitmaps(apps, schema_editor):
+    Course = apps.get_model('api', 'Course')
+    Quiz = apps.get_model('api', 'Quiz')
+    UserEnrollment = apps.get_model('api', 'UserEnrollment')
+    QuizAttemptSummary = apps.get_model('api', 'QuizAttemptSummary')
+
+    bits_by_course = {}
+    quizzes = Quiz.objects.annotate(
+        course_id=Coalesce('lesson__unit__course_id', 'unit__course_id')
+    ).filter(course_id__isnull=False).order_by('id')
+    for quiz in quizzes:
+        bits = bits_by_course.setdefault(quiz.course_id, {})
+        quiz.completion_bit = len(bits)
+        bits[quiz.id] = quiz.completion_bit
+        quiz.save(update_fields=['completion_bit'])
+
+    for course_id, bits in bits_by_course.items():
+        Course.objects.filter(pk=course_id).update(completion_bits=len(bits))
+
+        bitmaps = {}
+        for user_id, quiz_id in QuizAttemptSummary.objects.filter(
+            quiz_id__in=list(bits), user__user_enrollments__course_id=course_id
+        ).values_list('user_id', 'quiz_id'):
+            bitmaps[user_id] = set_bit(bitmaps.get(user_id), bits[quiz_id])
+        for user_id, bitmap in bitmaps.items():
+            UserEnrollment.objects.filter(user_id=user_id, course_id=course_id).update(completion=bitmap)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_enrollment_resume_cursor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='completion_bits',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='completion_bit',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='userenrollment',
+            name='completion',
+            field=models.BinaryField(default=bytes),
+        ),
+        migrations.RunPython(backfill_bitmaps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:37
+# Creates the user x course x day score rollup and seeds it from the attempt
+# summaries: each quiz's latest score lands on the day it was recorded.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+
+
+def backfill_rollups(apps, schema_editor):
+    QuizAttemptSummary = apps.get_model('api', 'QuizAttemptSummary')
+    ScoreRollup = apps.get_model('api', 'ScoreRollup')
+
+    rows = QuizAttemptSummary.objects.annotate(
+        course_id=Coalesce('quiz__lesson__unit__course_id', 'quiz__unit__course_id'),
+        day=TruncDate('latest_at'),
+    ).filter(course_id__isnull=False).values('user_id', 'course_id', 'day').annotate(
+        total=Sum('latest_score'), attempts=Sum('attempt_count'),
+    ).order_by()
+    ScoreRollup.objects.bulk_create([
+        ScoreRollup(
+            user_id=row['user_id'], course_id=row['course_id'], day=row['day'],
+            score=row['total'], attempts=row['attempts'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_completion_bitmap'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('score', models.IntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_rollups', to='api.course')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['course', 'day'], name='rollup_course_day_idx'), models.Index(fields=['day'], name='rollup_day_idx')],
+                'unique_together': {('user', 'course', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
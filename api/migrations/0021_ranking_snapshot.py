@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_score_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=50, unique=True)),
+                ('watermark', models.BigIntegerField(default=0)),
+                ('user_ids', models.BinaryField()),
+                ('scores', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:08
+# Records which course each quiz's completion bit was allocated from, and gives
+# a fresh bit to quizzes that moved course and now collide with a bit that
+# another quiz in their current course already holds. In those courses the
+# enrolment bitmaps are rebuilt from the attempt summaries for every bit
+# involved: the fresh bits, and the shared bits that a moved quiz's attempts
+# may have set on behalf of the quiz that keeps them.
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+# Frozen copy of api.completion.set_bit (LSB-first bitmap).
+def set_bit(bitmap, bit):
+    bitmap = bytearray(bitmap or b'')
+    byte = bit >> 3
+    if byte >= len(bitmap):
+        bitmap.extend(bytes(byte + 1 - len(bitmap)))
+    bitmap[byte] |= 1 << (bit & 7)
+    return bytes(bitmap)
+
+
+def clear_bit(bitmap, bit):
+    bitmap = bytearray(bitmap or b'')
+    byte = bit >> 3
+    if byte < len(bitmap):
+        bitmap[byte] &= ~(1 << (bit & 7)) & 0xFF
+    return bytes(bitmap)
+
+
+def record_bit_courses(apps, schema_editor):
+    Course = apps.get_model('api', 'Course')
+    Quiz = apps.get_model('api', 'Quiz')
+    QuizAttemptSummary = apps.get_model('api', 'QuizAttemptSummary')
+    UserEnrollment = apps.get_model('api', 'UserEnrollment')
+
+    counters = dict(Course.objects.values_list('id', 'completion_bits'))
+    used = {}
+    shared = {}
+    quizzes = Quiz.objects.annotate(
+        course_id=Coalesce('lesson__unit__course_id', 'unit__course_id')
+    ).filter(completion_bit__isnull=False, course_id__isnull=False).order_by('id')
+    for quiz in quizzes:
+        bits = used.setdefault(quiz.course_id, {})
+        # কোর্সের কাউন্টারের বাইরের বা আগেই নেওয়া বিট অন্য কোর্স থেকে আনা: নতুন বিট
+        if quiz.completion_bit in bits or quiz.completion_bit >= counters[quiz.course_id]:
+            shared.setdefault(quiz.course_id, set()).add(quiz.completion_bit)
+            quiz.completion_bit = counters[quiz.course_id]
+            counters[quiz.course_id] += 1
+            shared[quiz.course_id].add(quiz.completion_bit)
+        bits[quiz.completion_bit] = quiz.id
+        quiz.completion_course_id = quiz.course_id
+        quiz.save(update_fields=['completion_bit', 'completion_course'])
+
+    for course_id, completion_bits in counters.items():
+        Course.objects.filter(pk=course_id).update(completion_bits=completion_bits)
+
+    # জড়িত বিটগুলো মুছে আবার অ্যাটেম্পট থেকে বসানো হয়, যাতে নতুন বিট পায় আর পুরনো বিট শুধু তার নিজের কুইজের হয়
+    for course_id, rebuilt in shared.items():
+        bits = {used[course_id][bit]: bit for bit in rebuilt if bit in used[course_id]}
+        attempted = {}
+        for user_id, quiz_id in QuizAttemptSummary.objects.filter(
+            quiz_id__in=list(bits), user__user_enrollments__course_id=course_id
+        ).values_list('user_id', 'quiz_id'):
+            attempted.setdefault(user_id, []).append(bits[quiz_id])
+        enrollments = list(UserEnrollment.objects.filter(course_id=course_id).only('id', 'user_id', 'completion'))
+        for enrollment in enrollments:
+            completion = bytes(enrollment.completion or b'')
+            for bit in rebuilt:
+                completion = clear_bit(completion, bit)
+            for bit in attempted.get(enrollment.user_id, ()):
+                completion = set_bit(completion, bit)
+            enrollment.completion = completion
+        UserEnrollment.objects.bulk_update(enrollments, ['completion'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_ranking_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='completion_course',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api.course'),
+        ),
+        migrations.RunPython(record_bit_courses, migrations.RunPython.noop),
+    ]
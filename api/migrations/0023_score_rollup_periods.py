@@ -0,0 +1,90 @@
+# Generated by Django 5.2.8 on 2026-10-19 12:40
+# Splits the score rollup into per-period buckets (current week, current month,
+# all time) and rebuilds them: the all-time bucket from the attempt summaries,
+# the week/month buckets from the latest attempt per quiz inside each period.
+# Reversing keeps only the all-time bucket, which is a valid day rollup on its own.
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# ScoreRollup.ALL_TIME_DAY
+ALL_TIME_DAY = datetime.date(2000, 1, 1)
+
+
+def split_rollups(apps, schema_editor):
+    QuizAttemptSummary = apps.get_model('api', 'QuizAttemptSummary')
+    ScoreRollup = apps.get_model('api', 'ScoreRollup')
+    UserQuizAttempt = apps.get_model('api', 'UserQuizAttempt')
+    course = Coalesce('quiz__lesson__unit__course_id', 'quiz__unit__course_id')
+
+    buckets = {}
+    for user_id, course_id, total, attempts in QuizAttemptSummary.objects.annotate(course_id=course).filter(
+        course_id__isnull=False, attempt_count__gt=0
+    ).values('user_id', 'course_id').annotate(
+        total=Sum('latest_score'), attempts=Sum('attempt_count'),
+    ).values_list('user_id', 'course_id', 'total', 'attempts').order_by():
+        buckets[user_id, course_id, 'all', ALL_TIME_DAY] = [total, attempts]
+
+    today = timezone.localdate()
+    for period, start in (('week', today - datetime.timedelta(days=today.weekday())), ('month', today.replace(day=1))):
+        latest = {}
+        for user_id, quiz_id, course_id, score in UserQuizAttempt.objects.annotate(course_id=course).filter(
+            course_id__isnull=False, timestamp__date__gte=start
+        ).order_by('id').values_list('user_id', 'quiz_id', 'course_id', 'score').iterator(chunk_size=10000):
+            latest[user_id, quiz_id, course_id] = score
+            buckets.setdefault((user_id, course_id, period, start), [0, 0])[1] += 1
+        for (user_id, _, course_id), score in latest.items():
+            buckets[user_id, course_id, period, start][0] += score
+
+    ScoreRollup.objects.all().delete()
+    ScoreRollup.objects.bulk_create([
+        ScoreRollup(user_id=user_id, course_id=course_id, period=period, day=day, score=score, attempts=attempts)
+        for (user_id, course_id, period, day), (score, attempts) in buckets.items()
+    ], batch_size=1000)
+
+
+def keep_all_time(apps, schema_editor):
+    ScoreRollup = apps.get_model('api', 'ScoreRollup')
+    ScoreRollup.objects.exclude(period='all').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_quiz_completion_course'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='scorerollup',
+            name='rollup_course_day_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='scorerollup',
+            name='rollup_day_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='scorerollup',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='scorerollup',
+            name='period',
+            field=models.CharField(choices=[('week', 'Week'), ('month', 'Month'), ('all', 'All time')], default='all', max_length=5),
+        ),
+        migrations.AlterUniqueTogether(
+            name='scorerollup',
+            unique_together={('user', 'course', 'period', 'day')},
+        ),
+        migrations.AddIndex(
+            model_name='scorerollup',
+            index=models.Index(fields=['period', 'day', 'course'], name='rollup_period_day_idx'),
+        ),
+        migrations.RunPython(split_rollups, keep_all_time),
+    ]
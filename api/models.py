@@ -1,5 +1,8 @@
 # api/models.py
+import datetime
+
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.db.models import Sum, Q, F, Window, IntegerField
 from django.db.models.functions import Rank
@@ -18,6 +21,8 @@ class Course(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
     is_premium = models.BooleanField(default=False) 
+    # পরের নতুন কুইজ যে completion বিট ইনডেক্স পাবে (completion.py)
+    completion_bits = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.title
@@ -59,6 +64,15 @@ class Quiz(models.Model):
     unit = models.ForeignKey(Unit, on_delete=models.CASCADE, related_name='quizzes', blank=True, null=True)
     title = models.CharField(max_length=200)
     quiz_type = models.CharField(max_length=10, choices=QUIZ_TYPES, default='LESSON')
+    # প্রশ্ন-ব্যাংক: প্রতি অ্যাটেম্পটে কয়টি প্রশ্ন র‍্যান্ডমভাবে আসবে (খালি = সব প্রশ্ন, আগের মতো)
+    sample_size = models.PositiveIntegerField(blank=True, null=True)
+    shuffle_choices = models.BooleanField(default=False)
+    # কোর্সের ভেতরে এই কুইজের স্থায়ী বিট ইনডেক্স (UserEnrollment.completion বিটম্যাপে)
+    completion_bit = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    # বিটটি যে কোর্সের কাউন্টার থেকে এসেছে; কুইজ (বা তার লেসন/ইউনিট) অন্য কোর্সে গেলে নতুন বিট লাগে
+    completion_course = models.ForeignKey(
+        Course, on_delete=models.SET_NULL, blank=True, null=True, editable=False, related_name='+'
+    )
     
     def __str__(self):
         return self.title
@@ -120,14 +134,129 @@ class UserQuizAttempt(models.Model):
     score = models.PositiveIntegerField()
     total_points = models.PositiveIntegerField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    # র‍্যান্ডম প্রশ্নপত্রের seed; এটা দিয়ে হুবহু একই প্রশ্নপত্র আবার তৈরি করা যায়
+    seed = models.BigIntegerField(blank=True, null=True)
+    # প্রশ্নভিত্তিক উত্তর (কমপ্যাক্ট এনকোডিং, দেখুন api/answer_log.py)
+    answer_log = models.BinaryField(blank=True, null=True)
     
     def __str__(self):
         return f"{self.user.username} - {self.quiz.title} ({self.score}/{self.total_points})"
 
+# অ্যাটেম্পট টেবিলটি append-only (Postgres-এ মাস অনুযায়ী পার্টিশন করা, দেখুন api/partitions.py)।
+# সব রিড পাথ নিচের QuizAttemptSummary প্রজেকশন থেকে পড়ে।
+class QuizAttemptSummary(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_summaries')
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='attempt_summaries')
+    latest_score = models.PositiveIntegerField()
+    latest_total_points = models.PositiveIntegerField()
+    latest_at = models.DateTimeField()
+    best_score = models.PositiveIntegerField()
+    best_total_points = models.PositiveIntegerField()
+    attempt_count = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('user', 'quiz')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.quiz.title} (latest {self.latest_score}/{self.latest_total_points}, best {self.best_score})"
+
+# প্রতিটি প্রশ্নের আইটেম অ্যানালিটিক্স; compute_item_stats কমান্ড প্রতি রাতে নতুন করে লেখে
+class QuestionStats(models.Model):
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    responses = models.PositiveIntegerField(default=0)
+    # সঠিক উত্তরের অনুপাত (p-value); বেশি মানে সহজ প্রশ্ন
+    difficulty = models.FloatField(blank=True, null=True)
+    # আইটেম আর বাকি স্কোরের point-biserial correlation
+    discrimination = models.FloatField(blank=True, null=True)
+    # {"<choice_id>": কতবার বাছা হয়েছে, "0": উত্তর দেয়নি}
+    choice_counts = models.JSONField(default=dict, blank=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for question {self.question_id}"
+
+# === স্পেসড রিপিটিশন ===
+
+# ইউজার × প্রশ্ন প্রতি SM-2 রিভিউ শিডিউল। ভুল করা প্রশ্ন এখানে ঢোকে।
+# (user, due_at) ইনডেক্স থেকে "এখন রিভিউ করার মতো" প্রশ্নগুলো স্ক্যান ছাড়াই পাওয়া যায়।
+class ReviewItem(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='review_items')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='review_items')
+    # ডিনর্মালাইজড, যাতে এনরোল করা কোর্স দিয়ে ফিল্টার করতে কন্টেন্ট ট্রি জয়েন করতে না হয়
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='review_items')
+    ease_factor = models.FloatField(default=2.5)
+    interval_days = models.PositiveIntegerField(default=0)
+    repetitions = models.PositiveIntegerField(default=0)
+    lapses = models.PositiveIntegerField(default=0)
+    due_at = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('user', 'question')
+        indexes = [
+            models.Index(fields=['user', 'due_at'], name='review_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - Q{self.question_id} (due {self.due_at:%Y-%m-%d})"
+
+class ScoreRollup(models.Model):
+    """ইউজার × কোর্স × সময়-উইন্ডোতে মোট পয়েন্ট (লিডারবোর্ডের জন্য)।
+
+    প্রতিটি উইন্ডোর আলাদা বাকেট: চলতি সপ্তাহ (সোমবার থেকে), চলতি মাস আর অল-টাইম। বাকেটের score =
+    ঐ উইন্ডোতে খেলা প্রতিটি কুইজের উইন্ডোর ভেতরের সর্বশেষ স্কোরের যোগফল, তাই কখনো ঋণাত্মক হয় না,
+    আর নতুন সপ্তাহে একই স্কোরে আবার খেললেও ঐ সপ্তাহে পুরো পয়েন্ট গোনা হয়।
+    অল-টাইম বাকেটের score = QuizAttemptSummary এর latest_score এর যোগফল।
+    """
+    PERIOD_CHOICES = (
+        ('week', 'Week'),
+        ('month', 'Month'),
+        ('all', 'All time'),
+    )
+    # অল-টাইম বাকেটের day (unique_together এ NULL চলে না বলে একটি নির্দিষ্ট তারিখ)
+    ALL_TIME_DAY = datetime.date(2000, 1, 1)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='score_rollups')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='score_rollups')
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES, default='all')
+    # উইন্ডোর প্রথম দিন
+    day = models.DateField()
+    score = models.IntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'course', 'period', 'day')
+        indexes = [
+            models.Index(fields=['period', 'day', 'course'], name='rollup_period_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.course.title} ({self.period} {self.day}: {self.score})"
+
+class RankingSnapshot(models.Model):
+    """api/ranking.py এর ইন-মেমোরি বোর্ডের স্ন্যাপশট, যাতে রিস্টার্টের পর সব অ্যাটেম্পট আবার পড়তে না হয়।"""
+    board = models.CharField(max_length=50, unique=True)  # 'global' বা 'course:<id>'
+    # কোন UserQuizAttempt আইডি পর্যন্ত স্ন্যাপশটে আছে; এর পরেরগুলো লোডের সময় catch-up হয়
+    watermark = models.BigIntegerField(default=0)
+    user_ids = models.BinaryField()  # little-endian int64
+    scores = models.BinaryField()    # little-endian int64, user_ids এর একই ক্রমে
+    created_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.board} (≤ #{self.watermark})"
+
 class UserEnrollment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='user_enrollments')
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
     enrolled_at = models.DateTimeField(auto_now_add=True)
+    # "continue learning" কার্সর: অ্যাটেম্পট ও লেসন দেখার সময় resume.py থেকে আপডেট হয়
+    last_unit = models.ForeignKey(Unit, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    last_lesson = models.ForeignKey(Lesson, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    last_quiz = models.ForeignKey(Quiz, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    next_lesson = models.ForeignKey(Lesson, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    last_activity_at = models.DateTimeField(blank=True, null=True)
+    # কোর্সের কোন কুইজগুলো চেষ্টা করা হয়েছে তার বিটম্যাপ (Quiz.completion_bit অনুযায়ী)
+    completion = models.BinaryField(default=bytes, editable=False)
     
     class Meta:
         unique_together = ('user', 'course')
@@ -176,4 +305,43 @@ class Promotion(models.Model):
     is_active = models.BooleanField(default=True)
     
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+# === ব্যাকগ্রাউন্ড জব কিউ ===
+
+class Job(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # একই kind + payload এর একাধিক PENDING জব থাকতে পারবে না
+    dedupe_key = models.CharField(max_length=64, blank=True, null=True)
+    priority = models.IntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, null=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_after'], name='job_claim_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=Q(status='PENDING'),
+                name='unique_pending_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
@@ -0,0 +1,113 @@
+# api/navigation.py
+# প্রতিটি কোর্সের একটি রৈখিক নেভিগেশন ইনডেক্স: ইউনিট ও লেসনের ক্রমে
+#   লেসন -> লেসনের কুইজ -> লেসনের গেম ... -> ইউনিট মাস্টারি কুইজ -> ইউনিট গেম -> পরের ইউনিট
+# লেসন/কুইজ/গেম রেসপন্সে prev/next এখান থেকে বসানো হয়, যাতে ক্লায়েন্টকে পরের স্ক্রিন খুঁজতে
+# /api/units/<id>/ এ ফিরে যেতে না হয় এবং Link: rel=prefetch দেখে আগেভাগেই আনতে পারে।
+# কন্টেন্ট বদলালে refresh_content জব (cache.refresh_content_stats) ইনডেক্স নতুন করে লেখে।
+from django.core.cache import cache
+from django.db.models import Q
+from django.urls import reverse
+
+from .cache import CACHE_TIMEOUT
+from .models import Unit, Lesson, Quiz, MatchingGame
+
+COURSE_NAVIGATION_KEY = 'api:course:{}:navigation'
+
+LESSON = 'lesson'
+QUIZ = 'quiz'
+GAME = 'game'
+
+# রাউটারের basename (api/urls.py)
+_DETAIL_ROUTES = {LESSON: 'lesson-detail', QUIZ: 'quiz-detail', GAME: 'game-detail'}
+
+
+def compute_course_navigation(course_id):
+    """{'steps': [(kind, id, unit_id), ...], 'positions': {(kind, id): index}}"""
+    lesson_quizzes = {}
+    unit_quizzes = {}
+    for quiz_id, lesson_id, unit_id in Quiz.objects.filter(
+        Q(lesson__unit__course_id=course_id) | Q(unit__course_id=course_id)
+    ).order_by('id').values_list('id', 'lesson_id', 'unit_id'):
+        if lesson_id:
+            lesson_quizzes.setdefault(lesson_id, []).append(quiz_id)
+        else:
+            unit_quizzes.setdefault(unit_id, []).append(quiz_id)
+
+    lesson_games = {}
+    unit_games = {}
+    for game_id, lesson_id, unit_id in MatchingGame.objects.filter(
+        Q(lesson__unit__course_id=course_id) | Q(unit__course_id=course_id)
+    ).order_by('order', 'id').values_list('id', 'lesson_id', 'unit_id'):
+        if lesson_id:
+            lesson_games.setdefault(lesson_id, []).append(game_id)
+        else:
+            unit_games.setdefault(unit_id, []).append(game_id)
+
+    lessons_by_unit = {}
+    for lesson_id, unit_id in Lesson.objects.filter(unit__course_id=course_id).order_by(
+        'order', 'id'
+    ).values_list('id', 'unit_id'):
+        lessons_by_unit.setdefault(unit_id, []).append(lesson_id)
+
+    steps = []
+    for unit_id in Unit.objects.filter(course_id=course_id).order_by('order', 'id').values_list('id', flat=True):
+        for lesson_id in lessons_by_unit.get(unit_id, []):
+            steps.append((LESSON, lesson_id, unit_id))
+            steps.extend((QUIZ, quiz_id, unit_id) for quiz_id in lesson_quizzes.get(lesson_id, []))
+            steps.extend((GAME, game_id, unit_id) for game_id in lesson_games.get(lesson_id, []))
+        steps.extend((QUIZ, quiz_id, unit_id) for quiz_id in unit_quizzes.get(unit_id, []))
+        steps.extend((GAME, game_id, unit_id) for game_id in unit_games.get(unit_id, []))
+
+    return {
+        'steps': steps,
+        'positions': {(kind, object_id): index for index, (kind, object_id, _) in enumerate(steps)},
+    }
+
+
+def get_course_navigation(course_id):
+    key = COURSE_NAVIGATION_KEY.format(course_id)
+    navigation = cache.get(key)
+    if navigation is None:
+        navigation = compute_course_navigation(course_id)
+        cache.set(key, navigation, CACHE_TIMEOUT)
+    return navigation
+
+
+def course_id_of(obj):
+    """লেসন/কুইজ/গেমের কোর্স। ভিউসেটগুলো unit ও lesson__unit select_related করে, তাই কোয়েরি লাগে না।"""
+    if isinstance(obj, Lesson):
+        return obj.unit.course_id
+    if obj.lesson_id:
+        return obj.lesson.unit.course_id
+    if obj.unit_id:
+        return obj.unit.course_id
+    return None
+
+
+def _step(step):
+    if step is None:
+        return None
+    kind, object_id, unit_id = step
+    return {
+        'type': kind,
+        'id': object_id,
+        'unit': unit_id,
+        'url': reverse(_DETAIL_ROUTES[kind], args=[object_id]),
+    }
+
+
+def neighbours(course_id, kind, object_id):
+    """{'prev': step বা None, 'next': step বা None, 'position': i, 'total': n}; ইনডেক্সে না থাকলে None।"""
+    if course_id is None:
+        return None
+    navigation = get_course_navigation(course_id)
+    index = navigation['positions'].get((kind, object_id))
+    if index is None:
+        return None
+    steps = navigation['steps']
+    return {
+        'prev': _step(steps[index - 1] if index > 0 else None),
+        'next': _step(steps[index + 1] if index + 1 < len(steps) else None),
+        'position': index + 1,
+        'total': len(steps),
+    }
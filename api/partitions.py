@@ -0,0 +1,109 @@
+# api/partitions.py
+# Postgres-এ api_userquizattempt টেবিলটি timestamp অনুযায়ী মাসিক RANGE পার্টিশনে ভাগ করা।
+# নতুন মাসের পার্টিশন আগেই তৈরি রাখা এবং পুরনোগুলো আর্কাইভের জন্য detach করা এখানে হয়।
+# অন্য ডেটাবেসে (যেমন লোকাল sqlite) এগুলো কিছুই করে না।
+from datetime import date
+
+from django.db import connection, transaction
+
+ATTEMPT_TABLE = 'api_userquizattempt'
+DEFAULT_PARTITION = f"{ATTEMPT_TABLE}_default"
+
+
+def is_supported():
+    return connection.vendor == 'postgresql'
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{ATTEMPT_TABLE}_p{month.year}_{month.month:02d}"
+
+
+def list_partitions(cursor):
+    cursor.execute("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        ORDER BY child.relname
+    """, [ATTEMPT_TABLE])
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _columns(cursor):
+    cursor.execute("""
+        SELECT attname FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+        ORDER BY attnum
+    """, [ATTEMPT_TABLE])
+    return ', '.join(f'"{row[0]}"' for row in cursor.fetchall())
+
+
+def create_month_partition(cursor, month):
+    """মাসের পার্টিশন তৈরি করে। ঐ মাসের সারি আগে থেকেই DEFAULT পার্টিশনে থাকলে সেগুলো সরিয়ে নেয়।
+
+    DEFAULT এ মিলে যাওয়া সারি থাকলে সরাসরি PARTITION OF ব্যর্থ হয়; তাই আলাদা টেবিলে সারিগুলো সরিয়ে
+    তারপর ATTACH করা হয়। ট্রানজ্যাকশনের ভেতরে ডাকতে হবে।
+    """
+    name = partition_name(month)
+    bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    in_month = f""""timestamp" >= '{month.isoformat()}' AND "timestamp" < '{add_months(month, 1).isoformat()}'"""
+    cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_month})")
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {ATTEMPT_TABLE} FOR VALUES {bounds}")
+        return name
+
+    columns = _columns(cursor)
+    cursor.execute(f"CREATE TABLE {name} (LIKE {ATTEMPT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    cursor.execute(f"""
+        WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_month} RETURNING {columns})
+        INSERT INTO {name} ({columns}) SELECT {columns} FROM moved
+    """)
+    # ইনডেক্স, প্রাইমারি কী আর ফরেন কী ATTACH এর সময় প্যারেন্ট থেকে আসে
+    cursor.execute(f"ALTER TABLE {ATTEMPT_TABLE} ATTACH PARTITION {name} FOR VALUES {bounds}")
+    return name
+
+
+def ensure_partitions(start=None, months_ahead=3):
+    """start মাস থেকে আজকের পরের months_ahead মাস পর্যন্ত পার্টিশন তৈরি করে।"""
+    if not is_supported():
+        return []
+    today = month_start(date.today())
+    month = month_start(start) if start else today
+    last = add_months(today, months_ahead)
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        existing = set(list_partitions(cursor))
+        while month <= last:
+            if partition_name(month) not in existing:
+                created.append(create_month_partition(cursor, month))
+            month = add_months(month, 1)
+    return created
+
+
+def detach_partitions_before(month, archive_prefix='archive_'):
+    """month-এর আগের সব মাসিক পার্টিশন detach করে archive_ নামে আলাদা টেবিল হিসেবে রেখে দেয়।
+
+    রিড পাথগুলো QuizAttemptSummary থেকে পড়ে, তাই detach করলে ইউজারের স্কোর বা লিডারবোর্ড বদলায় না।
+    """
+    if not is_supported():
+        return []
+    cutoff = partition_name(month_start(month))
+    detached = []
+    with connection.cursor() as cursor:
+        for name in list_partitions(cursor):
+            if name == DEFAULT_PARTITION or name >= cutoff:
+                continue
+            cursor.execute(f"ALTER TABLE {ATTEMPT_TABLE} DETACH PARTITION {name}")
+            cursor.execute(f"ALTER TABLE {name} RENAME TO {archive_prefix}{name}")
+            detached.append(archive_prefix + name)
+    return detached
@@ -0,0 +1,124 @@
+# api/progress.py
+# গ্রুপ অ্যাডমিনের জন্য সদস্য × ইউনিট অগ্রগতির গ্রিড (/api/groups/<id>/progress/)।
+# সব সদস্যের সব ইউনিটের স্কোর একটি GROUP BY (user, unit) কোয়েরিতে আসে (QuizAttemptSummary, অর্থাৎ
+# প্রতিটি কুইজের সর্বশেষ স্কোর), তারপর numpy দিয়ে ঘন ম্যাট্রিক্সে পিভট করা হয়।
+# রেসপন্স কলামভিত্তিক: সদস্য আর ইউনিটের অ্যাট্রিবিউটগুলো আলাদা অ্যারে, স্কোর members × units ম্যাট্রিক্স।
+import csv
+import io
+
+import numpy as np
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+from .cache import get_group_summary
+from .models import GroupMembership, Question, QuizAttemptSummary, Unit
+
+
+def _index(ids, values):
+    """values এর প্রতিটির ids (সাজানো) এ অবস্থান।"""
+    return np.searchsorted(ids, np.asarray(values, dtype=np.int64))
+
+
+def compute_group_progress(group_id):
+    members = list(
+        GroupMembership.objects.filter(group_id=group_id).order_by('user__username').values_list(
+            'user_id', 'user__username'
+        )
+    )
+    units = list(
+        Unit.objects.filter(course_id__in=get_group_summary(group_id)['course_ids']).order_by(
+            'course__title', 'course_id', 'order', 'id'
+        ).values_list('id', 'title', 'course_id', 'course__title')
+    )
+
+    member_ids = np.array([user_id for user_id, _ in members], dtype=np.int64)
+    unit_ids = np.array([unit_id for unit_id, _, _, _ in units], dtype=np.int64)
+    # searchsorted এর জন্য সাজানো কপি, আর সাজানো ক্রম থেকে উপস্থাপনের ক্রমে ফেরার ম্যাপ
+    member_order = np.argsort(member_ids)
+    unit_order = np.argsort(unit_ids)
+    sorted_members = member_ids[member_order]
+    sorted_units = unit_ids[unit_order]
+
+    scores = np.zeros((len(members), len(units)), dtype=np.int64)
+    attempted = np.zeros((len(members), len(units)), dtype=np.int64)
+    possible = np.zeros(len(units), dtype=np.int64)
+    quiz_counts = np.zeros(len(units), dtype=np.int64)
+
+    if len(units):
+        # ইউনিটপ্রতি সম্ভাব্য পয়েন্ট ও কুইজ সংখ্যা (লেসনের কুইজ + ইউনিট কুইজ)
+        content = list(
+            Question.objects.annotate(
+                unit_id=Coalesce('quiz__lesson__unit_id', 'quiz__unit_id')
+            ).filter(unit_id__in=unit_ids.tolist()).values('unit_id').annotate(
+                points=Sum('points'), quizzes=Count('quiz_id', distinct=True)
+            ).values_list('unit_id', 'points', 'quizzes').order_by()
+        )
+        if content:
+            rows = np.array(content, dtype=np.int64)
+            columns = unit_order[_index(sorted_units, rows[:, 0])]
+            possible[columns] = rows[:, 1]
+            quiz_counts[columns] = rows[:, 2]
+
+    if len(units) and len(members):
+        # মূল কোয়েরি: সব সদস্য × সব ইউনিটের স্কোর ও চেষ্টা করা কুইজ সংখ্যা
+        progress = list(
+            QuizAttemptSummary.objects.annotate(
+                unit_id=Coalesce('quiz__lesson__unit_id', 'quiz__unit_id')
+            ).filter(
+                user_id__in=member_ids.tolist(), unit_id__in=unit_ids.tolist()
+            ).values('user_id', 'unit_id').annotate(
+                score=Sum('latest_score'), attempted=Count('id')
+            ).values_list('user_id', 'unit_id', 'score', 'attempted').order_by()
+        )
+        if progress:
+            rows = np.array(progress, dtype=np.int64)
+            row_index = member_order[_index(sorted_members, rows[:, 0])]
+            column_index = unit_order[_index(sorted_units, rows[:, 1])]
+            scores[row_index, column_index] = rows[:, 2]
+            attempted[row_index, column_index] = rows[:, 3]
+
+    member_totals = scores.sum(axis=1)
+    total_possible = int(possible.sum())
+    member_percent = member_totals / total_possible * 100 if total_possible else np.zeros(len(members))
+    mean_scores = scores.mean(axis=0) if len(members) else np.zeros(len(units))
+    unit_average = np.divide(mean_scores * 100, possible, out=np.zeros(len(units)), where=possible > 0)
+    completion = np.divide(attempted, quiz_counts, out=np.zeros(attempted.shape), where=quiz_counts > 0)
+
+    return {
+        'group_id': group_id,
+        'members': {
+            'id': member_ids.tolist(),
+            'username': [username for _, username in members],
+            'total_score': member_totals.tolist(),
+            'percent': np.round(member_percent, 1).tolist(),
+        },
+        'units': {
+            'id': unit_ids.tolist(),
+            'title': [title for _, title, _, _ in units],
+            'course_id': [course_id for _, _, course_id, _ in units],
+            'course_title': [course_title for _, _, _, course_title in units],
+            'possible_points': possible.tolist(),
+            'quiz_count': quiz_counts.tolist(),
+            'average_percent': np.round(unit_average, 1).tolist(),
+        },
+        # members × units, সদস্য ও ইউনিট অ্যারের একই ক্রমে
+        'scores': scores.tolist(),
+        'attempted': attempted.tolist(),
+        'completion': np.round(completion, 3).tolist(),
+        'total_possible': total_possible,
+    }
+
+
+def progress_csv(report):
+    """প্রতি সদস্যে একটি লাইন: ইউজারনেম, প্রতিটি ইউনিটের স্কোর, মোট।"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    units = report['units']
+    writer.writerow(['username'] + [
+        f"{course_title} / {title} ({points})"
+        for course_title, title, points in zip(units['course_title'], units['title'], units['possible_points'])
+    ] + [f"total ({report['total_possible']})"])
+    members = report['members']
+    for username, row, total in zip(members['username'], report['scores'], members['total_score']):
+        writer.writerow([username] + row + [total])
+    return output.getvalue()
@@ -0,0 +1,351 @@
+# api/ranking.py
+# গ্লোবাল ও কোর্সভিত্তিক অল-টাইম র‍্যাঙ্কিং: "top 100", "আমার র‍্যাঙ্ক", "আমার আশেপাশের ইউজার" O(log n) এ।
+#
+# প্রতিটি বোর্ড ('global', 'course:<id>') প্রসেস-মেমোরিতে থাকে:
+#   scores   user_id -> মোট স্কোর (০ এর বেশি হলে তবেই বোর্ডে)
+#   keys     SortedList: (স্কোর, user_id) একটি int কী-তে, বেশি স্কোর আগে, সমান স্কোরে ছোট আইডি আগে।
+#            "আমার চেয়ে বেশি স্কোর কতজনের" = bisect, "k-তম অবস্থান" = ইনডেক্স; দুটোই O(log n),
+#            মেমোরি শুধু ইউজার সংখ্যার সমান (স্কোরের সর্বোচ্চ মানের উপর নির্ভর করে না)।
+# র‍্যাঙ্ক SQL এর RANK() এর মতো: ১ + আমার চেয়ে বেশি স্কোরধারীর সংখ্যা।
+#
+# মোট স্কোর = ScoreRollup এর অল-টাইম বাকেট = QuizAttemptSummary এর latest_score এর যোগফল।
+# - লেখার পথ: attempts.py কমিটের পরে refresh_users() দিয়ে ঐ ইউজারদের মোট স্কোর আবার পড়ে এই প্রসেসের বোর্ডে বসায়।
+# - অন্য প্রসেসের অ্যাটেম্পট: পড়ার সময় (RANKING_REFRESH_SECONDS পরপর) watermark এর পরের
+#   UserQuizAttempt গুলোর ইউজারদের মোট স্কোর ScoreRollup থেকে আবার পড়া হয় (পরম মান, তাই বারবার পড়লেও ঠিক থাকে)।
+# - রিস্টার্ট: RankingSnapshot টেবিলের স্ন্যাপশট + watermark থেকে catch-up। UserQuizAttempt থেকে পুরো rebuild
+#   কখনো রিকোয়েস্টে হয় না: warm_cache / python manage.py rebuild_rankings, নয়তো rebuild_rankings জব;
+#   ততক্ষণ বোর্ড খালি দেখায়।
+# - ডেটাবেস পড়া সবসময় _lock এর বাইরে; _lock শুধু মেমোরির বোর্ড বদলানো/পড়ার সময়।
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from sortedcontainers import SortedList
+
+from config.db_router import use_replicas
+
+from .completion import get_content_index
+from .models import RankingSnapshot, ScoreRollup, UserQuizAttempt
+
+GLOBAL_BOARD = 'global'
+COURSE_BOARD = 'course:{}'
+
+# ক্যাচ-আপে watermark এর এতগুলো আইডি আগে থেকে আবার দেখা হয়, যাতে দেরিতে কমিট হওয়া
+# (ছোট আইডির) অ্যাটেম্পট বাদ না পড়ে
+REPLAY_MARGIN = 500
+SNAPSHOT_DTYPE = '<i8'
+
+
+def course_board(course_id):
+    return COURSE_BOARD.format(course_id)
+
+
+# বোর্ডের কী: বেশি স্কোর আগে, সমান স্কোরে ছোট user_id আগে; একটি int এ যাতে SortedList হালকা থাকে
+_USER_BITS = 40
+_USER_MASK = (1 << _USER_BITS) - 1
+
+
+def _key(user_id, score):
+    return (-score << _USER_BITS) | user_id
+
+
+def _decode(key):
+    return key & _USER_MASK, -(key >> _USER_BITS)
+
+
+class Board:
+    def __init__(self):
+        self.scores = {}
+        self.keys = SortedList()
+
+    @classmethod
+    def from_scores(cls, scores):
+        """{user_id: score} থেকে একবারে (স্ন্যাপশট লোড, rebuild)। একটা একটা set() এর চেয়ে অনেক দ্রুত।"""
+        board = cls()
+        board.scores = {user_id: score for user_id, score in scores.items() if score > 0}
+        board.keys = SortedList(_key(user_id, score) for user_id, score in board.scores.items())
+        return board
+
+    def __len__(self):
+        return len(self.scores)
+
+    def set(self, user_id, score):
+        old = self.scores.get(user_id)
+        if old == score or (old is None and score <= 0):
+            return
+        if old is not None:
+            self.keys.remove(_key(user_id, old))
+            del self.scores[user_id]
+        if score > 0:
+            self.scores[user_id] = score
+            self.keys.add(_key(user_id, score))
+
+    def rank(self, user_id):
+        score = self.scores.get(user_id)
+        if score is None:
+            return None
+        # আমার চেয়ে বেশি স্কোরের সবার কী (score, 0) এর আগে
+        return self.keys.bisect_left(_key(0, score)) + 1
+
+    def position(self, user_id):
+        """টাই ভাঙা অবস্থান (১-ভিত্তিক)।"""
+        return self.keys.bisect_left(_key(user_id, self.scores[user_id])) + 1
+
+    def at(self, position):
+        """(user_id, score, rank) অবস্থান অনুযায়ী (১-ভিত্তিক, বেশি স্কোর আগে)।"""
+        user_id, score = _decode(self.keys[position - 1])
+        return user_id, score, self.keys.bisect_left(_key(0, score)) + 1
+
+    def slice(self, start, stop):
+        """অবস্থান start..stop (সহ)।"""
+        start, stop = max(1, start), min(len(self.scores), stop)
+        rows = []
+        for position, key in enumerate(self.keys.islice(start - 1, stop), start):
+            user_id, score = _decode(key)
+            if not rows:
+                rank = self.keys.bisect_left(_key(0, score)) + 1
+            elif score != rows[-1][1]:
+                # আগের সবার স্কোর বেশি, তাই নতুন স্কোরের প্রথমজনের র‍্যাঙ্ক তার অবস্থান
+                rank = position
+            rows.append((user_id, score, rank))
+        return rows
+
+
+# --- প্রসেস-লোকাল অবস্থা ---
+
+_lock = threading.RLock()
+_load_lock = threading.Lock()       # একসাথে একটাই প্রসেস-লোড বা catch-up
+_boards = None
+_versions = {}                      # user_id -> বোর্ডে বসানো মোটের ScoreRollup.attempts যোগফল
+_watermark = 0
+_refreshed_at = float('-inf')
+
+
+def _totals_from_rollups(user_ids):
+    """({user_id: {course_id: total}}, {user_id: version}) ScoreRollup থেকে।
+
+    version = ইউজারের মোট অ্যাটেম্পট সংখ্যা; শুধু বাড়ে, তাই কোন পড়াটা নতুন তা বোঝা যায়।
+    """
+    totals, versions = {}, {}
+    for user_id, course_id, total, attempts in ScoreRollup.objects.filter(
+        period='all', user_id__in=user_ids
+    ).values_list('user_id', 'course_id', 'score', 'attempts'):
+        totals.setdefault(user_id, {})[course_id] = total
+        versions[user_id] = versions.get(user_id, 0) + attempts
+    return totals, versions
+
+
+def _boards_from_totals(totals):
+    per_board = {GLOBAL_BOARD: {}}
+    for user_id, courses in totals.items():
+        per_board[GLOBAL_BOARD][user_id] = sum(courses.values())
+        for course_id, total in courses.items():
+            per_board.setdefault(course_board(course_id), {})[user_id] = total
+    return {key: Board.from_scores(scores) for key, scores in per_board.items()}
+
+
+def _apply_totals(boards, totals, versions):
+    """পরম মান বসায়, তাই একই অ্যাটেম্পট যতবারই পড়া হোক দুবার গোনা হয় না।
+
+    দুটি থ্রেড আলাদা সময়ে পড়ে উল্টো ক্রমে বসালে পুরনো পড়াটা (ছোট version) বাদ পড়ে। _lock ধরে ডাকতে হবে।
+    """
+    for user_id, courses in totals.items():
+        if versions[user_id] < _versions.get(user_id, 0):
+            continue
+        _versions[user_id] = versions[user_id]
+        boards.setdefault(GLOBAL_BOARD, Board()).set(user_id, sum(courses.values()))
+        for course_id, total in courses.items():
+            boards.setdefault(course_board(course_id), Board()).set(user_id, total)
+
+
+def build_from_attempts():
+    """UserQuizAttempt থেকে পুরো বোর্ড: প্রতিটি (ইউজার, কুইজ) এর সর্বশেষ অ্যাটেম্পটের স্কোর যোগ।"""
+    latest = {}
+    for user_id, quiz_id, score in UserQuizAttempt.objects.order_by('id').values_list(
+        'user_id', 'quiz_id', 'score'
+    ).iterator(chunk_size=10000):
+        latest[user_id, quiz_id] = score
+
+    quizzes = get_content_index()['quizzes']
+    totals = {}
+    for (user_id, quiz_id), score in latest.items():
+        entry = quizzes.get(quiz_id)
+        if entry is not None:
+            courses = totals.setdefault(user_id, {})
+            courses[entry[0]] = courses.get(entry[0], 0) + score
+    return _boards_from_totals(totals)
+
+
+def _load_snapshot():
+    snapshots = list(RankingSnapshot.objects.all())
+    if not snapshots:
+        return None, 0
+    boards = {}
+    for snapshot in snapshots:
+        user_ids = np.frombuffer(bytes(snapshot.user_ids), dtype=SNAPSHOT_DTYPE)
+        scores = np.frombuffer(bytes(snapshot.scores), dtype=SNAPSHOT_DTYPE)
+        boards[snapshot.board] = Board.from_scores(dict(zip(user_ids.tolist(), scores.tolist())))
+    return boards, min(snapshot.watermark for snapshot in snapshots)
+
+
+def save_snapshot():
+    _ensure_loaded()
+    # স্ন্যাপশটের watermark যতটা সম্ভব নতুন রাখতে আগে catch-up
+    _catch_up(wait=True)
+    with _lock:
+        if _boards is None:
+            return 0
+        rows = [
+            RankingSnapshot(
+                board=key,
+                watermark=_watermark,
+                user_ids=np.fromiter(board.scores.keys(), dtype=SNAPSHOT_DTYPE, count=len(board)).tobytes(),
+                scores=np.fromiter(board.scores.values(), dtype=SNAPSHOT_DTYPE, count=len(board)).tobytes(),
+            )
+            for key, board in _boards.items()
+        ]
+    with transaction.atomic():
+        RankingSnapshot.objects.all().delete()
+        RankingSnapshot.objects.bulk_create(rows, batch_size=100)
+    return len(rows)
+
+
+def rebuild():
+    """UserQuizAttempt থেকে নতুন করে বানিয়ে স্ন্যাপশট লেখে (কমান্ড, warm_cache বা জব থেকে; রিকোয়েস্টে নয়)।"""
+    global _boards, _watermark, _refreshed_at
+    watermark = UserQuizAttempt.objects.aggregate(last=Max('id'))['last'] or 0
+    boards = build_from_attempts()
+    boards.setdefault(GLOBAL_BOARD, Board())
+    with _lock:
+        _boards, _watermark, _refreshed_at = boards, watermark, time.monotonic()
+        _versions.clear()
+    return save_snapshot()
+
+
+def _catch_up(wait=False):
+    """watermark এর পরের অ্যাটেম্পটের ইউজারদের মোট স্কোর আবার পড়ে। অন্য থ্রেড ইতিমধ্যে করছে হলে (wait ছাড়া) বাদ।"""
+    global _watermark, _refreshed_at
+    if not _load_lock.acquire(blocking=wait):
+        return
+    try:
+        if _boards is None:
+            return
+        _refreshed_at = time.monotonic()
+        rows = list(UserQuizAttempt.objects.filter(
+            id__gt=max(0, _watermark - REPLAY_MARGIN)
+        ).values_list('id', 'user_id'))
+        if rows:
+            totals, versions = _totals_from_rollups({user_id for _, user_id in rows})
+            with _lock:
+                _apply_totals(_boards, totals, versions)
+                _watermark = max(_watermark, max(attempt_id for attempt_id, _ in rows))
+    finally:
+        _load_lock.release()
+
+
+def _load():
+    """স্ন্যাপশট থেকে এই প্রসেসের বোর্ড; স্ন্যাপশট না থাকলে rebuild জব কিউ করে খালি রেখে দেয়।"""
+    global _boards, _watermark, _refreshed_at
+    with _load_lock:
+        if _boards is not None or time.monotonic() - _refreshed_at < settings.RANKING_REFRESH_SECONDS:
+            return
+        _refreshed_at = time.monotonic()
+        boards, watermark = _load_snapshot()
+        if boards is not None:
+            boards.setdefault(GLOBAL_BOARD, Board())
+            with _lock:
+                _boards, _watermark = boards, watermark
+                _versions.clear()
+    if boards is None:
+        from .jobs import enqueue
+        enqueue('rebuild_rankings')
+        return
+    _catch_up(wait=True)
+
+
+def _ensure_loaded():
+    if _boards is None:
+        _load()
+    elif time.monotonic() - _refreshed_at >= settings.RANKING_REFRESH_SECONDS:
+        _catch_up()
+    return _boards, _watermark
+
+
+# --- লেখার পথ থেকে ---
+
+def refresh_users(user_ids):
+    """attempts.py থেকে কমিটের পরে: এই ইউজারদের মোট স্কোর primary থেকে পড়ে বসায়।
+
+    বোর্ড এই প্রসেসে লোড না থাকলে কিছু করে না। catch-up একই অ্যাটেম্পট আগে বা পরে পড়লেও ফল একই।
+    """
+    if _boards is None or not user_ids:
+        return
+    with use_replicas(False):
+        totals, versions = _totals_from_rollups(user_ids)
+    with _lock:
+        _apply_totals(_boards, totals, versions)
+
+
+# --- পড়া ---
+
+def get_board(course_id=None):
+    boards, _ = _ensure_loaded()
+    if boards is None:
+        return Board()
+    return boards.get(course_board(course_id) if course_id else GLOBAL_BOARD) or Board()
+
+
+def _entries(rows):
+    from django.contrib.auth.models import User
+
+    usernames = dict(User.objects.filter(id__in=[user_id for user_id, _, _ in rows]).values_list('id', 'username'))
+    return [
+        {'rank': rank, 'username': usernames.get(user_id, ''), 'total_score': score}
+        for user_id, score, rank in rows
+    ]
+
+
+def top(limit=100, course_id=None):
+    board = get_board(course_id)
+    with _lock:
+        rows = board.slice(1, limit)
+    return _entries(rows)
+
+
+def my_rank(user_id, course_id=None):
+    board = get_board(course_id)
+    with _lock:
+        return {'rank': board.rank(user_id), 'total_score': board.scores.get(user_id, 0), 'total_users': len(board)}
+
+
+def around(user_id, radius=5, course_id=None):
+    board = get_board(course_id)
+    with _lock:
+        if user_id not in board.scores:
+            return []
+        position = board.position(user_id)
+        rows = board.slice(position - radius, position + radius)
+    return _entries(rows)
+
+
+def ranking_summary(user_id, course_id=None, limit=100, radius=5):
+    """/api/rankings/ এর রেসপন্স: top, me, around একবারে (একটিই ইউজারনেম কোয়েরি)।"""
+    board = get_board(course_id)
+    with _lock:
+        top_rows = board.slice(1, limit)
+        me = {'rank': board.rank(user_id), 'total_score': board.scores.get(user_id, 0)}
+        around_rows = []
+        if user_id in board.scores:
+            position = board.position(user_id)
+            around_rows = board.slice(position - radius, position + radius)
+        total_users = len(board)
+    entries = _entries(top_rows + around_rows)
+    return {
+        'total_users': total_users,
+        'top': entries[:len(top_rows)],
+        'me': me,
+        'around': entries[len(top_rows):],
+    }
@@ -0,0 +1,503 @@
+# api/realtime.py
+# লিডারবোর্ডের র‍্যাঙ্ক পরিবর্তন আর নোটিশ ক্লায়েন্টে পুশ করা, যাতে /api/groups/<id>/leaderboard/ আর
+# /api/dashboard/ বারবার পোল করতে না হয়।
+#   WebSocket: ws://<host>/ws/live/?token=<token>[&groups=1,2]
+#   SSE:       GET /api/live/?token=<token>  (অথবা Authorization: Token ... হেডার)
+# config/asgi.py এর রাউটার এই দুটি পাথ এখানে পাঠায়; বাকি সব Django তে যায়।
+#
+# পাবলিশ সাইড sync (জব, সিগন্যাল): publish(channel, message) ব্রোকারে পাঠায়।
+# ব্রোকার: 'memory' (একই প্রসেসের ভেতরে, লোকাল ডেভেলপমেন্ট + JOB_QUEUE_EAGER) অথবা
+# 'redis' (Redis pub/sub, run_jobs ওয়ার্কার আর ASGI প্রসেস আলাদা হলে)।
+#
+# সাবস্ক্রাইব সাইড: প্রতিটি ASGI প্রসেসে একটি Hub। চ্যানেলপ্রতি (group:<id>, notices) ব্রোকারে একটাই
+# সাবস্ক্রিপশন থাকে, যত ক্লায়েন্টই থাকুক। REALTIME_COALESCE_MS এর ভেতরে আসা আপডেটগুলো মিলিয়ে একটি
+# মেসেজ হয়, সেটি একবার JSON করে সব ক্লায়েন্টের কিউতে দেওয়া হয়। কিউ ভরে গেলে (ধীর ক্লায়েন্ট) বাকিগুলো
+# বাদ দিয়ে একটি "resync" পাঠানো হয়, ক্লায়েন্ট তখন REST থেকে আবার পড়ে নেয়। যাদের REST এ ফিরে পড়ার
+# উপায় নেই (লাইভ কুইজ রুম) তারা Connection(resync=...) দিয়ে নিজের পুরো অবস্থা পাঠায়।
+#
+# প্রতিটি কানেকশন user:<id> চ্যানেলেও থাকে। গ্রুপে যোগ দেওয়া/ত্যাগ করার পরে সেখানে "membership" আসে;
+# কানেকশন তখন নিজের গ্রুপ চ্যানেলগুলো আবার নির্ধারণ করে এবং নতুন hello পাঠায়, যাতে গ্রুপ ছাড়ার পরে
+# সেই গ্রুপের আপডেট আর না যায়।
+import asyncio
+import json
+import logging
+import threading
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.utils.encoders import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+WEBSOCKET_PATH = '/ws/live/'
+SSE_PATH = '/api/live/'
+
+NOTICES_CHANNEL = 'notices'
+GROUP_CHANNEL = 'group:{}'
+USER_CHANNEL = 'user:{}'
+
+
+def group_channel(group_id):
+    return GROUP_CHANNEL.format(group_id)
+
+
+def user_channel(user_id):
+    return USER_CHANNEL.format(user_id)
+
+
+def dumps(message):
+    return json.dumps(message, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+# --- ব্রোকার ---
+
+class InProcessBroker:
+    """একই প্রসেসের ভেতরের pub/sub। publish যেকোনো থ্রেড থেকে ডাকা যায়।"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = {}  # channel -> {(loop, handler)}
+
+    def publish(self, channel, message):
+        data = dumps(message)
+        with self._lock:
+            targets = list(self._handlers.get(channel, ()))
+        for loop, handler in targets:
+            loop.call_soon_threadsafe(handler, channel, data)
+
+    async def subscribe(self, channel, handler):
+        with self._lock:
+            self._handlers.setdefault(channel, set()).add((asyncio.get_running_loop(), handler))
+
+    async def unsubscribe(self, channel, handler):
+        with self._lock:
+            handlers = self._handlers.get(channel, set())
+            handlers.discard((asyncio.get_running_loop(), handler))
+            if not handlers:
+                self._handlers.pop(channel, None)
+
+
+class RedisBroker:
+    """Redis pub/sub; REDIS_URL লাগে (redis প্যাকেজ Redis ক্যাশের জন্য আগেই লাগে)।"""
+
+    PREFIX = 'api:live:'
+
+    def __init__(self, url):
+        import redis
+        import redis.asyncio
+
+        self._url = url
+        self._client = redis.Redis.from_url(url)
+        self._async_module = redis.asyncio
+        self._pubsub = None
+        self._reader = None
+        self._handlers = {}  # channel -> {handler}
+
+    def publish(self, channel, message):
+        self._client.publish(self.PREFIX + channel, dumps(message))
+
+    async def subscribe(self, channel, handler):
+        if self._pubsub is None:
+            self._pubsub = self._async_module.from_url(self._url).pubsub()
+        if channel not in self._handlers:
+            await self._pubsub.subscribe(self.PREFIX + channel)
+        self._handlers.setdefault(channel, set()).add(handler)
+        if self._reader is None:
+            self._reader = asyncio.create_task(self._read())
+
+    async def unsubscribe(self, channel, handler):
+        handlers = self._handlers.get(channel, set())
+        handlers.discard(handler)
+        if not handlers and self._handlers.pop(channel, None) is not None:
+            await self._pubsub.unsubscribe(self.PREFIX + channel)
+
+    async def _read(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception:
+                logger.exception("Realtime broker read failed")
+                await asyncio.sleep(1)
+                continue
+            if message is None:
+                continue
+            channel = message['channel'].decode()[len(self.PREFIX):]
+            data = message['data'].decode()
+            for handler in list(self._handlers.get(channel, ())):
+                handler(channel, data)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        if settings.REALTIME_BROKER == 'redis':
+            _broker = RedisBroker(settings.REDIS_URL)
+        else:
+            _broker = InProcessBroker()
+    return _broker
+
+
+def publish(channel, message):
+    # পুশ সুবিধা মাত্র; ব্রোকারের ত্রুটিতে মূল কাজ (জব, অ্যাডমিন সেভ) ব্যর্থ হয় না
+    try:
+        get_broker().publish(channel, message)
+    except Exception:
+        logger.exception("Realtime publish to %s failed", channel)
+
+
+# --- পাবলিশার ---
+
+def rank_delta(old_entries, new_entries):
+    """দুটি লিডারবোর্ডের পার্থক্য: যাদের র‍্যাঙ্ক/স্কোর বদলেছে বা নতুন এসেছে, আর যারা বাদ পড়েছে।"""
+    old = {entry['username']: entry for entry in old_entries}
+    new = {entry['username']: entry for entry in new_entries}
+    changes = [
+        entry for username, entry in new.items()
+        if username not in old
+        or (old[username]['rank'], old[username]['total_score']) != (entry['rank'], entry['total_score'])
+    ]
+    removed = [username for username in old if username not in new]
+    return changes, removed
+
+
+def publish_rank_delta(group_id, old_entries, new_entries):
+    changes, removed = rank_delta(old_entries or [], new_entries)
+    if changes or removed:
+        publish(group_channel(group_id), {
+            'type': 'leaderboard', 'group_id': group_id, 'changes': changes, 'removed': removed,
+        })
+
+
+def publish_notice(notice):
+    from .serializers import NoticeSerializer
+
+    publish(NOTICES_CHANNEL, {
+        'type': 'notice', 'id': notice.id, 'is_active': notice.is_active, **NoticeSerializer(notice).data,
+    })
+
+
+def publish_membership(user_id):
+    publish(user_channel(user_id), {'type': 'membership'})
+
+
+# --- হাব: চ্যানেলভিত্তিক সাবস্ক্রিপশন ও কোলেসিং ---
+
+_RESYNC = object()
+
+
+def _resync_message():
+    return dumps({'type': 'resync'})
+
+
+class Connection:
+    def __init__(self, resync=_resync_message):
+        self.queue = asyncio.Queue(maxsize=settings.REALTIME_QUEUE_SIZE)
+        self.overflowed = False
+        # কিউ উপচে পড়লে বাদ পড়া মেসেজগুলোর বদলে যা পাঠানো হয় (টেক্সট দেয় এমন ফাংশন)
+        self.resync = resync
+        # ইউজারের গ্রুপ সদস্যপদ বদলেছে; চ্যানেল আবার নির্ধারণ করতে হবে
+        self.membership_changed = asyncio.Event()
+
+    def offer(self, text):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            # কিউ খালি করে শুধু resync চিহ্ন রাখা হয়
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESYNC)
+
+    async def next_message(self):
+        text = await self.queue.get()
+        if self.queue.empty():
+            self.overflowed = False
+        if text is _RESYNC:
+            # পাঠানোর মুহূর্তে তৈরি, তাই উপচে পড়ার পরে বাদ পড়া আপডেটগুলোও এতে থাকে
+            text = self.resync()
+        return text
+
+
+def _merge(pending, message):
+    if message.get('type') == 'leaderboard':
+        # প্রতিটি এন্ট্রি পরম মান (rank, total_score), তাই শেষেরটাই থাকে
+        changes = pending.setdefault('changes', {})
+        removed = pending.setdefault('removed', set())
+        for entry in message['changes']:
+            changes[entry['username']] = entry
+            removed.discard(entry['username'])
+        for username in message['removed']:
+            changes.pop(username, None)
+            removed.add(username)
+    elif message.get('type') == 'notice':
+        pending.setdefault('notices', {})[message['id']] = message
+
+
+def _flushed_messages(channel, pending):
+    messages = []
+    if 'changes' in pending:
+        messages.append({
+            'type': 'leaderboard',
+            'group_id': int(channel.split(':', 1)[1]),
+            'changes': sorted(pending['changes'].values(), key=lambda entry: entry['rank']),
+            'removed': sorted(pending['removed']),
+        })
+    messages.extend(pending.get('notices', {}).values())
+    return messages
+
+
+class Hub:
+    def __init__(self, broker=None):
+        self.broker = broker or get_broker()
+        self._connections = {}  # channel -> {Connection}
+        self._pending = {}      # channel -> মিলিয়ে রাখা আপডেট
+        self._flush_handle = None
+
+    async def join(self, connection, channels):
+        for channel in channels:
+            members = self._connections.setdefault(channel, set())
+            if not members:
+                await self.broker.subscribe(channel, self._receive)
+            members.add(connection)
+
+    async def leave(self, connection, channels):
+        for channel in channels:
+            members = self._connections.get(channel, set())
+            members.discard(connection)
+            if not members and self._connections.pop(channel, None) is not None:
+                self._pending.pop(channel, None)
+                await self.broker.unsubscribe(channel, self._receive)
+
+    def _receive(self, channel, data):
+        if channel not in self._connections:
+            return
+        message = json.loads(data)
+        if message.get('type') == 'membership':
+            # কোলেস করার কিছু নেই; কানেকশনগুলো নিজেরাই চ্যানেল আবার ঠিক করে
+            for connection in self._connections[channel]:
+                connection.membership_changed.set()
+            return
+        _merge(self._pending.setdefault(channel, {}), message)
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(settings.REALTIME_COALESCE_MS / 1000, self.flush)
+
+    def flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        for channel, updates in pending.items():
+            members = self._connections.get(channel)
+            if not members:
+                continue
+            for message in _flushed_messages(channel, updates):
+                # একবার এনকোড, সব ক্লায়েন্টে একই টেক্সট
+                text = dumps(message)
+                for connection in members:
+                    connection.offer(text)
+
+
+_hub = None
+
+
+def get_hub():
+    global _hub
+    if _hub is None:
+        _hub = Hub()
+    return _hub
+
+
+# --- অথেন্টিকেশন ও চ্যানেল নির্বাচন ---
+
+def _token_from_scope(scope):
+    query = parse_qs(scope.get('query_string', b'').decode())
+    if query.get('token'):
+        return query['token'][0]
+    for name, value in scope.get('headers', []):
+        if name == b'authorization':
+            keyword, _, key = value.decode('latin1').partition(' ')
+            if keyword == 'Token':
+                return key.strip()
+    return None
+
+
+def user_from_scope(scope):
+    """?token= বা Authorization: Token হেডারের ইউজার (sync; না পেলে None)।"""
+    from rest_framework.authtoken.models import Token
+
+    key = _token_from_scope(scope)
+    token = Token.objects.select_related('user').filter(key=key).first() if key else None
+    if token is None or not token.user.is_active:
+        return None
+    return token.user
+
+
+def _channels_for(user, scope):
+    from .models import GroupMembership
+
+    group_ids = set(GroupMembership.objects.filter(user=user).values_list('group_id', flat=True))
+    requested = parse_qs(scope.get('query_string', b'').decode()).get('groups')
+    if requested:
+        # শুধু নিজের গ্রুপগুলোর মধ্যে থেকে বেছে নেওয়া যায়
+        wanted = {int(value) for value in requested[0].split(',') if value.strip().isdigit()}
+        group_ids &= wanted
+    return [NOTICES_CHANNEL, user_channel(user.id)] + [group_channel(group_id) for group_id in sorted(group_ids)]
+
+
+def _resolve_channels(scope):
+    """টোকেনের ইউজার ও তার চ্যানেলগুলো; অথেন্টিকেশন ব্যর্থ হলে (None, None)।"""
+    try:
+        user = user_from_scope(scope)
+        if user is None:
+            return None, None
+        return user, _channels_for(user, scope)
+    finally:
+        close_old_connections()
+
+
+def _current_channels(user, scope):
+    try:
+        return _channels_for(user, scope)
+    finally:
+        close_old_connections()
+
+
+def _hello(channels):
+    prefix = GROUP_CHANNEL.format('')
+    return dumps({
+        'type': 'hello',
+        'groups': [int(channel[len(prefix):]) for channel in channels if channel.startswith(prefix)],
+    })
+
+
+async def _follow_membership(hub, connection, user, scope, channels):
+    """সদস্যপদ বদলালে গ্রুপ চ্যানেলগুলো নতুন করে join/leave করে (channels লিস্ট জায়গায় বদলায়) ও নতুন hello দেয়।"""
+    while True:
+        await connection.membership_changed.wait()
+        connection.membership_changed.clear()
+        current = await sync_to_async(_current_channels)(user, scope)
+        added = [channel for channel in current if channel not in channels]
+        removed = [channel for channel in channels if channel not in current]
+        # মাঝপথে বাতিল হলেও channels এ সব join করা চ্যানেল থাকে, যাতে শেষে leave সবগুলো ছাড়ে
+        channels.extend(added)
+        await hub.join(connection, added)
+        await hub.leave(connection, removed)
+        channels[:] = current
+        connection.offer(_hello(channels))
+
+
+# --- ASGI অ্যাপ ---
+
+async def websocket_app(scope, receive, send):
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+    user, channels = await sync_to_async(_resolve_channels)(scope)
+    if user is None:
+        await send({'type': 'websocket.close', 'code': 4401})
+        return
+    await send({'type': 'websocket.accept'})
+
+    hub = get_hub()
+    connection = Connection()
+    connection.offer(_hello(channels))
+    await hub.join(connection, channels)
+
+    async def writer():
+        while True:
+            await send({'type': 'websocket.send', 'text': await connection.next_message()})
+
+    write_task = asyncio.create_task(writer())
+    follow_task = asyncio.create_task(_follow_membership(hub, connection, user, scope, channels))
+    try:
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                break
+            # ক্লায়েন্টের পাঠানো মেসেজ শুধু keepalive হিসেবে গণ্য
+    finally:
+        write_task.cancel()
+        follow_task.cancel()
+        await asyncio.gather(follow_task, return_exceptions=True)
+        await hub.leave(connection, channels)
+
+
+async def _send_json(send, status, payload):
+    body = dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def sse_app(scope, receive, send):
+    if scope['method'] != 'GET':
+        await _send_json(send, 405, {'detail': f'Method "{scope["method"]}" not allowed.'})
+        return
+    user, channels = await sync_to_async(_resolve_channels)(scope)
+    if user is None:
+        await _send_json(send, 401, {'detail': 'Authentication credentials were not provided.'})
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream; charset=utf-8'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+
+    hub = get_hub()
+    connection = Connection()
+    connection.offer(_hello(channels))
+    await hub.join(connection, channels)
+
+    async def wait_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    disconnected = asyncio.create_task(wait_disconnect())
+    follow_task = asyncio.create_task(_follow_membership(hub, connection, user, scope, channels))
+    try:
+        while not disconnected.done():
+            next_message = asyncio.create_task(connection.next_message())
+            done, _ = await asyncio.wait(
+                {next_message, disconnected},
+                timeout=settings.REALTIME_KEEPALIVE_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if next_message in done:
+                chunk = f"data: {next_message.result()}\n\n"
+            else:
+                next_message.cancel()
+                if disconnected in done:
+                    break
+                # প্রক্সি যাতে আইডল কানেকশন কেটে না দেয়
+                chunk = ': keepalive\n\n'
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+    finally:
+        disconnected.cancel()
+        follow_task.cancel()
+        await asyncio.gather(follow_task, return_exceptions=True)
+        await hub.leave(connection, channels)
+
+
+async def live_application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        if scope['path'] != WEBSOCKET_PATH:
+            await receive()
+            await send({'type': 'websocket.close', 'code': 4404})
+            return
+        await websocket_app(scope, receive, send)
+    else:
+        await sse_app(scope, receive, send)
@@ -0,0 +1,189 @@
+# api/resume.py
+# "যেখানে ছেড়েছিলেন" কার্সর। প্রতিটি UserEnrollment এ শেষ ইউনিট/লেসন/কুইজ আর পরের অ-চেষ্টা-করা লেসন
+# রাখা হয়, যাতে ড্যাশবোর্ডকে ইউজারের অ্যাটেম্পট কোর্স-ট্রির সাথে মিলিয়ে দেখতে না হয়।
+# কোর্সের ক্রম (আউটলাইন) ক্যাশ থেকে আসে, আর কোন কুইজ চেষ্টা করা হয়েছে তা এনরোলমেন্টের completion বিটম্যাপ থেকে,
+# তাই প্রতি আপডেটে শুধু এনরোলমেন্ট রোটি লক করে পড়া আর একটি UPDATE।
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import get_course_outline
+from .completion import get_content_index, attempted_quiz_ids, mark_attempted, set_bit
+from .models import Quiz, QuizAttemptSummary, UserEnrollment
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def next_unattempted_lesson(lessons, attempted_quiz_ids, after_lesson_id=None):
+    """after_lesson_id এর পর থেকে (শেষে পৌঁছালে শুরু থেকে) প্রথম লেসন যার কোনো কুইজ এখনো চেষ্টা করা হয়নি।
+
+    lessons হলো আউটলাইনের [(lesson_id, unit_id, quiz_ids), ...]। কুইজ নেই এমন লেসন বাদ যায়,
+    কারণ সেগুলো "শেষ" হয়েছে কিনা জানার উপায় নেই। সব শেষ হলে None।
+    """
+    start = 0
+    for index, (lesson_id, _, _) in enumerate(lessons):
+        if lesson_id == after_lesson_id:
+            start = index + 1
+            break
+    for lesson_id, _, quiz_ids in lessons[start:] + lessons[:start]:
+        if quiz_ids and not attempted_quiz_ids.issuperset(quiz_ids):
+            return lesson_id
+    return None
+
+
+def _last_lesson_in_unit(lessons, unit_id):
+    last = None
+    for lesson_id, lesson_unit_id, _ in lessons:
+        if lesson_unit_id == unit_id:
+            last = lesson_id
+    return last
+
+
+def _advance(completion, outline, quiz_id, unit_id, lesson_id):
+    """একটি কুইজ চেষ্টার পরে এনরোলমেন্টের নতুন completion আর কার্সর ফিল্ড।"""
+    completion = mark_attempted(completion, quiz_id)
+    attempted = attempted_quiz_ids(completion, outline['quizzes'])
+    # মাস্টারি কুইজের পরে ঐ ইউনিটের শেষ লেসনের পর থেকে খোঁজা হয়
+    position = lesson_id or _last_lesson_in_unit(outline['lessons'], unit_id)
+    cursor = {
+        'completion': completion,
+        'last_unit_id': unit_id,
+        'last_quiz_id': quiz_id,
+        'next_lesson_id': next_unattempted_lesson(outline['lessons'], attempted, position),
+        'last_activity_at': timezone.now(),
+    }
+    if lesson_id:
+        cursor['last_lesson_id'] = lesson_id
+    return cursor
+
+
+def record_quiz_progress(user_id, quiz_id):
+    """অ্যাটেম্পট সেভ হওয়ার পরে ডাকা হয়: completion বিট সেট করে কার্সর এগিয়ে দেয়। এনরোল না থাকলে কিছুই বদলায় না।"""
+    entry = get_content_index()['quizzes'].get(quiz_id)
+    if entry is None:
+        return 0
+    course_id = entry[0]
+    outline = get_course_outline(course_id)
+    unit_id, lesson_id = outline['quizzes'].get(quiz_id, (None, None))
+
+    with transaction.atomic():
+        # একই ইউজারের একসাথে দুটি সাবমিশন যেন একে অপরের বিট মুছে না ফেলে
+        enrollment = UserEnrollment.objects.select_for_update().filter(
+            user_id=user_id, course_id=course_id
+        ).only('id', 'completion').first()
+        if enrollment is None:
+            return 0
+        cursor = _advance(bytes(enrollment.completion or b''), outline, quiz_id, unit_id, lesson_id)
+        return UserEnrollment.objects.filter(pk=enrollment.pk).update(**cursor)
+
+
+def record_quiz_progress_for_users(user_ids, quiz_id):
+    """record_quiz_progress অনেক ইউজারের জন্য একসাথে (লাইভ কুইজ সেশন শেষে): একটি লক করা SELECT আর একটি bulk UPDATE।"""
+    entry = get_content_index()['quizzes'].get(quiz_id)
+    if entry is None or not user_ids:
+        return 0
+    course_id = entry[0]
+    outline = get_course_outline(course_id)
+    unit_id, lesson_id = outline['quizzes'].get(quiz_id, (None, None))
+
+    with transaction.atomic():
+        enrollments = list(UserEnrollment.objects.select_for_update().filter(
+            user_id__in=user_ids, course_id=course_id
+        ).order_by('id').only('id', 'completion'))
+        fields = set()
+        for enrollment in enrollments:
+            cursor = _advance(bytes(enrollment.completion or b''), outline, quiz_id, unit_id, lesson_id)
+            for field, value in cursor.items():
+                setattr(enrollment, field, value)
+            fields.update(cursor)
+        if not enrollments:
+            return 0
+        return UserEnrollment.objects.bulk_update(enrollments, sorted(field.removesuffix('_id') for field in fields))
+
+
+def record_lesson_view(user_id, lesson):
+    # কোনো রিড ছাড়াই একটি UPDATE; next_lesson শুধু অ্যাটেম্পটে বদলায়
+    return UserEnrollment.objects.filter(user_id=user_id, course__units=lesson.unit_id).update(
+        last_unit_id=lesson.unit_id,
+        last_lesson_id=lesson.id,
+        last_activity_at=timezone.now(),
+    )
+
+
+def backfill_enrollments(course_id, user_ids):
+    """
+    নতুন এনরোলমেন্টে (বাল্ক এনরোলের জব থেকে) এনরোলের আগের অ্যাটেম্পটগুলো বসায়: completion বিট, আর কার্সর
+    এখনো খালি থাকলে সর্বশেষ অ্যাটেম্পট অনুযায়ী last_* ও next_lesson। অ্যাটেম্পট না থাকলে কিছুই বদলায় না।
+    """
+    outline = get_course_outline(course_id)
+    updated = 0
+    for start in range(0, len(user_ids), BACKFILL_BATCH_SIZE):
+        batch = user_ids[start:start + BACKFILL_BATCH_SIZE]
+        attempted = {}
+        latest = {}
+        for user_id, quiz_id, latest_at in QuizAttemptSummary.objects.filter(
+            user_id__in=batch, quiz_id__in=list(outline['quizzes'])
+        ).values_list('user_id', 'quiz_id', 'latest_at'):
+            attempted.setdefault(user_id, set()).add(quiz_id)
+            if user_id not in latest or latest_at > latest[user_id][0]:
+                latest[user_id] = (latest_at, quiz_id)
+        if not attempted:
+            continue
+
+        with transaction.atomic():
+            # একই সময়ে নতুন সাবমিশন record_quiz_progress এ বিট বসালে তা হারায় না
+            enrollments = list(UserEnrollment.objects.select_for_update().filter(
+                course_id=course_id, user_id__in=list(attempted)
+            ).only('id', 'user_id', 'completion', 'last_lesson_id', 'last_activity_at'))
+            for enrollment in enrollments:
+                completion = bytes(enrollment.completion or b'')
+                for quiz_id in attempted[enrollment.user_id]:
+                    completion = mark_attempted(completion, quiz_id)
+                enrollment.completion = completion
+
+                position = enrollment.last_lesson_id
+                if enrollment.last_activity_at is None:
+                    latest_at, quiz_id = latest[enrollment.user_id]
+                    unit_id, lesson_id = outline['quizzes'][quiz_id]
+                    enrollment.last_unit_id = unit_id
+                    enrollment.last_lesson_id = lesson_id
+                    enrollment.last_quiz_id = quiz_id
+                    enrollment.last_activity_at = latest_at
+                    position = lesson_id or _last_lesson_in_unit(outline['lessons'], unit_id)
+                enrollment.next_lesson_id = next_unattempted_lesson(
+                    outline['lessons'], attempted_quiz_ids(completion, outline['quizzes']), position
+                )
+            updated += UserEnrollment.objects.bulk_update(enrollments, [
+                'completion', 'last_unit', 'last_lesson', 'last_quiz', 'last_activity_at', 'next_lesson',
+            ])
+    return updated
+
+
+def backfill_quiz_bits(course_id, quiz_ids):
+    """
+    কুইজ অন্য কোর্সে সরে নতুন completion বিট পেলে (completion.allocate_bit): ঐ কোর্সে এনরোল করা যারা কুইজগুলো
+    আগেই চেষ্টা করেছে তাদের বিটম্যাপে নতুন বিট বসায়। কার্সর বদলায় না।
+    """
+    bits = dict(Quiz.objects.filter(
+        id__in=quiz_ids, completion_course_id=course_id, completion_bit__isnull=False
+    ).values_list('id', 'completion_bit'))
+    attempted = {}
+    for user_id, quiz_id in QuizAttemptSummary.objects.filter(
+        quiz_id__in=list(bits), user__user_enrollments__course_id=course_id
+    ).values_list('user_id', 'quiz_id'):
+        attempted.setdefault(user_id, []).append(bits[quiz_id])
+
+    user_ids = sorted(attempted)
+    updated = 0
+    for start in range(0, len(user_ids), BACKFILL_BATCH_SIZE):
+        with transaction.atomic():
+            enrollments = list(UserEnrollment.objects.select_for_update().filter(
+                course_id=course_id, user_id__in=user_ids[start:start + BACKFILL_BATCH_SIZE]
+            ).only('id', 'user_id', 'completion'))
+            for enrollment in enrollments:
+                completion = bytes(enrollment.completion or b'')
+                for bit in attempted[enrollment.user_id]:
+                    completion = set_bit(completion, bit)
+                enrollment.completion = completion
+            updated += UserEnrollment.objects.bulk_update(enrollments, ['completion'])
+    return updated
+
@@ -0,0 +1,135 @@
+# api/reviews.py
+# স্পেসড রিপিটিশন (SM-2) রিভিউ শিডিউলার।
+# কুইজে ভুল করা প্রশ্ন ReviewItem হিসেবে ঢোকে, আর প্রতিটি রিভিউয়ের পর SM-2 অনুযায়ী পরের due_at ঠিক হয়।
+# "এখন due" প্রশ্নগুলো (user, due_at) ইনডেক্সের রেঞ্জ স্ক্যান থেকে আসে, তাই টেবিল বড় হলেও খরচ বাড়ে না।
+from datetime import timedelta
+
+from django.db.models import F, Prefetch, prefetch_related_objects
+from django.utils import timezone
+
+from .grading import get_answer_key, grade
+from .models import Choice, ReviewItem, UserEnrollment
+
+MIN_EASE = 1.3
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+DEFAULT_QUEUE_SIZE = 20
+MAX_QUEUE_SIZE = 50
+
+_SCHEDULE_FIELDS = ['ease_factor', 'interval_days', 'repetitions', 'lapses', 'due_at', 'last_reviewed_at']
+
+
+def sm2(item, quality, now):
+    """item এর SM-2 অবস্থা জায়গায় আপডেট করে। quality 0-5; 3 এর নিচে মানে ভুল।"""
+    if quality >= 3:
+        if item.repetitions == 0:
+            item.interval_days = 1
+        elif item.repetitions == 1:
+            item.interval_days = 6
+        else:
+            item.interval_days = max(1, round(item.interval_days * item.ease_factor))
+        item.repetitions += 1
+    else:
+        # ভুল হলে শুরু থেকে, আর প্রশ্নটি সাথে সাথেই আবার রিভিউ কিউতে আসে
+        item.repetitions = 0
+        item.interval_days = 0
+        item.lapses += 1
+    item.ease_factor = max(MIN_EASE, item.ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    item.due_at = now + timedelta(days=item.interval_days)
+    item.last_reviewed_at = now
+    return item
+
+
+def apply_results(user_id, results, course_id=None, now=None):
+    """grading.grade() এর results দিয়ে শিডিউল আপডেট করে (দুটি কোয়েরি)।
+
+    নতুন ReviewItem শুধু ভুল উত্তরের জন্য এবং course_id দেওয়া থাকলে তৈরি হয়;
+    যেগুলো আগে থেকেই কিউতে আছে সেগুলো সঠিক/ভুল অনুযায়ী এগোয় বা পিছোয়।
+    """
+    return apply_results_for_users({user_id: results}, course_id=course_id, now=now)
+
+
+def apply_results_for_users(results_by_user, course_id=None, now=None):
+    """apply_results অনেক ইউজারের জন্য একসাথে (লাইভ কুইজ সেশন শেষে): মোট দুটি কোয়েরি।"""
+    outcomes = {
+        user_id: {result['question']: result['is_correct'] for result in results}
+        for user_id, results in results_by_user.items()
+    }
+    question_ids = {question_id for user_outcomes in outcomes.values() for question_id in user_outcomes}
+    if not question_ids:
+        return 0
+    now = now or timezone.now()
+
+    existing = {
+        (item.user_id, item.question_id): item
+        for item in ReviewItem.objects.filter(user_id__in=list(outcomes), question_id__in=question_ids)
+    }
+    items = []
+    for user_id, user_outcomes in outcomes.items():
+        for question_id, is_correct in user_outcomes.items():
+            item = existing.get((user_id, question_id))
+            if item is None:
+                if is_correct or course_id is None:
+                    continue
+                item = ReviewItem(user_id=user_id, question_id=question_id, course_id=course_id)
+            items.append(sm2(item, QUALITY_CORRECT if is_correct else QUALITY_WRONG, now))
+
+    ReviewItem.objects.bulk_create(
+        items,
+        update_conflicts=True,
+        unique_fields=['user', 'question'],
+        update_fields=_SCHEDULE_FIELDS,
+    )
+    return len(items)
+
+
+def due_items(user_id, now=None):
+    # ইনডেক্সে (user_id, due_at) ক্রমে পড়া হয়; এনরোলমেন্ট শুধু semi-join ফিল্টার, তাই LIMIT পেলেই থামে
+    return ReviewItem.objects.filter(
+        user_id=user_id,
+        due_at__lte=now or timezone.now(),
+        course_id__in=UserEnrollment.objects.filter(user_id=user_id).values('course_id'),
+    ).order_by('due_at')
+
+
+def build_review_quiz(user_id, limit=DEFAULT_QUEUE_SIZE, now=None):
+    """সবচেয়ে আগে due হওয়া limit টি প্রশ্ন (due ক্রমে), চয়েসসহ, দুটি কোয়েরিতে।
+
+    due আইটেমের সাথে প্রশ্ন select_related এ আসে, তারপর সব প্রশ্নের চয়েস একটি prefetch এ, যাতে
+    QuestionSerializer আর কোনো কোয়েরি না করে। চয়েস নেই এমন প্রশ্নও আসে (খালি choices সহ)।
+    """
+    questions = [item.question for item in due_items(user_id, now).select_related('question')[:limit]]
+    prefetch_related_objects(questions, Prefetch('choices', queryset=Choice.objects.order_by('id')))
+    return questions
+
+
+def grade_review(user_id, answers, now=None):
+    """রিভিউ কুইজ গ্রেড করে শিডিউল আপডেট করে। কিউতে নেই এমন প্রশ্ন উপেক্ষা করা হয়।"""
+    now = now or timezone.now()
+    items = list(
+        ReviewItem.objects.filter(user_id=user_id, question_id__in=answers).annotate(quiz_id=F('question__quiz_id'))
+    )
+
+    question_ids_by_quiz = {}
+    for item in items:
+        question_ids_by_quiz.setdefault(item.quiz_id, []).append(item.question_id)
+
+    score = 0
+    total_points = 0
+    results = []
+    for quiz_id, question_ids in question_ids_by_quiz.items():
+        answer_key = get_answer_key(quiz_id)
+        quiz_score, quiz_total, quiz_results = grade(
+            answer_key, answers, [question_id for question_id in question_ids if question_id in answer_key['questions']]
+        )
+        score += quiz_score
+        total_points += quiz_total
+        results.extend(quiz_results)
+
+    outcomes = {result['question']: result['is_correct'] for result in results}
+    graded = [
+        sm2(item, QUALITY_CORRECT if outcomes[item.question_id] else QUALITY_WRONG, now)
+        for item in items if item.question_id in outcomes
+    ]
+    ReviewItem.objects.bulk_update(graded, _SCHEDULE_FIELDS)
+    return score, total_points, results
@@ -0,0 +1,99 @@
+# api/sampling.py
+# বড় প্রশ্ন-ব্যাংক থেকে প্রতি অ্যাটেম্পটে র‍্যান্ডম প্রশ্নপত্র তৈরি।
+# প্রতিটি কুইজের প্রশ্ন আইডিগুলো পয়েন্ট অনুযায়ী ভাগ করে প্রসেস-মেমোরিতে array হিসেবে রাখা হয়,
+# তাই k টি প্রশ্ন তুলতে O(k) সময় লাগে (ORDER BY random() এর মতো পুরো টেবিল স্ক্যান হয় না)।
+# একই seed দিলে সবসময় হুবহু একই প্রশ্নপত্র তৈরি হয়, তাই গ্রেড করার সময় seed থেকেই প্রশ্নপত্র আবার বানানো যায়।
+import random
+import secrets
+import uuid
+from array import array
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Question
+
+INDEX_VERSION_KEY = 'api:quiz:{}:index_version'
+
+# seed সবসময় 31 বিটের ভেতরে (অ্যাটেম্পটের seed কলাম আর ক্লায়েন্টের int এ নিরাপদে ধরে)
+SEED_BITS = 31
+MAX_SEED = (1 << SEED_BITS) - 1
+
+# প্রসেস-লোকাল: {quiz_id: (version, [(points, array_of_question_ids), ...], total_questions)}
+_indexes = {}
+
+
+def new_seed():
+    return secrets.randbits(SEED_BITS)
+
+
+def parse_seed(value):
+    """?seed= এর মান: new_seed() এর সীমার (31 বিট) ভেতরের অঋণাত্মক পূর্ণসংখ্যা হলে int, নইলে None।"""
+    value = str(value or '')
+    if not value.isdecimal() or len(value) > len(str(MAX_SEED)):
+        return None
+    seed = int(value)
+    return seed if seed <= MAX_SEED else None
+
+
+def invalidate_question_index(quiz_id):
+    # কমিটের পরে, নইলে অন্য প্রসেস কমিটের আগের প্রশ্ন নিয়ে ইনডেক্স বানিয়ে নতুন ভার্সনে রেখে দিতে পারে
+    transaction.on_commit(lambda: cache.delete(INDEX_VERSION_KEY.format(quiz_id)))
+
+
+def _build_index(quiz_id):
+    strata = {}
+    for question_id, points in Question.objects.filter(quiz_id=quiz_id).order_by('id').values_list('id', 'points'):
+        strata.setdefault(points, array('q')).append(question_id)
+    ordered = sorted(strata.items())
+    return ordered, sum(len(ids) for _, ids in ordered)
+
+
+def get_question_index(quiz_id):
+    # কন্টেন্ট বদলালে শেয়ার্ড ক্যাশের ভার্সন মুছে যায়, তখন প্রতিটি প্রসেস নিজের ইনডেক্স নতুন করে বানায়
+    version = cache.get(INDEX_VERSION_KEY.format(quiz_id))
+    local = _indexes.get(quiz_id)
+    if version is not None and local is not None and local[0] == version:
+        return local[1], local[2]
+
+    strata, total = _build_index(quiz_id)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(INDEX_VERSION_KEY.format(quiz_id), version, None)
+    _indexes[quiz_id] = (version, strata, total)
+    return strata, total
+
+
+def _allocate(strata, total, k):
+    """k টি প্রশ্ন স্তরগুলোর আকারের অনুপাতে ভাগ করে (largest remainder পদ্ধতি)।"""
+    quotas = []
+    remainders = []
+    for index, (_, ids) in enumerate(strata):
+        exact = k * len(ids) / total
+        quotas.append(int(exact))
+        remainders.append((exact - int(exact), -index))
+    left = k - sum(quotas)
+    for _, negative_index in sorted(remainders, reverse=True)[:left]:
+        quotas[-negative_index] += 1
+    return quotas
+
+
+def draw_paper(quiz_id, sample_size, seed):
+    """seed থেকে প্রশ্নপত্রের প্রশ্ন আইডির তালিকা (উপস্থাপনের ক্রমে) তৈরি করে।"""
+    strata, total = get_question_index(quiz_id)
+    k = min(sample_size, total)
+    rng = random.Random(seed)
+
+    paper = []
+    for (_, ids), quota in zip(strata, _allocate(strata, total, k) if total else []):
+        if quota:
+            paper.extend(ids[i] for i in rng.sample(range(len(ids)), quota))
+    rng.shuffle(paper)
+    return paper
+
+
+def shuffle_choices(choices, seed, question_id):
+    # প্রতিটি প্রশ্নের নিজস্ব RNG, যাতে প্রশ্নপত্রে ক্রম বদলালেও চয়েসের ক্রম একই থাকে
+    choices = list(choices)
+    random.Random(f"{seed}:{question_id}").shuffle(choices)
+    return choices
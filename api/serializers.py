@@ -1,16 +1,79 @@
 # api/serializers.py
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db.models import Sum, Q, F, Window, IntegerField
-from django.db.models.functions import Rank
+from django.db.models.functions import Coalesce, Rank
 from .models import (
     Category, Course, Unit, Lesson, 
     Quiz, Question, Choice,
-    UserQuizAttempt, # <-- UserLessonProgress ইম্পোর্ট সরানো হয়েছে
+    UserQuizAttempt, QuizAttemptSummary, # <-- UserLessonProgress ইম্পোর্ট সরানো হয়েছে
     UserEnrollment, MatchingGame, GamePair,
     LearningGroup, GroupMembership,
     Notice, Promotion 
 )
+from .cache import get_course_stats, get_unit_stats, get_group_summary
+from .completion import any_attempted, get_content_index, lesson_quiz_ids, unit_quiz_ids
+from .grading import get_answer_key, normalize_answers
+from .memo import memoize
+from .sampling import MAX_SEED, new_seed, parse_seed, draw_paper, shuffle_choices
+
+
+# --- ইউজারের পয়েন্ট/অগ্রগতি (রিকোয়েস্ট-স্কোপড memo) ---
+# কোর্স, ইউনিট, কুইজ আর ড্যাশবোর্ডের পয়েন্ট ফিল্ডগুলো একই হিসাব বারবার চায় (একই কোর্সের ইউনিটগুলো,
+# is_100_percent_completed আর user_earned_points)। কোর্সপ্রতি ইউজারের সামারিগুলো একটি কোয়েরিতে আসে,
+# বাকি সব তার থেকে।
+
+def _course_scores(context, course_id):
+    """{quiz_id: (unit_id, latest_score, latest_total_points)} -- কোর্সের যে কুইজগুলো ইউজার চেষ্টা করেছে।"""
+    user = context['request'].user
+
+    def compute():
+        rows = QuizAttemptSummary.objects.filter(user=user).filter(
+            Q(quiz__lesson__unit__course_id=course_id) | Q(quiz__unit__course_id=course_id)
+        ).annotate(
+            unit_id=Coalesce('quiz__lesson__unit_id', 'quiz__unit_id')
+        ).values_list('quiz_id', 'unit_id', 'latest_score', 'latest_total_points')
+        return {quiz_id: (unit_id, score, total) for quiz_id, unit_id, score, total in rows}
+
+    return memoize(context, 'course_scores', course_id, compute)
+
+
+def _unit_earned_points(context, course_id):
+    def compute():
+        totals = {}
+        for unit_id, score, _ in _course_scores(context, course_id).values():
+            totals[unit_id] = totals.get(unit_id, 0) + score
+        return totals
+
+    return memoize(context, 'unit_earned_points', course_id, compute)
+
+
+def user_earned_points(context, course_id, unit_id=None):
+    if not context['request'].user.is_authenticated:
+        return 0
+    totals = _unit_earned_points(context, course_id)
+    return totals.get(unit_id, 0) if unit_id is not None else sum(totals.values())
+
+
+def latest_score(context, quiz_id):
+    """(latest_score, latest_total_points) বা None।"""
+    entry = get_content_index()['quizzes'].get(quiz_id)
+    if entry is not None:
+        scores = _course_scores(context, entry[0]).get(quiz_id)
+        return scores[1:] if scores else None
+    # কন্টেন্ট ইনডেক্সে নেই (বিট বরাদ্দ হয়নি এমন পুরোনো কুইজ): সরাসরি
+    user = context['request'].user
+    return memoize(context, 'latest_score', quiz_id, lambda: QuizAttemptSummary.objects.filter(
+        user=user, quiz_id=quiz_id
+    ).values_list('latest_score', 'latest_total_points').first())
+
+
+def enrolled_course_ids(context):
+    user = context['request'].user
+    return memoize(context, 'enrolled_course_ids', None, lambda: set(
+        UserEnrollment.objects.filter(user=user).values_list('course_id', flat=True)
+    ))
 
 # --- নতুন: মিনি কোর্স সিরিয়ালাইজার (গ্রুপের জন্য) ---
 class MiniCourseSerializer(serializers.ModelSerializer):
@@ -40,10 +103,11 @@ class MatchingGameSerializer(serializers.ModelSerializer):
         if not user.is_authenticated:
             return False
         
-        if obj.unit:
-             return UserQuizAttempt.objects.filter(user=user, quiz__unit=obj.unit).exists()
-        if obj.lesson:
-             return UserQuizAttempt.objects.filter(user=user, quiz__lesson=obj.lesson).exists()
+        # গেমের নিজস্ব সাবমিশন নেই; একই ইউনিট/লেসনের কুইজ চেষ্টা করা হলেই গেম "attempted"
+        if obj.unit_id:
+             return any_attempted(self.context, user, unit_quiz_ids(obj.unit_id))
+        if obj.lesson_id:
+             return any_attempted(self.context, user, lesson_quiz_ids(obj.lesson_id))
         return False
 # ----------------------------------------------------
 
@@ -53,40 +117,92 @@ class ChoiceSerializer(serializers.ModelSerializer):
         model = Choice
         fields = ['id', 'text', 'is_correct'] 
 
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        # সব ক্লায়েন্ট /grade/ এন্ডপয়েন্টে চলে গেলে QUIZ_EXPOSE_ANSWERS = False করে সঠিক উত্তর লুকানো যাবে
+        if not settings.QUIZ_EXPOSE_ANSWERS:
+            representation.pop('is_correct')
+        return representation
+
 class QuestionSerializer(serializers.ModelSerializer):
     choices = ChoiceSerializer(many=True, read_only=True)
     class Meta:
         model = Question
         fields = ['id', 'text', 'points', 'choices', 'explanation'] 
 
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        # ব্যাখ্যায় সাধারণত সঠিক উত্তর লেখা থাকে; উত্তর লুকানো থাকলে এটি শুধু /grade/ এর ফলাফলে আসে
+        if not settings.QUIZ_EXPOSE_ANSWERS:
+            representation.pop('explanation')
+        return representation
+
 # --- QuizSerializer (অপরিবর্তিত) ---
 class QuizSerializer(serializers.ModelSerializer):
-    questions = QuestionSerializer(many=True, read_only=True)
+    questions = serializers.SerializerMethodField()
     is_attempted = serializers.SerializerMethodField()
     latest_score_percentage = serializers.SerializerMethodField()
+    seed = serializers.SerializerMethodField()
     
     class Meta:
         model = Quiz
         fields = [
             'id', 'title', 'quiz_type', 'lesson', 'unit', 'questions', 
-            'is_attempted', 'latest_score_percentage'
+            'is_attempted', 'latest_score_percentage', 'seed'
         ]
+
+    def _is_randomized(self, obj):
+        return bool(obj.sample_size) or obj.shuffle_choices
+
+    def _seed_for(self, obj):
+        # একই অবজেক্টের questions আর seed ফিল্ড যেন একই seed পায়
+        seeds = self.__dict__.setdefault('_seeds', {})
+        if obj.id not in seeds:
+            requested = parse_seed(self.context['request'].query_params.get('seed'))
+            seeds[obj.id] = new_seed() if requested is None else requested
+        return seeds[obj.id]
+
+    def get_seed(self, obj):
+        if not self._is_randomized(obj):
+            return None
+        return self._seed_for(obj)
+
+    def get_questions(self, obj):
+        if not self._is_randomized(obj):
+            return QuestionSerializer(obj.questions.all(), many=True, context=self.context).data
+
+        seed = self._seed_for(obj)
+        if obj.sample_size:
+            paper = draw_paper(obj.id, obj.sample_size, seed)
+        else:
+            paper = list(obj.questions.order_by('id').values_list('id', flat=True))
+        questions = {q.id: q for q in Question.objects.filter(id__in=paper).prefetch_related('choices')}
+
+        data = []
+        for question_id in paper:
+            if question_id not in questions:
+                continue
+            question = QuestionSerializer(questions[question_id], context=self.context).data
+            if obj.shuffle_choices:
+                question['choices'] = shuffle_choices(question['choices'], seed, question_id)
+            data.append(question)
+        return data
         
     def get_is_attempted(self, obj):
         user = self.context['request'].user
         if not user.is_authenticated:
             return False
-        return UserQuizAttempt.objects.filter(user=user, quiz=obj).exists()
+        return any_attempted(self.context, user, [obj.id])
     
     def get_latest_score_percentage(self, obj):
         user = self.context['request'].user
         if not user.is_authenticated:
             return None
         
-        attempt = UserQuizAttempt.objects.filter(user=user, quiz=obj).first()
+        summary = latest_score(self.context, obj.id)
         
-        if attempt and attempt.total_points > 0:
-            percentage = (attempt.score / attempt.total_points) * 100
+        if summary and summary[1] > 0:
+            percentage = (summary[0] / summary[1]) * 100
             return round(percentage)
         
         return None
@@ -143,13 +259,7 @@ class UnitLessonSerializer(serializers.ModelSerializer):
         if not user.is_authenticated:
             return False
             
-        quiz_attempted = UserQuizAttempt.objects.filter(
-            user=user, 
-            quiz__lesson=obj, 
-            quiz__quiz_type='LESSON'
-        ).exists()
-        
-        return quiz_attempted 
+        return any_attempted(self.context, user, lesson_quiz_ids(obj.id, quiz_type='LESSON'))
 # --------------------------------------------------------------
 
 
@@ -183,28 +293,10 @@ class UnitSerializer(serializers.ModelSerializer):
         return serializer.data
 
     def get_total_possible_points(self, unit):
-        total_points = 0
-        lesson_quizzes = Quiz.objects.filter(lesson__unit=unit, quiz_type='LESSON')
-        for quiz in lesson_quizzes:
-            total_points += quiz.questions.aggregate(Sum('points'))['points__sum'] or 0
-        mastery_quizzes = unit.quizzes.filter(quiz_type='UNIT')
-        for quiz in mastery_quizzes:
-            total_points += quiz.questions.aggregate(Sum('points'))['points__sum'] or 0
-        return total_points
+        return get_unit_stats(unit.id)['total_possible_points']
 
     def get_user_earned_points(self, unit):
-        user = self.context['request'].user
-        if not user.is_authenticated:
-            return 0
-        earned_points = UserQuizAttempt.objects.filter(
-            user=user, 
-            quiz__lesson__unit=unit 
-        ).aggregate(Sum('score'))['score__sum'] or 0
-        earned_points += UserQuizAttempt.objects.filter(
-            user=user, 
-            quiz__unit=unit 
-        ).aggregate(Sum('score'))['score__sum'] or 0
-        return earned_points
+        return user_earned_points(self.context, unit.course_id, unit.id)
 # --------------------------------------------------------------
 
 
@@ -233,39 +325,22 @@ class CourseSerializer(serializers.ModelSerializer):
         user = self.context.get('request').user
         if not user or not user.is_authenticated:
             return False
-        return UserEnrollment.objects.filter(user=user, course=course).exists()
+        return course.id in enrolled_course_ids(self.context)
 
     def get_total_possible_points(self, course):
-        lesson_quiz_points = Question.objects.filter(
-            quiz__lesson__unit__course=course
-        ).aggregate(Sum('points'))['points__sum'] or 0
-        mastery_quiz_points = Question.objects.filter(
-            quiz__unit__course=course
-        ).aggregate(Sum('points'))['points__sum'] or 0
-        return lesson_quiz_points + mastery_quiz_points
+        return get_course_stats(course.id)['total_possible_points']
 
     def get_user_earned_points(self, course):
-        user = self.context['request'].user
-        if not user.is_authenticated:
-            return 0
-        earned_points = UserQuizAttempt.objects.filter(
-            user=user, 
-            quiz__lesson__unit__course=course
-        ).aggregate(Sum('score'))['score__sum'] or 0
-        earned_points += UserQuizAttempt.objects.filter(
-            user=user, 
-            quiz__unit__course=course
-        ).aggregate(Sum('score'))['score__sum'] or 0
-        return earned_points
+        return user_earned_points(self.context, course.id)
     
     def get_total_units(self, course):
-        return Unit.objects.filter(course=course).count()
+        return get_course_stats(course.id)['total_units']
 
     def get_total_lessons(self, course):
-        return Lesson.objects.filter(unit__course=course).count()
+        return get_course_stats(course.id)['total_lessons']
 
     def get_total_quizzes(self, course):
-        return Quiz.objects.filter(Q(lesson__unit__course=course) | Q(unit__course=course)).count()
+        return get_course_stats(course.id)['total_quizzes']
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -321,7 +396,59 @@ class RegisterSerializer(serializers.ModelSerializer):
 class UserQuizAttemptSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserQuizAttempt
-        fields = ['quiz', 'score', 'total_points']
+        fields = ['quiz', 'score', 'total_points', 'seed']
+        extra_kwargs = {'seed': {'min_value': 0, 'max_value': MAX_SEED}}
+
+    def validate(self, data):
+        # পুরনো ক্লায়েন্টরা নিজেরাই স্কোর পাঠায়; অন্তত উত্তর-চাবির মোট পয়েন্টের সাথে মিলিয়ে দেখা হয়
+        answer_key = get_answer_key(data['quiz'].id)
+        if data['total_points'] > answer_key['total_points'] or data['score'] > data['total_points']:
+            raise serializers.ValidationError({"score": "স্কোর কুইজের মোট পয়েন্টের চেয়ে বেশি হতে পারে না।"})
+        return data
+
+class QuizSubmissionSerializer(serializers.Serializer):
+    # {"answers": {"<question_id>": [choice_id, ...]}}
+    answers = serializers.DictField(child=serializers.ListField(child=serializers.IntegerField()))
+    # র‍্যান্ডম প্রশ্নপত্রের ক্ষেত্রে কুইজ আনার সময় পাওয়া seed ফেরত পাঠাতে হবে
+    seed = serializers.IntegerField(required=False, allow_null=True, min_value=0, max_value=MAX_SEED)
+
+    def validate_answers(self, value):
+        if not all(str(key).isdigit() for key in value):
+            raise serializers.ValidationError("প্রশ্নের আইডি অবশ্যই সংখ্যা হতে হবে।")
+        return normalize_answers(value)
+
+# --- স্পেসড রিপিটিশন রিভিউ ---
+class ReviewQuestionSerializer(QuestionSerializer):
+    class Meta(QuestionSerializer.Meta):
+        fields = QuestionSerializer.Meta.fields + ['quiz']
+
+class ReviewSubmissionSerializer(QuizSubmissionSerializer):
+    # কুইজ সাবমিশনের মতোই উত্তর, শুধু রিভিউতে প্রশ্নপত্রের seed নেই
+    seed = None
+
+class BulkEnrollSerializer(serializers.Serializer):
+    # {"user_ids": [..], "course_ids": [..]}; গ্রুপ এনরোলে দুটোই ঐচ্ছিক (না দিলে সব সদস্য/সব কোর্স)
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), max_length=settings.BULK_ENROLL_MAX_USERS
+    )
+    course_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), max_length=settings.BULK_ENROLL_MAX_COURSES
+    )
+
+class GroupEnrollSerializer(BulkEnrollSerializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), max_length=settings.BULK_ENROLL_MAX_USERS, required=False
+    )
+    course_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), max_length=settings.BULK_ENROLL_MAX_COURSES, required=False
+    )
+
+class BulkEnrollResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField(help_text="নতুন তৈরি এনরোলমেন্ট")
+    already_enrolled = serializers.IntegerField()
+    unknown_user_ids = serializers.ListField(child=serializers.IntegerField())
+    unknown_course_ids = serializers.ListField(child=serializers.IntegerField())
+    skipped_premium_course_ids = serializers.ListField(child=serializers.IntegerField())
 
 class DashboardCourseSerializer(serializers.ModelSerializer):
     class Meta:
@@ -332,6 +459,7 @@ class ProfileSerializer(serializers.Serializer):
     username = serializers.CharField()
     email = serializers.EmailField()
     total_points = serializers.IntegerField()
+    rank = serializers.IntegerField(allow_null=True, help_text="গ্লোবাল র‍্যাঙ্ক (কোনো পয়েন্ট না থাকলে null)")
 
 
 class GroupMemberUserSerializer(serializers.ModelSerializer):
@@ -357,7 +485,9 @@ class LearningGroupSerializer(serializers.ModelSerializer):
         read_only_fields = ['admin', 'member_count', 'courses_detail']
 
     def get_member_count(self, obj):
-        return obj.memberships.count()
+        # লিস্ট/ডিটেইলে কোয়েরিসেটের annotate থেকে, অন্য পথে (create/update) গ্রুপ সামারি ক্যাশ থেকে
+        count = getattr(obj, 'annotated_member_count', None)
+        return count if count is not None else get_group_summary(obj.id)['member_count']
         
     def create(self, validated_data):
         validated_data['admin'] = self.context['request'].user
@@ -378,6 +508,18 @@ class LeaderboardEntrySerializer(serializers.Serializer):
     total_score = serializers.IntegerField(help_text="গ্রুপে অন্তর্ভুক্ত কোর্স থেকে অর্জিত মোট পয়েন্ট")
 
 
+class RankingMeSerializer(serializers.Serializer):
+    rank = serializers.IntegerField(allow_null=True)
+    total_score = serializers.IntegerField()
+
+
+class RankingSerializer(serializers.Serializer):
+    total_users = serializers.IntegerField(help_text="বোর্ডে থাকা (০ এর বেশি পয়েন্টের) ইউজার")
+    top = LeaderboardEntrySerializer(many=True)
+    me = RankingMeSerializer()
+    around = LeaderboardEntrySerializer(many=True, help_text="আমার আগে-পরের ইউজাররা (আমিসহ)")
+
+
 class NoticeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notice
@@ -396,33 +538,23 @@ class HomeCourseSerializer(serializers.ModelSerializer):
     user_earned_points = serializers.SerializerMethodField()
     is_100_percent_completed = serializers.SerializerMethodField()
     first_unit_id = serializers.SerializerMethodField()
+    last_unit_id = serializers.SerializerMethodField()
+    last_lesson_id = serializers.SerializerMethodField()
+    last_quiz_id = serializers.SerializerMethodField()
+    next_lesson_id = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
-        fields = ['id', 'title', 'description', 'total_possible_points', 'user_earned_points', 'is_100_percent_completed', 'first_unit_id']
+        fields = [
+            'id', 'title', 'description', 'total_possible_points', 'user_earned_points', 'is_100_percent_completed',
+            'first_unit_id', 'last_unit_id', 'last_lesson_id', 'last_quiz_id', 'next_lesson_id',
+        ]
     
     def get_total_possible_points(self, course):
-        lesson_quiz_points = Question.objects.filter(
-            quiz__lesson__unit__course=course
-        ).aggregate(Sum('points'))['points__sum'] or 0
-        mastery_quiz_points = Question.objects.filter(
-            quiz__unit__course=course
-        ).aggregate(Sum('points'))['points__sum'] or 0
-        return lesson_quiz_points + mastery_quiz_points
+        return get_course_stats(course.id)['total_possible_points']
 
     def get_user_earned_points(self, course):
-        user = self.context['request'].user
-        if not user.is_authenticated:
-            return 0
-        earned_points = UserQuizAttempt.objects.filter(
-            user=user, 
-            quiz__lesson__unit__course=course
-        ).aggregate(Sum('score'))['score__sum'] or 0
-        earned_points += UserQuizAttempt.objects.filter(
-            user=user, 
-            quiz__unit__course=course
-        ).aggregate(Sum('score'))['score__sum'] or 0
-        return earned_points
+        return user_earned_points(self.context, course.id)
 
     def get_is_100_percent_completed(self, course):
         total_points = self.get_total_possible_points(course)
@@ -430,8 +562,20 @@ class HomeCourseSerializer(serializers.ModelSerializer):
         return total_points > 0 and earned_points >= total_points
     
     def get_first_unit_id(self, course):
-        first_unit = Unit.objects.filter(course=course).order_by('order').first()
-        return first_unit.id if first_unit else None
+        return get_course_stats(course.id)['first_unit_id']
+
+    # --- resume কার্সর (DashboardView এর কোয়েরিতে annotate করা থাকে) ---
+    def get_last_unit_id(self, course):
+        return getattr(course, 'resume_unit_id', None)
+
+    def get_last_lesson_id(self, course):
+        return getattr(course, 'resume_lesson_id', None)
+
+    def get_last_quiz_id(self, course):
+        return getattr(course, 'resume_quiz_id', None)
+
+    def get_next_lesson_id(self, course):
+        return getattr(course, 'resume_next_lesson_id', None)
 
 
 class DashboardSerializer(serializers.Serializer):
@@ -0,0 +1,106 @@
+# api/signals.py
+# কন্টেন্ট বা গ্রুপ বদলালে নির্ভরশীল ক্যাশগুলো রিফ্রেশ করার জব কিউতে দেওয়া হয়।
+# ভারী কাজ এখানে চলে না (শুধু ছোট রিড আর জব কিউ), যাতে অ্যাডমিনে সেভ করার সময় দেরি না হয়।
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.db.models import Q
+from django.db import transaction
+from django.dispatch import receiver
+
+from .cache import invalidate_group_summary
+from .completion import allocate_bit, backfill_moved, invalidate_content_index, reallocate_moved_bits
+from .grading import invalidate_answer_key
+from .jobs import enqueue
+from .realtime import publish_membership, publish_notice
+from .sampling import invalidate_question_index
+from .models import Unit, Lesson, Quiz, Question, Choice, MatchingGame, LearningGroup, GroupMembership, Notice
+
+
+@receiver([post_save, post_delete], sender=Unit)
+def unit_changed(sender, instance, **kwargs):
+    invalidate_content_index()
+    enqueue('refresh_content', {'course_id': instance.course_id, 'unit_id': instance.id})
+
+
+@receiver(post_save, sender=Unit)
+def unit_saved(sender, instance, created, **kwargs):
+    # অন্য কোর্সে সরানো হলে ভেতরের কুইজগুলো নতুন কোর্সের completion বিট পায়
+    if not created:
+        reallocate_moved_bits(Q(unit_id=instance.id) | Q(lesson__unit_id=instance.id))
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def lesson_changed(sender, instance, **kwargs):
+    invalidate_content_index()
+    enqueue('refresh_content', {'unit_id': instance.unit_id})
+
+
+@receiver(post_save, sender=Lesson)
+def lesson_saved(sender, instance, created, **kwargs):
+    if not created:
+        reallocate_moved_bits(Q(lesson_id=instance.id))
+
+
+@receiver(pre_save, sender=Quiz)
+def quiz_saving(sender, instance, **kwargs):
+    # নতুন কুইজ, বা অন্য কোর্সে সরানো কুইজ, তার কোর্সের পরের completion বিট পায়
+    instance._completion_moved = allocate_bit(instance)
+
+
+@receiver([post_save, post_delete], sender=Quiz)
+def quiz_changed(sender, instance, **kwargs):
+    invalidate_content_index()
+    if getattr(instance, '_completion_moved', False):
+        instance._completion_moved = False
+        backfill_moved(instance.completion_course_id, [instance.id])
+    invalidate_answer_key(instance.id)
+    invalidate_question_index(instance.id)
+    enqueue('refresh_content', {'unit_id': instance.unit_id, 'lesson_id': instance.lesson_id})
+
+
+@receiver([post_save, post_delete], sender=MatchingGame)
+def game_changed(sender, instance, **kwargs):
+    # গেম শুধু নেভিগেশন ইনডেক্সে আছে
+    enqueue('refresh_content', {'unit_id': instance.unit_id, 'lesson_id': instance.lesson_id})
+
+
+@receiver([post_save, post_delete], sender=Question)
+def question_changed(sender, instance, **kwargs):
+    # উত্তর-চাবি কমিটের সাথে সাথে মুছতে হবে, নইলে পুরনো চাবি দিয়ে গ্রেড হবে
+    invalidate_answer_key(instance.quiz_id)
+    invalidate_question_index(instance.quiz_id)
+    enqueue('refresh_content', {'quiz_id': instance.quiz_id})
+
+
+@receiver([post_save, post_delete], sender=Choice)
+def choice_changed(sender, instance, **kwargs):
+    quiz_id = Question.objects.filter(id=instance.question_id).values_list('quiz_id', flat=True).first()
+    invalidate_answer_key(quiz_id)
+
+
+# --- গ্রুপ ---
+
+@receiver([post_save, post_delete], sender=GroupMembership)
+def membership_changed(sender, instance, **kwargs):
+    enqueue('rebuild_group_leaderboard', {'group_id': instance.group_id})
+    invalidate_group_summary(instance.group_id)
+    # ইউজারের খোলা লাইভ কানেকশনগুলো গ্রুপ চ্যানেল আবার নির্ধারণ করে
+    transaction.on_commit(lambda: publish_membership(instance.user_id))
+
+
+@receiver(m2m_changed, sender=LearningGroup.courses.through)
+def group_courses_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear') and isinstance(instance, LearningGroup):
+        enqueue('rebuild_group_leaderboard', {'group_id': instance.id})
+        invalidate_group_summary(instance.id)
+    if action == 'post_add' and isinstance(instance, LearningGroup) and kwargs.get('pk_set'):
+        # নতুন যুক্ত কোর্সে গ্রুপের সবাইকে এনরোল (প্রিমিয়াম কোর্স বাদে)
+        enqueue('enroll_group', {'group_id': instance.id, 'course_ids': sorted(kwargs['pk_set'])})
+
+
+# --- নোটিশ ---
+
+
+@receiver(post_save, sender=Notice)
+def notice_saved(sender, instance, **kwargs):
+    # কমিটের পরে কানেক্টেড ক্লায়েন্টদের পুশ
+    transaction.on_commit(lambda: publish_notice(instance))
@@ -0,0 +1,94 @@
+# api/streaming.py
+# বড় লিস্ট রেসপন্স স্ট্রিম করে পাঠানো।
+# কোয়েরিসেট সার্ভার-সাইড কার্সরে চাংক করে পড়া হয়, প্রতিটি চাংক সাধারণ সিরিয়ালাইজার দিয়ে JSON করে
+# সাথে সাথে পাঠানো হয়, তাই মেমরি চাংকের আকারে সীমিত থাকে আর ক্লায়েন্ট প্রথম বাইট অনেক আগে পায়।
+# আউটপুট সাধারণ (নন-স্ট্রিমিং) JSONRenderer এর আউটপুটের সাথে হুবহু মেলে।
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from config.db_router import replicas_enabled, use_replicas
+
+STREAM_CHUNK_SIZE = 100
+
+
+def stream_json_array(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def encode(obj):
+        # JSONRenderer এর মতো U+2028/U+2029 এস্কেপ (জাভাস্ক্রিপ্ট স্ট্রিংয়ে এগুলো লাইন ব্রেক)
+        return encoder.encode(obj).replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+
+    # জেনারেটর ভিউ ফেরত যাওয়ার পরে চলে, তখন ReplicaReadMixin এর কনটেক্সট আর থাকে না;
+    # তাই ভিউয়ের সিদ্ধান্তটি এখানে ধরে রেখে প্রতিটি চাংকে আবার বসানো হয়
+    replicas = replicas_enabled()
+
+    def generate():
+        yield '['
+        rows = queryset.iterator(chunk_size=chunk_size)
+        separator = ''
+        while True:
+            with use_replicas(replicas):
+                chunk = list(islice(rows, chunk_size))
+                parts = [encode(serialize(obj)) for obj in chunk]
+            if not parts:
+                break
+            yield separator + ','.join(parts)
+            separator = ','
+        yield ']'
+
+    return generate()
+
+
+def streaming_json_response(request, queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    return streaming_response(request, stream_json_array(queryset, serialize, chunk_size), 'application/json')
+
+
+def iter_chunks(queryset, chunk_size=STREAM_CHUNK_SIZE):
+    """কোয়েরিসেটের সারিগুলো chunk_size আকারের লিস্টে, ভিউয়ের রেপ্লিকা সিদ্ধান্ত বজায় রেখে।"""
+    replicas = replicas_enabled()
+
+    def generate():
+        rows = queryset.iterator(chunk_size=chunk_size)
+        while True:
+            with use_replicas(replicas):
+                chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    return generate()
+
+
+def _close_in_thread(content):
+    content.close()
+    connections.close_all()
+
+
+async def _iterate_in_thread(content):
+    # ASGI তে Django সিঙ্ক জেনারেটর পুরোটা লিস্টে পড়ে তারপর পাঠায় (মেমরিতে পুরো রেসপন্স)।
+    # তাই জেনারেটরটি নিজস্ব একটি থ্রেডে চাংক-চাংক করে চালানো হয়: সার্ভার-সাইড কার্সর একই
+    # কানেকশনে থাকে আর ইভেন্ট লুপ বা sync ভিউয়ের থ্রেড আটকে থাকে না।
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        while True:
+            part = await loop.run_in_executor(executor, next, content, None)
+            if part is None:
+                return
+            yield part
+    finally:
+        await loop.run_in_executor(executor, _close_in_thread, content)
+        executor.shutdown(wait=False)
+
+
+def streaming_response(request, content, content_type):
+    """content (str/bytes এর জেনারেটর) স্ট্রিম করে; ASGI তে আলাদা থ্রেড থেকে async ভাবে।"""
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        content = _iterate_in_thread(content)
+    return StreamingHttpResponse(content, content_type=content_type)
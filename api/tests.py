@@ -1,3 +1,1035 @@
-from django.test import TestCase
+# api/tests.py
+# রাইট পাথগুলোর কনকারেন্সি টেস্ট: অনেক থ্রেড একসাথে একই join/leave/enrol/অ্যাটেম্পট চালায়, তারপর
+# ফলাফল আর স্টেটমেন্ট সংখ্যা যাচাই। থ্রেডেড টেস্টগুলো শুধু Postgres এ চলে (sqlite পুরো ফাইল লক করে)।
+# সাথে গ্রেডিং, স্যাম্পলিং, answer_log, SM-2, completion বিটম্যাপ আর এক্সপোর্টের অধিকারের আচরণ টেস্ট।
+#   python manage.py test api
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from importlib import import_module
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APIRequestFactory
+
+from config import db_router
+
+from . import answer_log, completion, exports, grading, leaderboards, memberships, partitions, ranking, reviews, sampling
+from .attempts import record_attempt, record_attempts
+from .batch import _sub_request
+from .cache import (
+    COURSE_OUTLINE_KEY, COURSE_STATS_KEY, UNIT_STATS_KEY, compute_course_outline, compute_course_stats,
+    compute_unit_stats, warmup_done_key,
+)
+from .fast_serializers import CategoryFast, CourseFast, UnitFast
+from .jobs import enqueue, work
+from .live_quiz import STARTING, Room
+from .models import (
+    Category, Choice, Course, GamePair, GroupMembership, Job, LearningGroup, Lesson, MatchingGame, Question, Quiz,
+    QuizAttemptSummary, ReviewItem, ScoreRollup, Unit, UserEnrollment, UserQuizAttempt,
+)
+from .navigation import COURSE_NAVIGATION_KEY, compute_course_navigation
+from .realtime import WEBSOCKET_PATH, Connection, get_hub, group_channel, websocket_app
+from .serializers import CategorySerializer, CourseSerializer, UnitSerializer
+
+THREADS = 16
+
+
+def hammer(func, calls):
+    """calls এর প্রতিটি (args tuple) আলাদা থ্রেডে, সব থ্রেড একসাথে ছাড়া হয়। ফলাফল calls এর ক্রমে।"""
+    barrier = threading.Barrier(len(calls))
+
+    def run(args):
+        try:
+            barrier.wait()
+            return func(*args)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        return list(pool.map(run, calls))
+
+
+def make_course(title='Course', is_premium=False):
+    category = Category.objects.create(name=f'{title} category')
+    course = Course.objects.create(category=category, title=title, description='', is_premium=is_premium)
+    unit = Unit.objects.create(course=course, title=f'{title} unit')
+    quiz = Quiz.objects.create(unit=unit, title=f'{title} quiz', quiz_type='UNIT')
+    return course, quiz
+
+
+def make_users(count, prefix='user'):
+    return [User.objects.create(username=f'{prefix}{index}') for index in range(count)]
+
+
+def statements(queries):
+    """CaptureQueriesContext থেকে BEGIN/COMMIT/SAVEPOINT বাদে আসল স্টেটমেন্টগুলো।"""
+    return [
+        query['sql'].strip() for query in queries
+        if not query['sql'].strip().upper().startswith(('BEGIN', 'COMMIT', 'SAVEPOINT', 'RELEASE', 'ROLLBACK'))
+    ]
+
+
+concurrent = skipUnless(connection.vendor == 'postgresql', 'থ্রেডেড টেস্টের জন্য Postgres লাগে')
+
+
+class MembershipWriteTests(TransactionTestCase):
+
+    def setUp(self):
+        self.admin, self.user = make_users(2)
+        self.group = LearningGroup.objects.create(title='Group', admin=self.admin)
+        GroupMembership.objects.create(group=self.group, user=self.admin, is_group_admin=True)
+        self.course, _ = make_course()
+
+    def test_join_is_one_membership_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(memberships.join_group(self.group.id, self.user.id), memberships.CREATED)
+        executed = statements(queries)
+        # মেম্বারশিপের INSERT + লিডারবোর্ড rebuild জব
+        self.assertEqual(len(executed), 2)
+        self.assertEqual(sum('api_groupmembership' in sql for sql in executed), 1)
+
+        # আগেই সদস্য: ব্যর্থ INSERT + গ্রুপ আছে কিনা
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(memberships.join_group(self.group.id, self.user.id), memberships.ALREADY_EXISTS)
+        self.assertEqual(len(statements(queries)), 2)
+
+    def test_leave_is_one_statement(self):
+        memberships.join_group(self.group.id, self.user.id)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(memberships.leave_group(self.group.id, self.user.id), memberships.LEFT)
+        executed = statements(queries)
+        # DELETE + লিডারবোর্ড rebuild জব
+        self.assertEqual(len(executed), 2)
+        self.assertTrue(executed[0].startswith('DELETE'))
+        self.assertFalse(GroupMembership.objects.filter(group=self.group, user=self.user).exists())
+
+    def test_enroll_is_one_statement(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(memberships.enroll_user(self.user.id, self.course.id), memberships.CREATED)
+        executed = statements(queries)
+        # এনরোলমেন্টের INSERT + আগের অ্যাটেম্পট backfill এর জব
+        self.assertEqual(len(executed), 2)
+        self.assertEqual(sum('api_userenrollment' in sql for sql in executed), 1)
+
+    def test_enroll_premium_is_forbidden(self):
+        premium, _ = make_course('Premium', is_premium=True)
+        self.assertEqual(memberships.enroll_user(self.user.id, premium.id), memberships.FORBIDDEN)
+        self.assertFalse(UserEnrollment.objects.filter(user=self.user).exists())
+
+    @concurrent
+    def test_concurrent_join_same_user(self):
+        results = hammer(memberships.join_group, [(self.group.id, self.user.id)] * THREADS)
+        self.assertEqual(results.count(memberships.CREATED), 1)
+        self.assertEqual(results.count(memberships.ALREADY_EXISTS), THREADS - 1)
+        self.assertEqual(GroupMembership.objects.filter(group=self.group, user=self.user).count(), 1)
+
+    @concurrent
+    def test_concurrent_join_many_users(self):
+        users = make_users(THREADS, prefix='member')
+        results = hammer(memberships.join_group, [(self.group.id, user.id) for user in users])
+        self.assertEqual(results, [memberships.CREATED] * THREADS)
+        self.assertEqual(GroupMembership.objects.filter(group=self.group).count(), THREADS + 1)
+
+    @concurrent
+    def test_concurrent_leave_same_user(self):
+        memberships.join_group(self.group.id, self.user.id)
+        results = hammer(memberships.leave_group, [(self.group.id, self.user.id)] * THREADS)
+        self.assertEqual(results.count(memberships.LEFT), 1)
+        self.assertEqual(results.count(memberships.NOT_MEMBER), THREADS - 1)
+        self.assertTrue(LearningGroup.objects.filter(id=self.group.id).exists())
+
+    @concurrent
+    def test_concurrent_join_and_leave(self):
+        # অর্ধেক যোগ দেয়, বাকি অর্ধেক (আগে থেকে সদস্য) ত্যাগ করে: শেষে ঠিক যোগ দেওয়ারাই থাকে
+        joiners = make_users(THREADS // 2, prefix='joiner')
+        leavers = make_users(THREADS // 2, prefix='leaver')
+        for user in leavers:
+            memberships.join_group(self.group.id, user.id)
+        calls = [(memberships.join_group, self.group.id, user.id) for user in joiners]
+        calls += [(memberships.leave_group, self.group.id, user.id) for user in leavers]
+        results = hammer(lambda func, *args: func(*args), calls)
+        self.assertEqual(results, [memberships.CREATED] * len(joiners) + [memberships.LEFT] * len(leavers))
+        self.assertEqual(
+            set(GroupMembership.objects.filter(group=self.group).values_list('user_id', flat=True)),
+            {self.admin.id} | {user.id for user in joiners},
+        )
+
+    def test_bulk_enroll_counts_only_inserted_rows(self):
+        users = make_users(3, prefix='bulk')
+        premium, _ = make_course('Premium', is_premium=True)
+        UserEnrollment.objects.create(user=users[0], course=self.course)
+
+        result = memberships.bulk_enroll([user.id for user in users] + [999999], [self.course.id, premium.id, 999999])
+        self.assertEqual((result['created'], result['already_enrolled']), (2, 1))
+        self.assertEqual(result['enrolled_user_ids'], [users[1].id, users[2].id])
+        self.assertEqual(
+            (result['unknown_user_ids'], result['unknown_course_ids'], result['skipped_premium_course_ids']),
+            ([999999], [999999], [premium.id]),
+        )
+        # ব্যাকফিল শুধু নতুন এনরোলমেন্টের
+        job = Job.objects.get(kind='backfill_enrollments')
+        self.assertEqual(job.payload, {'course_id': self.course.id, 'user_ids': [users[1].id, users[2].id]})
+
+    @concurrent
+    def test_concurrent_bulk_enroll_counts_each_pair_once(self):
+        users = make_users(20, prefix='bulk')
+        results = hammer(memberships.bulk_enroll, [([user.id for user in users], [self.course.id])] * 4)
+        self.assertEqual(sum(result['created'] for result in results), len(users))
+        self.assertEqual(sum(result['already_enrolled'] for result in results), len(users) * 3)
+        backfilled = [
+            user_id for payload in Job.objects.filter(kind='backfill_enrollments').values_list('payload', flat=True)
+            for user_id in payload['user_ids']
+        ]
+        self.assertEqual(sorted(backfilled), sorted(user.id for user in users))
+
+    @concurrent
+    def test_concurrent_enroll_same_user(self):
+        results = hammer(memberships.enroll_user, [(self.user.id, self.course.id)] * THREADS)
+        self.assertEqual(results.count(memberships.CREATED), 1)
+        self.assertEqual(results.count(memberships.ALREADY_EXISTS), THREADS - 1)
+        self.assertEqual(UserEnrollment.objects.filter(user=self.user, course=self.course).count(), 1)
+
+
+class AttemptWriteTests(TransactionTestCase):
+
+    def setUp(self):
+        self.course, self.quiz = make_course()
+        self.users = make_users(THREADS)
+
+    def _submit(self, user_id, score):
+        return record_attempt(User(id=user_id), self.quiz.id, score, 10)
+
+    def assertRollupMatchesSummaries(self):
+        # অল-টাইম বাকেট = latest_score এর যোগফল (ScoreRollup এর ইনভ্যারিয়েন্ট); সব অ্যাটেম্পট আজকের,
+        # তাই চলতি সপ্তাহ/মাসের বাকেটও একই
+        for user in self.users:
+            latest = sum(QuizAttemptSummary.objects.filter(user=user).values_list('latest_score', flat=True))
+            for period in leaderboards.WINDOWS:
+                rolled = sum(ScoreRollup.objects.filter(
+                    user=user, period=period, day=leaderboards.window_start(period),
+                ).values_list('score', flat=True))
+                self.assertEqual(rolled, latest, (user.username, period))
+
+    def test_rollup_periods(self):
+        user = self.users[0]
+        self._submit(user.id, 6)
+        # খারাপ রিটেক: সাপ্তাহিক বাকেট ঋণাত্মক নয়, সর্বশেষ স্কোর
+        self._submit(user.id, 2)
+        self.assertRollupMatchesSummaries()
+
+        # আগের অ্যাটেম্পটকে গত মাসে সরালে নতুন সপ্তাহ/মাসে একই স্কোরের রিটেক পুরো পয়েন্ট পায়
+        past = timezone.now() - timedelta(days=40)
+        QuizAttemptSummary.objects.filter(user=user).update(latest_at=past)
+        ScoreRollup.objects.exclude(period='all').update(day=timezone.localdate(past))
+        self._submit(user.id, 2)
+        self.assertEqual(leaderboards.compute_rollup_leaderboard('week')[0]['total_score'], 2)
+        self.assertEqual(leaderboards.compute_rollup_leaderboard('month')[0]['total_score'], 2)
+        # অল-টাইম: একটিই সারি, শুধু সর্বশেষ স্কোর
+        self.assertEqual(
+            list(ScoreRollup.objects.filter(user=user, period='all').values_list('score', 'attempts')), [(2, 3)],
+        )
+        self.assertEqual(
+            leaderboards.compute_rollup_leaderboard('all', course_ids=[self.course.id])[0]['total_score'], 2,
+        )
+
+    def test_attempt_statement_count(self):
+        user = self.users[0]
+        self._submit(user.id, 4)
+        with CaptureQueriesContext(connection) as queries:
+            self._submit(user.id, 7)
+        writes = [sql for sql in statements(queries) if sql.startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        # অ্যাটেম্পট INSERT, সামারি upsert, রোলআপ upsert (কোনো DELETE নয়)
+        self.assertEqual(sum('api_userquizattempt' in sql for sql in writes), 1)
+        self.assertEqual(sum('api_quizattemptsummary' in sql for sql in writes), 1)
+        self.assertEqual(sum('api_scorerollup' in sql for sql in writes), 1)
+        self.assertFalse(any(sql.startswith('DELETE') for sql in writes))
+
+    def test_batch_statements_do_not_grow_with_users(self):
+        # লাইভ কুইজ সেশন শেষে: অ্যাটেম্পট, রিভিউ আর কার্সর ইউজার সংখ্যা নির্বিশেষে একই সংখ্যক স্টেটমেন্টে
+        question = Question.objects.create(quiz=self.quiz, text='?')
+        for user in self.users:
+            UserEnrollment.objects.create(user=user, course=self.course)
+
+        def save(users):
+            rows = [{'user_id': user.id, 'score': 0, 'total_points': 1} for user in users]
+            results = [{'question': question.id, 'is_correct': False}]
+            with CaptureQueriesContext(connection) as queries:
+                record_attempts(self.quiz.id, rows)
+                reviews.apply_results_for_users({user.id: results for user in users}, course_id=self.course.id)
+            return len(statements(queries))
+
+        save(self.users[:1])
+        self.assertEqual(save(self.users[:2]), save(self.users))
+        self.assertEqual(ReviewItem.objects.filter(question=question).count(), THREADS)
+        self.assertEqual(UserEnrollment.objects.filter(course=self.course, last_quiz=self.quiz).count(), THREADS)
+
+    @concurrent
+    def test_concurrent_attempts_many_users(self):
+        hammer(self._submit, [(user.id, index % 11) for index, user in enumerate(self.users)])
+        self.assertEqual(UserQuizAttempt.objects.filter(quiz=self.quiz).count(), THREADS)
+        summaries = dict(QuizAttemptSummary.objects.filter(quiz=self.quiz).values_list('user_id', 'latest_score'))
+        self.assertEqual(summaries, {user.id: index % 11 for index, user in enumerate(self.users)})
+        self.assertRollupMatchesSummaries()
+
+    @concurrent
+    def test_concurrent_attempts_same_user(self):
+        user = self.users[0]
+        self._submit(user.id, 5)
+        scores = [index % 11 for index in range(THREADS)]
+        hammer(self._submit, [(user.id, score) for score in scores])
+        summary = QuizAttemptSummary.objects.get(user=user, quiz=self.quiz)
+        self.assertEqual(summary.attempt_count, THREADS + 1)
+        self.assertEqual(summary.best_score, 10)
+        self.assertEqual(UserQuizAttempt.objects.filter(user=user, quiz=self.quiz).count(), THREADS + 1)
+        self.assertRollupMatchesSummaries()
+
+    @concurrent
+    def test_concurrent_first_attempts_same_user(self):
+        # সামারি রো নেই, তাই লক করার কিছু নেই: তবুও আগের স্কোর দুবার শূন্য ধরা হয় না
+        user = self.users[0]
+        scores = [index % 11 for index in range(THREADS)]
+        hammer(self._submit, [(user.id, score) for score in scores])
+        summary = QuizAttemptSummary.objects.get(user=user, quiz=self.quiz)
+        self.assertEqual(summary.attempt_count, THREADS)
+        self.assertEqual((summary.best_score, summary.best_total_points), (10, 10))
+        self.assertRollupMatchesSummaries()
+
+
+class JobQueueTests(TestCase):
+
+    def test_purge_job_drops_old_jobs_and_reschedules(self):
+        old = timezone.now() - timedelta(days=40)
+        recent = timezone.now() - timedelta(days=2)
+        for status, finished_at in (('DONE', old), ('FAILED', old), ('DONE', recent), ('FAILED', recent)):
+            Job.objects.create(kind='refresh_content', status=status, finished_at=finished_at)
+        enqueue('purge_jobs')
+        work(once=True)
+
+        self.assertEqual(
+            sorted(Job.objects.filter(kind='refresh_content').values_list('status', flat=True)), ['DONE', 'FAILED'],
+        )
+        # পরের দিনের জন্য আবার কিউতে
+        self.assertTrue(Job.objects.filter(
+            kind='purge_jobs', status='PENDING', run_after__gt=timezone.now() + timedelta(hours=23),
+        ).exists())
+
+
+class ReviewQueueTests(TestCase):
+
+    def setUp(self):
+        self.course, self.quiz = make_course()
+        self.user, = make_users(1)
+        UserEnrollment.objects.create(user=self.user, course=self.course)
+
+    def add_due(self, count, choices=2):
+        now = timezone.now()
+        questions = []
+        for index in range(count):
+            question = Question.objects.create(quiz=self.quiz, text=f'প্রশ্ন {index}')
+            for choice in range(choices):
+                Choice.objects.create(question=question, text=f'চয়েস {choice}', is_correct=choice == 0)
+            ReviewItem.objects.create(
+                user=self.user, question=question, course=self.course, due_at=now - timedelta(hours=count - index),
+            )
+            questions.append(question)
+        return questions
+
+    def test_review_quiz_keeps_questions_without_choices(self):
+        questions = self.add_due(3)
+        bare, = self.add_due(1, choices=0)
+        with self.assertNumQueries(2):
+            built = reviews.build_review_quiz(self.user.id, limit=10)
+            choices = [[choice.text for choice in question.choices.all()] for question in built]
+        self.assertEqual([question.id for question in built], [question.id for question in questions] + [bare.id])
+        self.assertEqual(choices, [['চয়েস 0', 'চয়েস 1']] * 3 + [[]])
+
+    def test_review_quiz_limit_counts_questions(self):
+        questions = self.add_due(5)
+        # সবচেয়ে আগে due হওয়াগুলো, ঠিক limit টি
+        self.assertEqual(
+            [question.id for question in reviews.build_review_quiz(self.user.id, limit=3)],
+            [question.id for question in questions[:3]],
+        )
+
+
+class AttemptSummaryTests(TestCase):
+
+    def setUp(self):
+        self.course, self.quiz = make_course()
+        self.user, = make_users(1)
+
+    def summary(self):
+        return QuizAttemptSummary.objects.filter(user=self.user, quiz=self.quiz).values_list(
+            'latest_score', 'latest_total_points', 'best_score', 'best_total_points', 'attempt_count',
+        ).get()
+
+    def test_projection_tracks_latest_and_best(self):
+        for score, total in ((5, 10), (9, 12), (3, 10)):
+            record_attempt(self.user, self.quiz.id, score, total)
+        self.assertEqual(self.summary(), (3, 10, 9, 12, 3))
+
+    def test_migration_backfill_matches_projection(self):
+        for score, total in ((5, 10), (9, 12), (3, 10)):
+            record_attempt(self.user, self.quiz.id, score, total)
+        projected = self.summary()
+        QuizAttemptSummary.objects.all().delete()
+        migration = import_module('api.migrations.0014_partition_userquizattempt')
+        migration.backfill_summaries(django_apps, None)
+        self.assertEqual(self.summary(), projected)
+
+
+
+class GradingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        _, self.quiz = make_course()
+        self.single = Question.objects.create(quiz=self.quiz, text='এক', points=2, explanation='কারণ')
+        self.single_correct = Choice.objects.create(question=self.single, text='ক', is_correct=True)
+        self.single_wrong = Choice.objects.create(question=self.single, text='খ')
+        self.multi = Question.objects.create(quiz=self.quiz, text='একাধিক', points=3)
+        self.multi_correct = [
+            Choice.objects.create(question=self.multi, text=text, is_correct=True) for text in ('গ', 'ঘ')
+        ]
+
+    def test_only_exact_choice_sets_score(self):
+        answers = grading.normalize_answers({
+            str(self.single.id): self.single_correct.id,
+            str(self.multi.id): [self.multi_correct[0].id],
+        })
+        score, total, results = grading.grade(grading.get_answer_key(self.quiz.id), answers)
+        self.assertEqual((score, total), (2, 5))
+        self.assertEqual([result['is_correct'] for result in results], [True, False])
+        self.assertEqual(results[0]['explanation'], 'কারণ')
+        self.assertEqual(results[1]['correct_choices'], sorted(choice.id for choice in self.multi_correct))
+
+        # সব সঠিক চয়েসের সাথে একটি বাড়তি (ভুল) চয়েস বাছলেও ভুল
+        answers = grading.normalize_answers({
+            str(self.single.id): [self.single_correct.id, self.single_wrong.id],
+            str(self.multi.id): [choice.id for choice in self.multi_correct],
+        })
+        score, _, results = grading.grade(grading.get_answer_key(self.quiz.id), answers)
+        self.assertEqual(score, 3)
+        self.assertEqual([result['is_correct'] for result in results], [False, True])
+
+    def test_subset_and_unanswered(self):
+        answer_key = grading.get_answer_key(self.quiz.id)
+        score, total, results = grading.grade(answer_key, grading.normalize_answers({}), [self.multi.id])
+        self.assertEqual((score, total), (0, 3))
+        self.assertEqual(results[0]['selected_choices'], [])
+        self.assertEqual(grading.normalize_answers({'5': None}), {5: frozenset()})
+
+
+class SamplingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        sampling._indexes.clear()
+        _, self.quiz = make_course()
+        self.questions = {
+            points: [
+                Question.objects.create(quiz=self.quiz, text=f'{points}-{index}', points=points) for index in range(count)
+            ]
+            for points, count in ((1, 6), (2, 4))
+        }
+
+    def test_same_seed_draws_same_paper(self):
+        paper = sampling.draw_paper(self.quiz.id, 5, 1234)
+        self.assertEqual(len(set(paper)), 5)
+        self.assertEqual(sampling.draw_paper(self.quiz.id, 5, 1234), paper)
+        # অন্য প্রসেসের মতো ইনডেক্স নতুন করে বানালেও একই প্রশ্নপত্র
+        sampling._indexes.clear()
+        cache.clear()
+        self.assertEqual(sampling.draw_paper(self.quiz.id, 5, 1234), paper)
+        self.assertNotEqual(sampling.draw_paper(self.quiz.id, 5, 4321), paper)
+
+    def test_paper_keeps_point_proportions(self):
+        by_points = {question.id: points for points, questions in self.questions.items() for question in questions}
+        for seed in range(20):
+            drawn = [by_points[question_id] for question_id in sampling.draw_paper(self.quiz.id, 5, seed)]
+            self.assertEqual((drawn.count(1), drawn.count(2)), (3, 2))
+        self.assertEqual(len(sampling.draw_paper(self.quiz.id, 50, 1)), 10)
+
+    def test_choice_order_depends_only_on_seed_and_question(self):
+        choices = list(range(6))
+        self.assertEqual(sampling.shuffle_choices(choices, 7, 1), sampling.shuffle_choices(choices, 7, 1))
+        self.assertEqual(sorted(sampling.shuffle_choices(choices, 7, 1)), choices)
+        self.assertEqual(sampling.parse_seed(str(sampling.MAX_SEED)), sampling.MAX_SEED)
+        self.assertIsNone(sampling.parse_seed(str(sampling.MAX_SEED + 1)))
+        self.assertIsNone(sampling.parse_seed('-1'))
+
+
+class AnswerLogTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        question_ids = list(range(101, 110))
+        choice_ids = [7, 0, 9, 11, 0, 13, 14, 15, 16]
+        correct = [True, False, True, False, False, True, False, False, True]
+        blob = answer_log.encode(question_ids, choice_ids, correct)
+        # হেডার 5 byte + দুটি uint32 আইডির তালিকা + 2 byte বিটসেট
+        self.assertEqual(len(blob), 5 + 8 * 9 + 2)
+        self.assertEqual(answer_log.decode(blob), (question_ids, choice_ids, correct))
+
+    def test_large_ids_use_int64(self):
+        question_ids = [1, 2 ** 40]
+        blob = answer_log.encode(question_ids, [2 ** 33, 0], [False, True])
+        self.assertEqual(blob[0], answer_log.VERSION_INT64)
+        self.assertEqual(answer_log.decode(memoryview(blob)), (question_ids, [2 ** 33, 0], [False, True]))
+        self.assertEqual(answer_log.decode(answer_log.encode([], [], [])), ([], [], []))
+
+    def test_encode_results_keeps_smallest_choice(self):
+        blob = answer_log.encode_results([
+            {'question': 1, 'selected_choices': [4, 9], 'is_correct': True},
+            {'question': 2, 'selected_choices': [], 'is_correct': False},
+        ])
+        self.assertEqual(answer_log.decode(blob), ([1, 2], [4, 0], [True, False]))
+
+
+class Sm2Tests(SimpleTestCase):
+
+    def test_correct_answers_grow_interval(self):
+        now = timezone.now()
+        item = ReviewItem()
+        intervals = [reviews.sm2(item, reviews.QUALITY_CORRECT, now).interval_days for _ in range(4)]
+        # quality 4 এ ease 2.5 ই থাকে: 1, 6, তারপর আগের ব্যবধান × ease
+        self.assertEqual(intervals, [1, 6, 15, 38])
+        self.assertEqual((item.repetitions, item.lapses, item.ease_factor), (4, 0, 2.5))
+        self.assertEqual(item.due_at, now + timedelta(days=38))
+        self.assertEqual(item.last_reviewed_at, now)
+
+    def test_wrong_answer_resets_and_ease_has_floor(self):
+        now = timezone.now()
+        item = ReviewItem(repetitions=3, interval_days=15)
+        reviews.sm2(item, reviews.QUALITY_WRONG, now)
+        self.assertEqual((item.repetitions, item.interval_days, item.lapses), (0, 0, 1))
+        self.assertEqual(item.due_at, now)
+        self.assertAlmostEqual(item.ease_factor, 1.96)
+        for _ in range(5):
+            reviews.sm2(item, reviews.QUALITY_WRONG, now)
+        self.assertEqual((item.ease_factor, item.lapses), (reviews.MIN_EASE, 6))
+        self.assertEqual(reviews.sm2(item, reviews.QUALITY_CORRECT, now).interval_days, 1)
+
+
+class CompletionBitmapTests(TestCase):
+
+    def test_bit_operations(self):
+        bitmap = completion.set_bit(b'', 9)
+        self.assertEqual(bitmap, b'\x00\x02')
+        bitmap = completion.set_bit(bitmap, 0)
+        self.assertEqual(bitmap, b'\x01\x02')
+        self.assertEqual([bit for bit in range(24) if completion.test_bit(bitmap, bit)], [0, 9])
+
+    def test_attempts_set_quiz_bits(self):
+        cache.clear()
+        course, first = make_course()
+        second = Quiz.objects.create(unit=first.unit, title='দ্বিতীয়', quiz_type='UNIT')
+        self.assertEqual(
+            (first.completion_bit, second.completion_bit, second.completion_course_id), (0, 1, course.id),
+        )
+        user, = make_users(1)
+        UserEnrollment.objects.create(user=user, course=course)
+        record_attempt(user, second.id, 1, 1)
+
+        bitmap = bytes(UserEnrollment.objects.get(user=user, course=course).completion)
+        self.assertEqual(completion.attempted_quiz_ids(bitmap, [first.id, second.id]), {second.id})
+        self.assertEqual(completion.mark_attempted(bitmap, first.id), b'\x03')
+
+
+class ExportScopeTests(TestCase):
+
+    def setUp(self):
+        self.staff, self.owner, self.helper, self.member, self.outsider = make_users(5)
+        self.staff.is_staff = True
+        self.staff.save()
+        self.course, self.quiz = make_course()
+        self.group = LearningGroup.objects.create(title='Export', admin=self.owner)
+        GroupMembership.objects.create(group=self.group, user=self.owner, is_group_admin=True)
+        GroupMembership.objects.create(group=self.group, user=self.helper, is_group_admin=True)
+        GroupMembership.objects.create(group=self.group, user=self.member)
+        self.other = LearningGroup.objects.create(title='Other', admin=self.outsider)
+        GroupMembership.objects.create(group=self.other, user=self.outsider, is_group_admin=True)
+        # একাধিক গ্রুপে থাকা সদস্যের সারি একবারই আসতে হবে
+        GroupMembership.objects.create(group=self.other, user=self.member)
+        for user in (self.owner, self.helper, self.member, self.outsider):
+            record_attempt(user, self.quiz.id, 1, 1)
+
+    def usernames(self, user, filters=None):
+        queryset = exports.build_queryset('attempts', user, filters or {})
+        return None if queryset is None else sorted(queryset.values_list('user__username', flat=True))
+
+    def test_group_admins_see_only_their_members(self):
+        members = sorted(user.username for user in (self.owner, self.helper, self.member))
+        self.assertEqual(self.usernames(self.owner), members)
+        self.assertEqual(self.usernames(self.helper, {'group': self.group.id}), members)
+        self.assertEqual(self.usernames(self.outsider), sorted([self.member.username, self.outsider.username]))
+        self.assertEqual(len(self.usernames(self.staff)), 4)
+
+    def test_other_groups_and_plain_members_are_refused(self):
+        self.assertIsNone(self.usernames(self.owner, {'group': self.other.id}))
+        self.assertIsNone(self.usernames(self.member))
+        client = APIClient()
+        client.force_authenticate(self.member)
+        self.assertEqual(client.get('/api/exports/attempts.csv').status_code, 403)
+        client.force_authenticate(self.owner)
+        response = client.get(f'/api/exports/attempts.csv?group={self.other.id}')
+        self.assertEqual(response.status_code, 403)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'পার্টিশন শুধু PostgreSQL-এ')
+class PartitionTests(TestCase):
+
+    def test_default_rows_move_into_new_partition(self):
+        _, quiz = make_course()
+        user, = make_users(1)
+        # কোনো মাসিক পার্টিশন নেই এমন মাসের অ্যাটেম্পট DEFAULT পার্টিশনে যায়
+        later = datetime(2041, 3, 9, tzinfo=dt_timezone.utc)
+        attempt = UserQuizAttempt.objects.create(user=user, quiz=quiz, score=1, total_points=1)
+        UserQuizAttempt.objects.filter(pk=attempt.pk).update(timestamp=later)
+
+        with connection.cursor() as cursor:
+            name = partitions.create_month_partition(cursor, date(2041, 3, 1))
+            # DEFAULT খালি থাকলে সরাসরি PARTITION OF
+            partitions.create_month_partition(cursor, date(2041, 4, 1))
+            cursor.execute(f'SELECT COUNT(*) FROM {partitions.DEFAULT_PARTITION}')
+            self.assertEqual(cursor.fetchone()[0], 0)
+            cursor.execute(f'SELECT id FROM {name}')
+            self.assertEqual(cursor.fetchall(), [(attempt.id,)])
+            self.assertLessEqual(
+                {name, partitions.partition_name(date(2041, 4, 1))}, set(partitions.list_partitions(cursor)),
+            )
+        self.assertTrue(UserQuizAttempt.objects.filter(pk=attempt.pk, timestamp=later).exists())
+
+
+class BatchTests(TransactionTestCase):
+    # রিড-অনলি ভিউগুলো রেপ্লিকা কনফিগার থাকলে সেখান থেকে পড়ে
+    databases = '__all__'
+
+    def setUp(self):
+        self.user, = make_users(1)
+
+    def test_sub_request_drops_body_headers(self):
+        request = RequestFactory().post(
+            '/api/batch/', data='{"requests": []}', content_type='application/json', HTTP_ACCEPT_LANGUAGE='bn',
+        )
+        request.user, request.auth = self.user, None
+        sub = _sub_request(request, '/api/courses/?search=x', {})
+        self.assertEqual(sub.method, 'GET')
+        self.assertEqual(sub.META['QUERY_STRING'], 'search=x')
+        self.assertEqual(sub.META['HTTP_ACCEPT_LANGUAGE'], 'bn')
+        for key in ('CONTENT_LENGTH', 'CONTENT_TYPE', 'wsgi.input'):
+            self.assertNotIn(key, sub.META)
+
+    def test_batches_async_views(self):
+        # /api/async/* ভিউগুলো কোরুটিন ফেরত দেয়; ব্যাচে সেগুলো sync রুটের সমান বডি দেয়
+        course, _ = make_course()
+        UserEnrollment.objects.create(user=self.user, course=course)
+        group = LearningGroup.objects.create(title='Group', admin=self.user)
+        group.courses.add(course)
+        GroupMembership.objects.create(group=group, user=self.user, is_group_admin=True)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        pairs = [
+            ('/api/dashboard/', '/api/async/dashboard/'),
+            ('/api/profile/', '/api/async/profile/'),
+            (f'/api/groups/{group.id}/', f'/api/async/groups/{group.id}/'),
+            (f'/api/groups/{group.id}/leaderboard/', f'/api/async/groups/{group.id}/leaderboard/'),
+        ]
+        for concurrent in (False, True):
+            response = client.post('/api/batch/', {
+                'requests': [{'id': index, 'path': path} for index, pair in enumerate(pairs) for path in pair],
+                'concurrent': concurrent,
+            }, format='json')
+            self.assertEqual(response.status_code, 200)
+            results = response.json()['responses']
+            for index, (sync_path, async_path) in enumerate(pairs):
+                sync_result, async_result = results[2 * index], results[2 * index + 1]
+                self.assertEqual(async_result['status'], 200, async_path)
+                self.assertEqual(async_result['body'], sync_result['body'], async_path)
+
+
+class StreamingTests(TransactionTestCase):
+    # রিড-অনলি ভিউগুলো রেপ্লিকা কনফিগার থাকলে সেখান থেকে পড়ে
+    databases = '__all__'
+
+    def test_stream_matches_json_renderer(self):
+        course, _ = make_course('Line separator paragraph')
+        course.description = 'বাংলা   টেক্সট'
+        course.save()
+        make_course('Second')
+        client = APIClient()
+        client.force_authenticate(make_users(1)[0])
+        for path in ('/api/courses/', '/api/categories/'):
+            with self.settings(FAST_SERIALIZERS=False):
+                expected = client.get(path).content
+            response = client.get(path, {'stream': '1'})
+            self.assertTrue(response.streaming)
+            self.assertEqual(b''.join(response.streaming_content), expected, path)
+            self.assertNotIn(' '.encode(), expected)
+
+
+class LiveQuizRoomTests(TransactionTestCase):
+
+    def setUp(self):
+        self.admin, self.user = make_users(2)
+        course, self.quiz = make_course()
+        self.group = LearningGroup.objects.create(title='Live', admin=self.admin)
+        self.group.courses.add(course)
+        self.question = Question.objects.create(quiz=self.quiz, text='?', points=3)
+        self.correct = Choice.objects.create(question=self.question, text='হ্যাঁ', is_correct=True)
+        Choice.objects.create(question=self.question, text='না')
+
+    def test_second_start_is_rejected_while_loading(self):
+        async def scenario():
+            room = Room(self.group.id)
+            first = room.start(self.quiz.id)
+            second = room.start(self.quiz.id)
+            results = await asyncio.gather(first, second)
+            timer = room._timer
+            room._reset()
+            return results, timer
+
+        (first, second), timer = asyncio.run(scenario())
+        self.assertIsNone(first)
+        self.assertEqual(second, 'একটি সেশন ইতিমধ্যে চলছে।')
+        # _reset আগের সেশনের টাইমার বাতিল করে
+        self.assertTrue(timer.cancelled())
+
+    def test_restart_during_save_keeps_answers(self):
+        async def scenario():
+            room = Room(self.group.id)
+            participant = room.connect(Connection(), self.user)
+            self.assertIsNone(await room.start(self.quiz.id))
+            self.assertIsNone(room.answer(participant, self.question.id, [self.correct.id]))
+            finished = asyncio.ensure_future(room.finish())
+            await asyncio.sleep(0)
+            # finish এর সেভ চলাকালীন নতুন সেশন
+            restarted = asyncio.ensure_future(room.start(self.quiz.id))
+            await asyncio.sleep(0)
+            self.assertEqual(room.state, STARTING)
+            results = await asyncio.gather(finished, restarted)
+            room._reset()
+            return results
+
+        self.assertEqual(asyncio.run(scenario()), [None, None])
+        attempt = UserQuizAttempt.objects.get(user=self.user, quiz=self.quiz)
+        self.assertEqual((attempt.score, attempt.total_points), (3, 3))
+
+    def test_overflow_sends_room_state_instead_of_resync(self):
+        async def scenario():
+            room = Room(self.group.id)
+            connection = Connection(resync=lambda: room.snapshot(participant))
+            participant = room.connect(connection, self.user)
+            self.assertIsNone(await room.start(self.quiz.id))
+            for _ in range(5):
+                room.broadcast({'type': 'noise'})
+            # উপচে পড়ার পরের ফলাফলও পাঠানোর সময়ের অবস্থায় থাকে
+            self.assertIsNone(await room.advance())
+            message = json.loads(await connection.next_message())
+            room._reset()
+            return message
+
+        with self.settings(REALTIME_QUEUE_SIZE=3):
+            message = asyncio.run(scenario())
+        self.assertEqual((message['type'], message['state'], message['index']), ('hello', 'reveal', 0))
+        self.assertEqual(message['standings'], [{'rank': 1, 'username': self.user.username, 'score': 0}])
+
+
+
+class LiveChannelTests(TransactionTestCase):
+
+    def setUp(self):
+        self.admin, self.user = make_users(2)
+        self.group = LearningGroup.objects.create(title='Live', admin=self.admin)
+        GroupMembership.objects.create(group=self.group, user=self.admin, is_group_admin=True)
+        self.token = Token.objects.create(user=self.user)
+
+    def test_membership_change_updates_channels(self):
+        async def scenario():
+            incoming, sent = asyncio.Queue(), asyncio.Queue()
+            scope = {
+                'type': 'websocket', 'path': WEBSOCKET_PATH, 'headers': [],
+                'query_string': f'token={self.token.key}'.encode(),
+            }
+            await incoming.put({'type': 'websocket.connect'})
+            app = asyncio.create_task(websocket_app(scope, incoming.get, sent.put))
+
+            async def next_hello():
+                while True:
+                    message = await asyncio.wait_for(sent.get(), 5)
+                    if message['type'] == 'websocket.send' and json.loads(message['text'])['type'] == 'hello':
+                        return json.loads(message['text'])['groups']
+
+            hellos = [await next_hello()]
+            await asyncio.to_thread(memberships.join_group, self.group.id, self.user.id)
+            hellos.append(await next_hello())
+            joined = bool(get_hub()._connections.get(group_channel(self.group.id)))
+            await asyncio.to_thread(memberships.leave_group, self.group.id, self.user.id)
+            hellos.append(await next_hello())
+            left = group_channel(self.group.id) not in get_hub()._connections
+            await incoming.put({'type': 'websocket.disconnect'})
+            await app
+            return hellos, joined, left
+
+        hellos, joined, left = asyncio.run(scenario())
+        self.assertEqual(hellos, [[], [self.group.id], []])
+        self.assertTrue(joined)
+        # গ্রুপ ছাড়ার পরে ঐ গ্রুপের আপডেট আর এই কানেকশনে আসে না
+        self.assertTrue(left)
+        self.assertEqual(get_hub()._connections, {})
+
+
+class RankingLoadTests(TransactionTestCase):
+
+    def setUp(self):
+        self.course, self.quiz = make_course()
+        self.users = make_users(3)
+        self.addCleanup(self.forget_boards)
+        self.forget_boards()
+
+    def forget_boards(self):
+        # নতুন প্রসেসের মতো: মেমোরিতে কোনো বোর্ড নেই
+        ranking._boards, ranking._watermark, ranking._refreshed_at = None, 0, float('-inf')
+        ranking._versions.clear()
+
+    def test_request_never_rebuilds_from_attempts(self):
+        for user, score in zip(self.users, (3, 9)):
+            record_attempt(user, self.quiz.id, score, 10)
+        self.forget_boards()
+
+        # স্ন্যাপশট নেই: রিকোয়েস্টে অ্যাটেম্পট স্ক্যান নয়, rebuild জব কিউ হয়
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(ranking.my_rank(self.users[0].id)['rank'], None)
+        self.assertFalse(any('api_userquizattempt' in sql for sql in statements(queries)))
+        self.assertTrue(Job.objects.filter(kind='rebuild_rankings', status='PENDING').exists())
+
+        work(once=True)
+        self.forget_boards()
+        # স্ন্যাপশট থেকে লোড, তারপর স্ন্যাপশটের পরের অ্যাটেম্পট catch-up এ আসে
+        record_attempt(self.users[2], self.quiz.id, 5, 10)
+        self.assertEqual(ranking.my_rank(self.users[0].id), {'rank': 3, 'total_score': 3, 'total_users': 3})
+        self.assertEqual(ranking.my_rank(self.users[2].id)['rank'], 2)
+
+    def test_refresh_is_idempotent(self):
+        ranking.rebuild()
+        record_attempt(self.users[0], self.quiz.id, 4, 10)
+        # একই অ্যাটেম্পট catch-up আর কমিট-পরের রিফ্রেশ দুবার পড়লেও একবারই গোনা হয়
+        ranking._catch_up(wait=True)
+        ranking.refresh_users([self.users[0].id])
+        self.assertEqual(ranking.my_rank(self.users[0].id)['total_score'], 4)
+
+        # পুরনো পড়া (ছোট version) পরে বসালে বাদ পড়ে
+        stale = ranking._totals_from_rollups([self.users[0].id])
+        record_attempt(self.users[0], self.quiz.id, 7, 10)
+        with ranking._lock:
+            ranking._apply_totals(ranking._boards, *stale)
+        self.assertEqual(ranking.my_rank(self.users[0].id)['total_score'], 7)
+
+    def test_board_ranks_ties_and_slices(self):
+        board = ranking.Board.from_scores({5: 10, 3: 10, 9: 7, 1: 0})
+        board.set(2, 12)
+        board.set(9, 10)
+        board.set(4, 1)
+        board.set(4, 0)
+        self.assertEqual(board.slice(1, 10), [(2, 12, 1), (3, 10, 2), (5, 10, 2), (9, 10, 2)])
+        self.assertEqual(board.slice(3, 4), [(5, 10, 2), (9, 10, 2)])
+        self.assertEqual((board.rank(9), board.position(9), board.rank(4)), (2, 4, None))
+        self.assertEqual(board.at(2), (3, 10, 2))
+
+
+class FastSerializerConformanceTests(TransactionTestCase):
+    # api/fast_serializers.py এর রেন্ডার করা JSON আগের ModelSerializer এর সাথে বাইট-বাই-বাইট মেলে কিনা
+    SEED = '12345'
+
+    def setUp(self):
+        # আগের টেস্টের টেবিল খালি করায় সিগন্যাল চলেনি, তাই আউটলাইন/কনটেন্ট ইনডেক্স ক্যাশ পুরোনো আইডির হতে পারে
+        cache.clear()
+        self.user, self.other = make_users(2)
+        category = Category.objects.create(name='ভাষা')
+        self.course = Course.objects.create(category=category, title='বাংলা', description='লাইন\u2028ভাঙা')
+        Course.objects.create(category=category, title='Premium', description='', is_premium=True)
+        unit = Unit.objects.create(course=self.course, title='ইউনিট ১')
+        Unit.objects.create(course=self.course, title='খালি ইউনিট', order=2)
+
+        video = Lesson.objects.create(unit=unit, title='ভিডিও', youtube_video_id='abc')
+        article = Lesson.objects.create(unit=unit, title='লেখা', order=2, article_body='<p>পাঠ</p>')
+        game = MatchingGame.objects.create(lesson=article, title='মেলাও')
+        GamePair.objects.create(game=game, item_one='এক', item_two='one')
+        MatchingGame.objects.create(unit=unit, title='ইউনিট গেম', game_type='UNIT')
+
+        lesson_quiz = Quiz.objects.create(lesson=video, title='লেসন কুইজ')
+        self.add_questions(lesson_quiz, 2)
+        # র‍্যান্ডম প্রশ্নপত্র (sample_size) আর শুধু চয়েস শাফল
+        mastery = Quiz.objects.create(unit=unit, title='মাস্টারি', quiz_type='UNIT', sample_size=3, shuffle_choices=True)
+        self.add_questions(mastery, 5)
+        shuffled = Quiz.objects.create(lesson=article, title='শাফল', shuffle_choices=True)
+        self.add_questions(shuffled, 2)
+
+        UserEnrollment.objects.create(user=self.user, course=self.course)
+        record_attempt(self.user, lesson_quiz.id, 1, 2)
+        record_attempt(self.user, mastery.id, 2, 3)
+
+    def add_questions(self, quiz, count):
+        for index in range(count):
+            question = Question.objects.create(
+                quiz=quiz, text=f'{quiz.title} প্রশ্ন {index}', points=index + 1, explanation=f'উত্তর: চয়েস {index % 3}',
+            )
+            for choice in range(3):
+                Choice.objects.create(question=question, text=f'চয়েস {choice}', is_correct=choice == index % 3)
+
+    def cases(self):
+        cases = [(
+            '/api/categories/',
+            lambda context: CategorySerializer(Category.objects.order_by('id'), many=True, context=context).data,
+            lambda context: CategoryFast(context).many(Category.objects.order_by('id')),
+        ), (
+            '/api/courses/',
+            lambda context: CourseSerializer(Course.objects.order_by('id'), many=True, context=context).data,
+            lambda context: CourseFast(context).many(Course.objects.order_by('id')),
+        )]
+        for course_id in Course.objects.order_by('id').values_list('id', flat=True):
+            cases.append((
+                f'/api/courses/{course_id}/',
+                lambda context, pk=course_id: CourseSerializer(Course.objects.get(pk=pk), context=context).data,
+                lambda context, pk=course_id: CourseFast(context).many(Course.objects.filter(pk=pk))[0],
+            ))
+        for unit_id in Unit.objects.order_by('id').values_list('id', flat=True):
+            cases.append((
+                f'/api/units/{unit_id}/',
+                lambda context, pk=unit_id: UnitSerializer(Unit.objects.get(pk=pk), context=context).data,
+                lambda context, pk=unit_id: UnitFast(context).many(Unit.objects.filter(pk=pk))[0],
+            ))
+        return cases
+
+    def context(self, user):
+        request = Request(APIRequestFactory().get('/', {'seed': self.SEED}))
+        request.user = user
+        return {'request': request}
+
+    def assertConforms(self):
+        renderer = JSONRenderer()
+        for user in (self.user, self.other, AnonymousUser()):
+            for path, slow, fast in self.cases():
+                with self.subTest(path=path, user=str(user)):
+                    expected = renderer.render(slow(self.context(user)))
+                    self.assertEqual(renderer.render(fast(self.context(user))), expected)
+
+    def test_matches_model_serializers(self):
+        self.assertConforms()
+
+    def test_matches_model_serializers_without_answers(self):
+        with self.settings(QUIZ_EXPOSE_ANSWERS=False):
+            self.assertConforms()
+            # সঠিক চয়েস বা ব্যাখ্যা কোনো পথেই ফাঁস হয় না
+            for path, slow, fast in self.cases():
+                for serialize in (slow, fast):
+                    rendered = JSONRenderer().render(serialize(self.context(self.user)))
+                    self.assertNotIn(b'is_correct', rendered, path)
+                    self.assertNotIn(b'explanation', rendered, path)
+
+
+class WarmCacheTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        for title in ('প্রথম', 'দ্বিতীয়'):
+            course, _ = make_course(title)
+            Unit.objects.create(course=course, title=f'{title} ২', order=2)
+        make_course('খালি')[0].units.all().delete()
+
+    def test_readiness_follows_warm_up_of_this_build(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/health/ready/').status_code, 503)
+        # পুরোনো রিলিজের ইনস্ট্যান্সগুলোর ফ্ল্যাগ
+        cache.set(warmup_done_key('old-build'), {'keys': 1}, None)
+
+        with self.settings(BUILD_ID='new-build'):
+            self.assertEqual(client.get('/api/health/ready/').status_code, 503)
+            call_command('warm_cache', workers=2, stdout=StringIO())
+            response = client.get('/api/health/ready/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['warmup']['courses'], Course.objects.count())
+        self.assertEqual(cache.get(warmup_done_key('old-build')), {'keys': 1})
+
+        for course_id in Course.objects.values_list('id', flat=True):
+            self.assertEqual(cache.get(COURSE_STATS_KEY.format(course_id)), compute_course_stats(course_id))
+            self.assertEqual(cache.get(COURSE_OUTLINE_KEY.format(course_id)), compute_course_outline(course_id))
+            self.assertEqual(
+                cache.get(COURSE_NAVIGATION_KEY.format(course_id)), compute_course_navigation(course_id)
+            )
+        for unit_id in Unit.objects.values_list('id', flat=True):
+            self.assertEqual(cache.get(UNIT_STATS_KEY.format(unit_id)), compute_unit_stats(unit_id))
+
+
+@skipUnless(
+    'replica_1' in settings.DATABASES and connection.vendor == 'postgresql',
+    'Postgres আর DATABASE_REPLICAS এ একটি রেপ্লিকা লাগে, যেমন DATABASE_REPLICAS="localhost/easy_learning_replica"',
+)
+class ReplicaRoutingTests(TestCase):
+    # replica_1 টেস্টে default এর MIRROR কিন্তু আলাদা কানেকশন: টেস্টের (কমিট না হওয়া) লেখা রেপ্লিকায় দেখা যায় না,
+    # অর্থাৎ পিছিয়ে থাকা রেপ্লিকার মতো। রেপ্লিকা কনফিগার না থাকলে শুধু default (টেস্ট skip হয়)
+    databases = {'default'} | ({'replica_1'} & set(settings.DATABASES))
+
+    def setUp(self):
+        cache.clear()
+        db_router._health.clear()
+        self.course, _ = make_course()
+
+    def test_reads_follow_replica_health(self):
+        self.assertEqual(Course.objects.all().db, 'default')
+        with db_router.use_replicas():
+            self.assertEqual(Course.objects.all().db, 'replica_1')
+            self.assertFalse(Course.objects.filter(pk=self.course.pk).exists())
+
+        db_router._health.clear()
+        with mock.patch.object(db_router, '_replica_lag_seconds', return_value=60), db_router.use_replicas():
+            self.assertEqual(Course.objects.all().db, 'default')
+            self.assertTrue(Course.objects.filter(pk=self.course.pk).exists())
+
+    def test_pinned_user_reads_from_primary(self):
+        user, = make_users(1)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        # টোকেন primary থেকে যাচাই হয় (401 নয়), কিন্তু কোর্সটি রেপ্লিকায় এখনো নেই
+        self.assertEqual(client.get(f'/api/courses/{self.course.pk}/').status_code, 404)
+        db_router.pin_user_to_primary(user.id)
+        self.assertEqual(client.get(f'/api/courses/{self.course.pk}/').status_code, 200)
+
+    def test_dashboard_reads_from_replica_until_pinned(self):
+        user, = make_users(1)
+        UserEnrollment.objects.create(user=user, course=self.course)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        self.assertEqual(client.get('/api/dashboard/').json()['my_courses'], [])
+        db_router.pin_user_to_primary(user.id)
+        courses = client.get('/api/dashboard/').json()['my_courses']
+        self.assertEqual([course['id'] for course in courses], [self.course.pk])
+
+    def test_new_token_works_while_replica_lags(self):
+        client = APIClient()
+        response = client.post('/api/register/', {
+            'email': 'new@example.com', 'password': 'pass-1234', 'password2': 'pass-1234',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        user = User.objects.get(username=response.json()['username'])
+        self.assertTrue(db_router.is_pinned_to_primary(user.id))
+
+        client.credentials(HTTP_AUTHORIZATION=f"Token {response.json()['token']}")
+        response = client.get(f'/api/courses/{self.course.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.course.pk)
@@ -1,15 +1,18 @@
 # api/urls.py
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     CategoryViewSet, CourseViewSet, UnitViewSet, LessonViewSet, QuizViewSet,
-    register_user, login_user, logout_user, 
-    UserQuizAttemptView,
-    ProfileView, LearningGroupViewSet, GroupLeaderboardView,
+    register_user, login_user, logout_user, readiness,
+    UserQuizAttemptView, ReviewView, BatchView,
+    ProfileView, LearningGroupViewSet, GroupLeaderboardView, LeaderboardView, RankingView,
+    ExportView, BulkEnrollView,
     DashboardView,
     MatchingGameViewSet,
     GoogleLogin # নতুন ইম্পোর্ট
 )
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'categories', CategoryViewSet, basename='category')
@@ -21,6 +24,13 @@ router.register(r'groups', LearningGroupViewSet, basename='group')
 router.register(r'games', MatchingGameViewSet, basename='game')
 
 urlpatterns = [
+    # ASGI প্রোফাইলে কম্পোজিট ভিউগুলোর async ভার্সন (settings.ASYNC_COMPOSITE_VIEWS)
+    *([
+        path('dashboard/', async_views.dashboard, name='dashboard'),
+        path('profile/', async_views.profile, name='profile'),
+        path('groups/<int:group_id>/leaderboard/', async_views.group_leaderboard, name='group-leaderboard'),
+    ] if settings.ASYNC_COMPOSITE_VIEWS else []),
+
     # API রাউটার
     path('', include(router.urls)),
     
@@ -41,6 +51,29 @@ urlpatterns = [
     # User Progress
     path('progress/quiz/', UserQuizAttemptView.as_view(), name='progress-quiz'),
     
+    # Batch (একাধিক GET একসাথে)
+    path('batch/', BatchView.as_view(), name='batch'),
+    
+    # Spaced-repetition review
+    path('review/', ReviewView.as_view(), name='review'),
+    
+    # Health
+    path('health/ready/', readiness, name='readiness'),
+    
+    # Async (ASGI) কম্পোজিট ভিউ
+    path('async/dashboard/', async_views.dashboard, name='async-dashboard'),
+    path('async/profile/', async_views.profile, name='async-profile'),
+    path('async/groups/<int:group_id>/', async_views.group_detail, name='async-group-detail'),
+    path('async/groups/<int:group_id>/leaderboard/', async_views.group_leaderboard, name='async-group-leaderboard'),
+    
     # Group extras
     path('groups/<int:group_id>/leaderboard/', GroupLeaderboardView.as_view(), name='group-leaderboard'),
+    path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
+    path('rankings/', RankingView.as_view(), name='rankings'),
+
+    # বাল্ক এনরোলমেন্ট (স্টাফ)
+    path('enrollments/bulk/', BulkEnrollView.as_view(), name='bulk-enroll'),
+
+    # স্ট্রিমিং এক্সপোর্ট (csv, pyarrow থাকলে arrow/parquet)
+    path('exports/<slug:dataset>.<slug:fmt>', ExportView.as_view(), name='export'),
 ]
\ No newline at end of file
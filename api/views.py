@@ -1,15 +1,18 @@
 # api/views.py
 from rest_framework import viewsets, status, generics, permissions
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, action
 from rest_framework.authtoken.models import Token
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from django.db.models import Sum, Q, F, Window
+from django.db.models import Sum, Q, F, Window, Count, Prefetch
 from django.db.models.functions import Rank
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser, SAFE_METHODS
 from rest_framework.views import APIView
 from rest_framework.viewsets import ReadOnlyModelViewSet
+from django.core.cache import cache
+from django.conf import settings
+from django.http import HttpResponse
 
 # Google Login Imports
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
@@ -18,7 +21,7 @@ from dj_rest_auth.registration.views import SocialLoginView
 
 from .models import (
     Category, Course, Unit, Lesson, Quiz, Question, 
-    UserQuizAttempt, UserEnrollment,
+    UserQuizAttempt, QuizAttemptSummary, UserEnrollment,
     MatchingGame,
     LearningGroup, GroupMembership,
     Notice, Promotion
@@ -28,7 +31,29 @@ from .serializers import (
     RegisterSerializer, UserQuizAttemptSerializer,
     ProfileSerializer, LearningGroupSerializer, GroupMembershipSerializer,
     LeaderboardEntrySerializer, DashboardSerializer, NoticeSerializer, PromotionSerializer,
-    MatchingGameSerializer
+    MatchingGameSerializer, QuizSubmissionSerializer,
+    ReviewQuestionSerializer, ReviewSubmissionSerializer, RankingSerializer,
+    BulkEnrollSerializer, GroupEnrollSerializer, BulkEnrollResultSerializer
+)
+from .cache import get_group_summary, warmup_done_key
+from . import memberships
+from .answer_log import encode_results
+from .attempts import record_attempt
+from .grading import get_answer_key, grade as grade_answers
+from .sampling import draw_paper
+from .jobs import enqueue
+from . import leaderboards
+from . import ranking
+from . import progress
+from . import exports
+from . import reviews
+from .resume import record_lesson_view
+from . import navigation
+from .batch import run_batch
+from .streaming import streaming_json_response
+from .fast_serializers import CategoryFast, CourseFast, UnitFast
+from config.db_router import (
+    use_replicas, disable_replicas, is_pinned_to_primary, pin_user_to_primary, pin_users_to_primary,
 )
 
 #
@@ -65,6 +90,7 @@ def register_user(request):
         if serializer.is_valid():
             user = serializer.save()
             token, created = Token.objects.get_or_create(user=user)
+            pin_user_to_primary(user.id)
             return Response({'token': token.key, 'username': user.username}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -89,7 +115,9 @@ def login_user(request):
         user = authenticate(username=username, password=password)
 
     if user:
-        token, _ = Token.objects.get_or_create(user=user)
+        token, created = Token.objects.get_or_create(user=user)
+        if created:
+            pin_user_to_primary(user.id)
         return Response({'token': token.key, 'username': user.username}, status=status.HTTP_200_OK)
     
     return Response({'error': 'ভুল ইমেইল বা পাসওয়ার্ড'}, status=status.HTTP_400_BAD_REQUEST)
@@ -103,33 +131,113 @@ def logout_user(request):
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+# --- রেডিনেস চেক (warm_cache শেষ না হওয়া পর্যন্ত 503) ---
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def readiness(request):
+    warmup = cache.get(warmup_done_key())
+    if warmup is None:
+        return Response({'status': 'warming'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response({'status': 'ready', 'warmup': warmup}, status=status.HTTP_200_OK)
+
+# --- রেপ্লিকা থেকে পড়ার মিক্সিন ---
+# রিড-অনলি ভিউ ও রিপোর্টিং ভিউতে ব্যবহার হয়। সদ্য রাইট করা ইউজারকে primary থেকেই পড়ানো হয়।
+class ReplicaReadMixin:
+    def dispatch(self, request, *args, **kwargs):
+        # শুধু GET/HEAD/OPTIONS রেপ্লিকায়। রাইট অ্যাকশন (grade, enroll) লেখার আগে যা পড়ে তা primary থেকে,
+        # নইলে পিছিয়ে থাকা রেপ্লিকার ডেটা থেকে হিসাব করে নতুন ডেটার উপর লিখে ফেলে
+        with use_replicas(request.method in SAFE_METHODS):
+            return super().dispatch(request, *args, **kwargs)
+
+    def perform_authentication(self, request):
+        # টোকেন/সেশন primary থেকে: সদ্য ইস্যু হওয়া টোকেন পিছিয়ে থাকা রেপ্লিকায় না থাকলে 401 হয়ে যেত
+        with use_replicas(False):
+            super().perform_authentication(request)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if is_pinned_to_primary(request.user.id):
+            disable_replicas()
+
 # --- প্রোফাইল ভিউ ---
-class ProfileView(APIView):
+class ProfileView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        total_points = UserQuizAttempt.objects.filter(user=user).aggregate(Sum('score'))['score__sum'] or 0
+        total_points = QuizAttemptSummary.objects.filter(user=user).aggregate(Sum('latest_score'))['latest_score__sum'] or 0
         
         serializer = ProfileSerializer({
             'username': user.username,
             'email': user.email,
-            'total_points': total_points
+            'total_points': total_points,
+            'rank': ranking.my_rank(user.id)['rank'],
         })
         return Response(serializer.data)
 
 # --- মূল কন্টেন্ট ভিউসেট ---
-class CategoryViewSet(ReadOnlyModelViewSet):
+class NavigationMixin:
+    # ডিটেইল রেসপন্সে কোর্সের নেভিগেশন ইনডেক্স থেকে prev/next, আর পরের স্ক্রিনগুলোর জন্য Link: rel=prefetch
+    navigation_kind = None
+
+    def navigation_response(self, obj, data):
+        nav = navigation.neighbours(navigation.course_id_of(obj), self.navigation_kind, obj.id)
+        response = Response({**data, 'navigation': nav})
+        if nav:
+            links = [
+                f"<{self.request.build_absolute_uri(step['url'])}>; rel=prefetch"
+                for step in (nav['next'], nav['prev']) if step
+            ]
+            if links:
+                response['Link'] = ', '.join(links)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        obj = self.get_object()
+        return self.navigation_response(obj, self.get_serializer(obj).data)
+
+class StreamingListMixin:
+    # ?stream=1 দিলে পুরো লিস্ট মেমরিতে না বানিয়ে চাংক করে স্ট্রিম করা হয় (বড় ক্যাটালগের জন্য)
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('stream') != '1':
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        return streaming_json_response(request, queryset, lambda obj: serializer_class(obj, context=context).data)
+
+class FastReadMixin:
+    # লিস্ট/ডিটেইল fast_serializer_class (api/fast_serializers.py) দিয়ে; ?stream=1 আর FAST_SERIALIZERS=0 এ আগের পথ
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_SERIALIZERS or request.query_params.get('stream') == '1':
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.fast_serializer_class(self.get_serializer_context()).many(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.FAST_SERIALIZERS:
+            return super().retrieve(request, *args, **kwargs)
+        obj = self.get_object()
+        fast = self.fast_serializer_class(self.get_serializer_context())
+        return Response(fast.many(type(obj).objects.filter(pk=obj.pk))[0])
+
+class CategoryViewSet(FastReadMixin, StreamingListMixin, ReplicaReadMixin, ReadOnlyModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    fast_serializer_class = CategoryFast
     permission_classes = [IsAuthenticated]
 
     def get_serializer_context(self):
         return {'request': self.request}
 
-class CourseViewSet(ReadOnlyModelViewSet):
+class CourseViewSet(FastReadMixin, StreamingListMixin, ReplicaReadMixin, ReadOnlyModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
+    fast_serializer_class = CourseFast
     permission_classes = [IsAuthenticated]
 
     def get_serializer_context(self):
@@ -151,32 +259,94 @@ class CourseViewSet(ReadOnlyModelViewSet):
             
         return queryset
 
-class UnitViewSet(ReadOnlyModelViewSet):
+    @action(detail=True, methods=['post'], url_path='enroll')
+    def enroll(self, request, pk=None):
+        result = memberships.enroll_user(request.user.id, pk)
+        if result == memberships.NOT_FOUND:
+            return Response({'detail': 'কোর্সটি খুঁজে পাওয়া যায়নি।'}, status=status.HTTP_404_NOT_FOUND)
+        if result == memberships.FORBIDDEN:
+            return Response({'detail': 'প্রিমিয়াম কোর্সে এনরোল করতে অ্যাডমিনের সাথে যোগাযোগ করুন।'}, status=status.HTTP_403_FORBIDDEN)
+        
+        pin_user_to_primary(request.user.id)
+        created = result == memberships.CREATED
+        return Response(
+            {'is_enrolled': True, 'created': created},
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+class UnitViewSet(FastReadMixin, ReplicaReadMixin, ReadOnlyModelViewSet):
     queryset = Unit.objects.all()
     serializer_class = UnitSerializer
+    fast_serializer_class = UnitFast
     permission_classes = [IsAuthenticated]
 
     def get_serializer_context(self):
         return {'request': self.request}
 
-class LessonViewSet(ReadOnlyModelViewSet):
-    queryset = Lesson.objects.all()
+class LessonViewSet(NavigationMixin, ReplicaReadMixin, ReadOnlyModelViewSet):
+    queryset = Lesson.objects.select_related('unit')
+    navigation_kind = navigation.LESSON
     serializer_class = LessonSerializer
     permission_classes = [IsAuthenticated]
 
     def get_serializer_context(self):
         return {'request': self.request}
 
-class QuizViewSet(ReadOnlyModelViewSet):
-    queryset = Quiz.objects.all()
+    def retrieve(self, request, *args, **kwargs):
+        lesson = self.get_object()
+        serializer = self.get_serializer(lesson)
+        # ড্যাশবোর্ডের "continue learning" কার্সর (UPDATE টি রাউটার primary-তে পাঠায়)
+        record_lesson_view(request.user.id, lesson)
+        return self.navigation_response(lesson, serializer.data)
+
+class QuizViewSet(NavigationMixin, ReplicaReadMixin, ReadOnlyModelViewSet):
+    queryset = Quiz.objects.select_related('lesson__unit', 'unit')
+    navigation_kind = navigation.QUIZ
     serializer_class = QuizSerializer
     permission_classes = [IsAuthenticated]
 
     def get_serializer_context(self):
         return {'request': self.request}
 
-class MatchingGameViewSet(ReadOnlyModelViewSet):
-    queryset = MatchingGame.objects.all()
+    @action(detail=True, methods=['post'], url_path='grade')
+    def grade(self, request, pk=None):
+        # ক্লায়েন্ট শুধু নির্বাচিত চয়েস পাঠায়; স্কোর সার্ভারে উত্তর-চাবি দিয়ে হিসাব হয়
+        quiz = self.get_object()
+        submission = QuizSubmissionSerializer(data=request.data)
+        submission.is_valid(raise_exception=True)
+
+        seed = submission.validated_data.get('seed')
+        answer_key = get_answer_key(quiz.id)
+        question_ids = None
+        if quiz.sample_size:
+            if seed is None:
+                return Response({'seed': ['এই কুইজের প্রশ্নপত্রের seed প্রয়োজন।']}, status=status.HTTP_400_BAD_REQUEST)
+            # seed থেকে হুবহু একই প্রশ্নপত্র আবার তৈরি করে শুধু সেই প্রশ্নগুলো গ্রেড করা হয়
+            question_ids = [
+                question_id for question_id in draw_paper(quiz.id, quiz.sample_size, seed)
+                if question_id in answer_key['questions']
+            ]
+        score, total_points, results = grade_answers(
+            answer_key, submission.validated_data['answers'], question_ids
+        )
+
+        user = request.user
+        record_attempt(user, quiz.id, score, total_points, seed=seed, answer_log=encode_results(results))
+        reviews.apply_results(user.id, results, course_id=answer_key['course_id'])
+        pin_user_to_primary(user.id)
+        enqueue('user_progress_changed', {'user_id': user.id})
+
+        return Response({
+            'quiz': quiz.id,
+            'score': score,
+            'total_points': total_points,
+            'percentage': round(score / total_points * 100) if total_points else None,
+            'results': results,
+        }, status=status.HTTP_201_CREATED)
+
+class MatchingGameViewSet(NavigationMixin, ReplicaReadMixin, ReadOnlyModelViewSet):
+    queryset = MatchingGame.objects.select_related('lesson__unit', 'unit')
+    navigation_kind = navigation.GAME
     serializer_class = MatchingGameSerializer
     permission_classes = [IsAuthenticated]
 
@@ -193,9 +363,59 @@ class UserQuizAttemptView(generics.CreateAPIView):
         quiz = serializer.validated_data['quiz']
         score = serializer.validated_data['score']
         total_points = serializer.validated_data['total_points']
+        seed = serializer.validated_data.get('seed')
 
-        UserQuizAttempt.objects.filter(user=user, quiz=quiz).delete()
-        UserQuizAttempt.objects.create(user=user, quiz=quiz, score=score, total_points=total_points)
+        record_attempt(user, quiz.id, score, total_points, seed=seed)
+        pin_user_to_primary(user.id)
+        enqueue('user_progress_changed', {'user_id': user.id})
+
+# --- ব্যাচ ---
+class BatchView(APIView):
+    # {"requests": [{"id": "group", "path": "/api/groups/1/"}, ...], "concurrent": false}
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get('requests')
+        if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+            return Response({'detail': 'requests অবশ্যই সাব-রিকোয়েস্টের একটি তালিকা হতে হবে।'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'detail': f'এক ব্যাচে সর্বোচ্চ {settings.BATCH_MAX_REQUESTS}টি রিকোয়েস্ট দেওয়া যায়।'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        responses = run_batch(request, items, concurrent=bool(request.data.get('concurrent')))
+        return Response({'responses': responses})
+
+# --- স্পেসড রিপিটিশন রিভিউ ---
+class ReviewView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # এনরোল করা সব কোর্স মিলিয়ে এখন due থাকা প্রশ্নগুলো দিয়ে একটি মিশ্র রিভিউ কুইজ
+        try:
+            limit = int(request.query_params.get('limit', reviews.DEFAULT_QUEUE_SIZE))
+        except ValueError:
+            return Response({'detail': 'limit অবশ্যই সংখ্যা হতে হবে।'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, reviews.MAX_QUEUE_SIZE))
+
+        questions = reviews.build_review_quiz(request.user.id, limit)
+        return Response({
+            'count': len(questions),
+            'questions': ReviewQuestionSerializer(questions, many=True).data,
+        })
+
+    def post(self, request):
+        submission = ReviewSubmissionSerializer(data=request.data)
+        submission.is_valid(raise_exception=True)
+
+        score, total_points, results = reviews.grade_review(request.user.id, submission.validated_data['answers'])
+        return Response({
+            'score': score,
+            'total_points': total_points,
+            'percentage': round(score / total_points * 100) if total_points else None,
+            'results': results,
+        })
 
 # --- গ্রুপ ভিউসেট ---
 class LearningGroupViewSet(viewsets.ModelViewSet):
@@ -207,92 +427,194 @@ class LearningGroupViewSet(viewsets.ModelViewSet):
         return {'request': self.request}
 
     def get_queryset(self):
-        return LearningGroup.objects.filter(memberships__user=self.request.user)
+        # সদস্যপদ IN (সাবকোয়েরি) দিয়ে, join দিয়ে নয়: নইলে নিচের Count শুধু নিজের সদস্যপদ গুনত
+        queryset = LearningGroup.objects.filter(
+            id__in=GroupMembership.objects.filter(user=self.request.user).values('group_id')
+        )
+        if self.action in ('list', 'retrieve'):
+            # লিস্ট যত বড়ই হোক: গ্রুপ+অ্যাডমিন+সদস্য সংখ্যা একটি কোয়েরি, কোর্সগুলো একটি
+            queryset = queryset.select_related('admin').annotate(
+                annotated_member_count=Count('memberships')
+            ).prefetch_related(
+                Prefetch('courses', queryset=Course.objects.only('id', 'title').order_by('id'))
+            ).order_by('-created_at', 'id')
+        return queryset
 
     @action(detail=True, methods=['post'], url_path='join')
     def join_group(self, request, pk=None):
-        try:
-            group = LearningGroup.objects.get(id=pk)
-        except LearningGroup.DoesNotExist:
-            return Response({'detail': 'গ্রুপটি খুঁজে পাওয়া যায়নি।'}, status=status.HTTP_404_NOT_FOUND)
-
-        if GroupMembership.objects.filter(group=group, user=request.user).exists():
+        result = memberships.join_group(pk, request.user.id)
+        if result == memberships.NOT_FOUND:
+            return Response({'detail': 'গ্রুপটি খুঁজে পাওয়া যায়নি।'}, status=status.HTTP_404_NOT_FOUND)
+        if result == memberships.ALREADY_EXISTS:
             return Response({'detail': 'আপনি ஏற்கனவே এই গ্রুপে আছেন।'}, status=status.HTTP_400_BAD_REQUEST)
         
-        GroupMembership.objects.create(group=group, user=request.user)
+        pin_user_to_primary(request.user.id)
+        group = LearningGroup.objects.get(id=pk)
         group_data = self.get_serializer(group).data
-        return Response({'message': 'সফলভাবে গ্রুপে যোগ দিয়েছেন!', 'group': group_data}, status=status.HTTP_200_OK)
+        return Response({'message': 'সফলভাবে গ্রুপে যোগ দিয়েছেন!', 'group': group_data}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='leave')
     def leave_group(self, request, pk=None):
-        try:
-            group = LearningGroup.objects.get(id=pk)
-        except LearningGroup.DoesNotExist:
-            return Response({'detail': 'গ্রুপটি খুঁজে পাওয়া যায়নি।'}, status=status.HTTP_404_NOT_FOUND)
-        
-        membership = GroupMembership.objects.filter(group=group, user=request.user).first()
-        if not membership:
+        result = memberships.leave_group(pk, request.user.id)
+        if result == memberships.NOT_FOUND:
+            return Response({'detail': 'গ্রুপটি খুঁজে পাওয়া যায়নি।'}, status=status.HTTP_404_NOT_FOUND)
+        if result == memberships.NOT_MEMBER:
             return Response({'detail': 'আপনি এই গ্রুপের সদস্য নন।'}, status=status.HTTP_400_BAD_REQUEST)
+        if result == memberships.ADMIN_CANNOT_LEAVE:
+            return Response({'detail': 'অ্যাডমিন গ্রুপ ত্যাগ করতে পারবেন না। প্রথমে অন্যকে অ্যাডমিন বানান।'}, status=status.HTTP_400_BAD_REQUEST)
         
-        if membership.is_group_admin:
-            if group.memberships.count() > 1:
-                return Response({'detail': 'অ্যাডমিন গ্রুপ ত্যাগ করতে পারবেন না। প্রথমে অন্যকে অ্যাডমিন বানান।'}, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                group.delete()
-                return Response({'detail': 'গ্রুপটি ডিলিট করা হয়েছে।'}, status=status.HTTP_200_OK)
-        
-        membership.delete()
+        pin_user_to_primary(request.user.id)
+        if result == memberships.GROUP_DELETED:
+            return Response({'detail': 'গ্রুপটি ডিলিট করা হয়েছে।'}, status=status.HTTP_200_OK)
         return Response({'detail': 'সফলভাবে গ্রুপ ত্যাগ করেছেন।'}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['get'], url_path='members')
     def get_members(self, request, pk=None):
         group = self.get_object()
-        members = group.memberships.all()
+        members = group.memberships.select_related('user').only(
+            'group_id', 'is_group_admin', 'joined_at', 'user__id', 'user__username'
+        ).order_by('joined_at', 'id')
         serializer = GroupMembershipSerializer(members, many=True)
         return Response(serializer.data)
 
+    def _is_group_admin(self, group, user):
+        return group.admin_id == user.id or group.memberships.filter(user=user, is_group_admin=True).exists()
+
+    @action(detail=True, methods=['get'], url_path='progress')
+    def progress(self, request, pk=None):
+        # সদস্য × ইউনিট অগ্রগতি; ?download=csv দিলে CSV ফাইল
+        group = self.get_object()
+        if not self._is_group_admin(group, request.user):
+            return Response({'detail': 'শুধু গ্রুপ অ্যাডমিন এই রিপোর্ট দেখতে পারেন।'}, status=status.HTTP_403_FORBIDDEN)
+
+        with use_replicas(not is_pinned_to_primary(request.user.id)):
+            report = progress.compute_group_progress(group.id)
+        if request.query_params.get('download') == 'csv':
+            response = HttpResponse(progress.progress_csv(report), content_type='text/csv; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="group-{group.id}-progress.csv"'
+            return response
+        return Response(report)
+
+    @action(detail=True, methods=['post'], url_path='enroll')
+    def enroll_members(self, request, pk=None):
+        # গ্রুপের সদস্যদের গ্রুপের কোর্সে এক রিকোয়েস্টে এনরোল; {"user_ids": [..], "course_ids": [..]} দুটোই ঐচ্ছিক
+        group = self.get_object()
+        if not self._is_group_admin(group, request.user):
+            return Response({'detail': 'শুধু গ্রুপ অ্যাডমিন সদস্যদের এনরোল করতে পারেন।'}, status=status.HTTP_403_FORBIDDEN)
+        submission = GroupEnrollSerializer(data=request.data)
+        submission.is_valid(raise_exception=True)
+
+        # প্রিমিয়াম কোর্সে শুধু স্টাফ এনরোল করাতে পারে
+        result = memberships.enroll_group(
+            group.id,
+            user_ids=submission.validated_data.get('user_ids'),
+            course_ids=submission.validated_data.get('course_ids'),
+            include_premium=request.user.is_staff,
+        )
+        pin_users_to_primary(result['enrolled_user_ids'])
+        return Response(
+            BulkEnrollResultSerializer(result).data,
+            status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK
+        )
+
 # --- গ্রুপ লিডারবোর্ড ---
-class GroupLeaderboardView(APIView):
+class GroupLeaderboardView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, group_id, *args, **kwargs):
+        window, course_id, error = leaderboards.parse_params(request.query_params)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             group = LearningGroup.objects.get(id=group_id)
         except LearningGroup.DoesNotExist:
             return Response({'detail': 'গ্রুপটি খুঁজে পাওয়া যায়নি।'}, status=status.HTTP_404_NOT_FOUND)
         
-        group_courses = group.courses.all()
-        if not group_courses.exists():
-            return Response([], status=status.HTTP_200_OK) 
-
-        members = User.objects.filter(learning_groups__group=group)
+        if course_id and course_id not in get_group_summary(group.id)['course_ids']:
+            return Response({'detail': 'কোর্সটি এই গ্রুপে নেই।'}, status=status.HTTP_400_BAD_REQUEST)
         
-        lesson_quizzes_q = Q(quiz__lesson__unit__course__in=group_courses)
-        unit_quizzes_q = Q(quiz__unit__course__in=group_courses)
-
-        leaderboard_data = UserQuizAttempt.objects.filter(
-            user__in=members
-        ).filter(
-            lesson_quizzes_q | unit_quizzes_q
-        ).values(
-            'user__username' 
-        ).annotate(
-            total_score=Sum('score'), 
-            username=F('user__username') 
-        ).filter(
-            total_score__gt=0 
-        ).annotate(
-            rank=Window( 
-                expression=Rank(),
-                order_by=F('total_score').desc()
-            )
-        ).order_by('rank') 
+        leaderboard_data = leaderboards.get_leaderboard(window, group_id=group.id, course_id=course_id)
         
         serializer = LeaderboardEntrySerializer(leaderboard_data, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+
+class RankingView(APIView):
+    """গ্লোবাল বা কোর্সের অল-টাইম র‍্যাঙ্কিং: top, আমার র‍্যাঙ্ক আর আশেপাশের ইউজার।
+    ?course=<id>&limit=<≤100>&around=<≤25>"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        _, course_id, error = leaderboards.parse_params(request.query_params)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get('limit', leaderboards.GLOBAL_LEADERBOARD_SIZE))
+            radius = int(request.query_params.get('around', 5))
+        except ValueError:
+            return Response({'detail': 'limit ও around অবশ্যই সংখ্যা হতে হবে।'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(0, min(limit, leaderboards.GLOBAL_LEADERBOARD_SIZE))
+        radius = max(0, min(radius, 25))
+
+        data = ranking.ranking_summary(request.user.id, course_id=course_id, limit=limit, radius=radius)
+        return Response(RankingSerializer(data).data)
+
+
+class LeaderboardView(ReplicaReadMixin, APIView):
+    """গ্লোবাল বা কোর্সভিত্তিক লিডারবোর্ড: ?window=week|month|all&course=<id>"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        window, course_id, error = leaderboards.parse_params(request.query_params)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+        leaderboard_data = leaderboards.get_leaderboard(window, course_id=course_id)
+        serializer = LeaderboardEntrySerializer(leaderboard_data, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+# --- বাল্ক এনরোলমেন্ট ---
+class BulkEnrollView(APIView):
+    """অনেক ইউজারকে অনেক কোর্সে একসাথে এনরোল (স্টাফ): {"user_ids": [..], "course_ids": [..]}"""
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        submission = BulkEnrollSerializer(data=request.data)
+        submission.is_valid(raise_exception=True)
+
+        result = memberships.bulk_enroll(
+            submission.validated_data['user_ids'], submission.validated_data['course_ids'], include_premium=True
+        )
+        pin_users_to_primary(result['enrolled_user_ids'])
+        return Response(
+            BulkEnrollResultSerializer(result).data,
+            status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK
+        )
+
+# --- এক্সপোর্ট ---
+class ExportView(ReplicaReadMixin, APIView):
+    """অ্যাটেম্পট/এনরোলমেন্টের স্ট্রিমিং এক্সপোর্ট: /api/exports/<attempts|enrollments>.<csv|arrow|parquet>
+    ?course=<id>&group=<id>&since=YYYY-MM-DD&until=YYYY-MM-DD। স্টাফ সব, গ্রুপ অ্যাডমিন নিজের গ্রুপের সদস্যদের।"""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, dataset, fmt, *args, **kwargs):
+        if dataset not in exports.DATASETS:
+            return Response({'detail': 'এক্সপোর্টটি খুঁজে পাওয়া যায়নি।'}, status=status.HTTP_404_NOT_FOUND)
+        if fmt not in exports.FORMATS:
+            return Response({'detail': f"ফরম্যাট অবশ্যই {', '.join(exports.FORMATS)} এর একটি হতে হবে।"}, status=status.HTTP_400_BAD_REQUEST)
+        if fmt in exports.ARROW_FORMATS and exports.pyarrow is None:
+            return Response({'detail': 'এই সার্ভারে pyarrow ইনস্টল নেই, csv ব্যবহার করুন।'}, status=status.HTTP_400_BAD_REQUEST)
+        filters, error = exports.parse_filters(request.query_params)
+        if error:
+            return Response({'detail': error}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = exports.build_queryset(dataset, request.user, filters)
+        if queryset is None:
+            return Response({'detail': 'শুধু অ্যাডমিন বা নিজের গ্রুপের জন্য গ্রুপ অ্যাডমিন এক্সপোর্ট করতে পারেন।'}, status=status.HTTP_403_FORBIDDEN)
+        return exports.export_response(request, dataset, queryset, fmt)
+
 # --- ড্যাশবোর্ড ভিউ ---
-class DashboardView(APIView):
+class DashboardView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -301,7 +623,13 @@ class DashboardView(APIView):
         notice = Notice.objects.filter(is_active=True).first()
         promotion = Promotion.objects.filter(is_active=True).first()
         
-        enrolled_courses = Course.objects.filter(enrollments__user=user)
+        # resume কার্সর একই এনরোলমেন্ট জয়েন থেকে annotate করা হয়, আলাদা কোয়েরি লাগে না
+        enrolled_courses = Course.objects.filter(enrollments__user=user).annotate(
+            resume_unit_id=F('enrollments__last_unit_id'),
+            resume_lesson_id=F('enrollments__last_lesson_id'),
+            resume_quiz_id=F('enrollments__last_quiz_id'),
+            resume_next_lesson_id=F('enrollments__next_lesson_id'),
+        )
         
         context = {'request': request}
         
@@ -13,4 +13,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Django সেটআপের পরে ইম্পোর্ট করতে হয়
+from api.live_quiz import PATH_PREFIX as LIVE_QUIZ_PREFIX, live_quiz_application  # noqa: E402
+from api.realtime import SSE_PATH, live_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # লাইভ গ্রুপ কুইজ (api/live_quiz.py), WebSocket আর SSE পুশ চ্যানেল (api/realtime.py), বাকি সব Django
+    if scope['type'] == 'websocket' and scope['path'].startswith(LIVE_QUIZ_PREFIX):
+        return await live_quiz_application(scope, receive, send)
+    if scope['type'] == 'websocket' or (scope['type'] == 'http' and scope['path'] == SSE_PATH):
+        return await live_application(scope, receive, send)
+    return await django_application(scope, receive, send)
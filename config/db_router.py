@@ -0,0 +1,118 @@
+# config/db_router.py
+# রিড-রেপ্লিকা রাউটার।
+# শুধু use_replicas() কনটেক্সটের ভেতরের রিড (রিড-অনলি ভিউসেট, রিপোর্টিং) রেপ্লিকায় যায়;
+# বাকি সব রিড/রাইট primary ('default')-তে থাকে। রেপ্লিকা পিছিয়ে থাকলে বা ডাউন থাকলে primary-তে ফিরে যায়।
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, DatabaseError
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+PIN_KEY = 'db:pin:{}'
+
+# প্রসেস-লোকাল: {alias: (checked_at, is_healthy)}
+_health = {}
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias != 'default']
+
+
+@contextmanager
+def use_replicas(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replicas_enabled():
+    return _replica_reads.get()
+
+
+def disable_replicas():
+    """চলতি কনটেক্সটের বাকি অংশের জন্য primary থেকে পড়তে বাধ্য করে।"""
+    _replica_reads.set(False)
+
+
+# --- read-your-writes ---
+
+def pin_user_to_primary(user_id):
+    """রাইটের পরে কিছুক্ষণ ঐ ইউজারের সব রিড primary থেকে হবে, যাতে নিজের লেখা নিজে দেখতে পায়।"""
+    if user_id and replica_aliases():
+        cache.set(PIN_KEY.format(user_id), True, getattr(settings, 'REPLICA_PIN_SECONDS', 10))
+
+
+def pin_users_to_primary(user_ids):
+    """অন্য কেউ (যেমন অ্যাডমিন) অনেক ইউজারের ডেটা লিখলে তাদের সবাইকে একটি set_many এ pin করে।"""
+    if user_ids and replica_aliases():
+        cache.set_many(
+            {PIN_KEY.format(user_id): True for user_id in user_ids},
+            getattr(settings, 'REPLICA_PIN_SECONDS', 10),
+        )
+
+
+def is_pinned_to_primary(user_id):
+    if not user_id or not replica_aliases():
+        return False
+    return bool(cache.get(PIN_KEY.format(user_id)))
+
+
+# --- রেপ্লিকা ল্যাগ চেক ---
+
+def _replica_lag_seconds(alias):
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        )
+        return float(cursor.fetchone()[0])
+
+
+def is_replica_healthy(alias):
+    now = time.monotonic()
+    checked_at, healthy = _health.get(alias, (None, False))
+    if checked_at is not None and now - checked_at < getattr(settings, 'REPLICA_HEALTH_CHECK_INTERVAL', 5):
+        return healthy
+
+    # চেক চলাকালীন অন্য রিকোয়েস্টগুলো আগের ফলাফল ব্যবহার করবে
+    _health[alias] = (now, healthy)
+    try:
+        healthy = _replica_lag_seconds(alias) <= getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 5)
+    except DatabaseError:
+        healthy = False
+    _health[alias] = (now, healthy)
+    return healthy
+
+
+def choose_replica():
+    healthy = [alias for alias in replica_aliases() if is_replica_healthy(alias)]
+    if not healthy:
+        return 'default'
+    return random.choice(healthy)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return 'default'
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # সব রেপ্লিকায় একই ডেটা, তাই যেকোনো দুটো অবজেক্টের সম্পর্ক বৈধ
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
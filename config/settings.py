@@ -85,6 +85,98 @@ DATABASES = {
     }
 }
 
+# --- রিড-রেপ্লিকা ---
+# DATABASE_REPLICAS="host[:port][/dbname],..." দিলে প্রতিটির জন্য replica_N কানেকশন তৈরি হয়।
+# লোকালি টেস্ট করতে একই হোস্টে দুটো ডেটাবেস দিন, যেমন: DATABASE_REPLICAS="localhost/easy_learning_replica"
+for index, replica in enumerate(filter(None, os.getenv('DATABASE_REPLICAS', '').split(',')), start=1):
+    replica_host, _, replica_name = replica.strip().partition('/')
+    replica_host, _, replica_port = replica_host.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host or DATABASES['default']['HOST'],
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'NAME': replica_name or DATABASES['default']['NAME'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['config.db_router.PrimaryReplicaRouter']
+REPLICA_MAX_LAG_SECONDS = 5        # এর বেশি পিছিয়ে থাকলে রেপ্লিকা বাদ
+REPLICA_HEALTH_CHECK_INTERVAL = 5  # ল্যাগ কতক্ষণ পরপর চেক হবে (সেকেন্ড)
+REPLICA_PIN_SECONDS = 10           # রাইটের পর কতক্ষণ ইউজারের রিড primary থেকে হবে
+
+# --- ক্যাশ ---
+# REDIS_URL দিলে সব প্রসেস একই Redis ক্যাশ শেয়ার করবে। না দিলে ফাইল-ভিত্তিক ক্যাশ,
+# যাতে warm_cache কমান্ড আর সার্ভার প্রসেস একই মেশিনে একই ক্যাশ দেখে।
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', str(BASE_DIR / 'cache')),
+            'OPTIONS': {'MAX_ENTRIES': 100000},
+        }
+    }
+
+API_CACHE_TIMEOUT = 60 * 60 * 24
+
+# রিলিজ আইডি (যেমন git sha); warm_cache এর রেডিনেস ফ্ল্যাগ এর সাথে বাঁধা, তাই নতুন রিলিজের warm-up
+# চলার সময় পুরোনো রিলিজের ইনস্ট্যান্সগুলো ready থাকে
+BUILD_ID = os.getenv('BUILD_ID', 'dev')
+
+# --- কুইজ ---
+# পুরনো অ্যাপ ভার্সন লোকালি গ্রেড করে, তাই আপাতত চয়েসের is_correct (আর প্রশ্নের explanation) পাঠানো হচ্ছে।
+# সব ক্লায়েন্ট POST /api/quizzes/<id>/grade/ ব্যবহার শুরু করলে False করুন।
+QUIZ_EXPOSE_ANSWERS = True
+
+# --- জব কিউ ---
+# প্রোডাকশনে `python manage.py run_jobs` ওয়ার্কার সবসময় চালু রাখতে হবে। JOB_QUEUE_EAGER বন্ধ থাকলে
+# গ্রুপ লিডারবোর্ড, কনটেন্ট ক্যাশ, র‍্যাঙ্কিং স্ন্যাপশট সবই কিউ থেকে ওয়ার্কার বানায়; ওয়ার্কার না থাকলে
+# লিডারবোর্ড ক্যাশ (LEADERBOARD_TIMEOUT, ১ ঘণ্টা) মেয়াদ শেষ না হওয়া পর্যন্ত পুরনো থাকে আর জব টেবিল বাড়তে থাকে।
+# লোকাল ডেভেলপমেন্টে JOB_QUEUE_EAGER=1 দিলে run_jobs ওয়ার্কার ছাড়াই জবগুলো সাথে সাথে চলে
+JOB_QUEUE_EAGER = os.getenv('JOB_QUEUE_EAGER') == '1'
+
+# --- ASGI প্রোফাইল ---
+# ASGI সার্ভারে (uvicorn config.asgi:application) চালালে ASYNC_COMPOSITE_VIEWS=1 দিন:
+# /api/dashboard/, /api/profile/ ও /api/groups/<id>/leaderboard/ তখন async ভিউ দিয়ে চলে।
+# async ভার্সনগুলো সবসময় /api/async/... তেও পাওয়া যায়।
+ASYNC_COMPOSITE_VIEWS = os.getenv('ASYNC_COMPOSITE_VIEWS') == '1'
+ASYNC_VIEW_WORKERS = int(os.getenv('ASYNC_VIEW_WORKERS', '16'))  # async ভিউয়ের কোয়েরি চালানোর থ্রেড পুল
+
+# --- গ্লোবাল/কোর্স র‍্যাঙ্কিং (api/ranking.py) ---
+RANKING_REFRESH_SECONDS = 2      # অন্য প্রসেসের অ্যাটেম্পট কতক্ষণ পরপর মেমোরির বোর্ডে আনা হবে
+RANKING_SNAPSHOT_SECONDS = 300   # অ্যাটেম্পটের পর কতক্ষণের মধ্যে স্ন্যাপশট লেখা হবে
+
+# --- রিয়েল-টাইম পুশ (WebSocket /ws/live/, SSE /api/live/; শুধু ASGI তে) ---
+# 'memory' শুধু একই প্রসেসের পাবলিশ দেখে (লোকাল + JOB_QUEUE_EAGER); run_jobs ওয়ার্কার আলাদা হলে 'redis' লাগে।
+REALTIME_BROKER = os.getenv('REALTIME_BROKER', 'redis' if REDIS_URL else 'memory')
+REALTIME_COALESCE_MS = 250         # এই সময়ের ভেতরের আপডেট মিলিয়ে একটি মেসেজ
+REALTIME_QUEUE_SIZE = 100          # ক্লায়েন্টপ্রতি জমে থাকা মেসেজ; ছাড়ালে resync
+REALTIME_KEEPALIVE_SECONDS = 25    # SSE keepalive কমেন্টের বিরতি
+
+# --- লাইভ গ্রুপ কুইজ (WebSocket /ws/live-quiz/<group_id>/) ---
+LIVE_QUIZ_SECONDS_PER_QUESTION = 20  # অ্যাডমিন "seconds" না দিলে
+LIVE_QUIZ_STANDINGS_SIZE = 10        # প্রতিটি প্রশ্নের পর কতজনের র‍্যাঙ্ক ব্রডকাস্ট হবে
+
+# --- কন্টেন্ট রিড-পাথ (api/fast_serializers.py) ---
+# ক্যাটাগরি/কোর্স/ইউনিটের লিস্ট ও ডিটেইল .values() ভিত্তিক সিরিয়ালাইজারে; আউটপুট একই।
+# কোনো সমস্যা হলে FAST_SERIALIZERS=0 দিয়ে আগের ModelSerializer পথে ফেরা যায়।
+FAST_SERIALIZERS = os.getenv('FAST_SERIALIZERS', '1') == '1'
+
+# --- ব্যাচ API (/api/batch/) ---
+BATCH_MAX_REQUESTS = 20  # এক ব্যাচে সর্বোচ্চ সাব-রিকোয়েস্ট
+BATCH_MAX_WORKERS = 4    # "concurrent": true হলে একসাথে কয়টি সাব-রিকোয়েস্ট চলবে
+
+# --- বাল্ক এনরোলমেন্ট (/api/enrollments/bulk/, /api/groups/<id>/enroll/) ---
+BULK_ENROLL_MAX_USERS = 5000   # এক রিকোয়েস্টে সর্বোচ্চ ইউজার
+BULK_ENROLL_MAX_COURSES = 50   # এক রিকোয়েস্টে সর্বোচ্চ কোর্স
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',},